@@ -0,0 +1,291 @@
+"""
+async_merge.py - Асинхронне k-шляхове злиття відсортованих потоків
+
+amerge_k_lists зливає відсортовані асинхронні джерела (AsyncIterator:
+сокети, посторінкові читачі, файли, що читаються фоновими задачами) без
+попереднього вичитування в пам'ять:
+- кожне джерело читає окрема задача у власний буфер попереднього читання
+  (prefetch), тож повільні джерела завантажуються паралельно
+- зворотний тиск: задача зупиняється, коли буфер заповнений, і
+  продовжує, коли споживач звільнить половину
+- повільне джерело затримує вивід лише тоді, коли потрібен саме його
+  наступний елемент
+- скасування: закриття генератора або скасування споживача зупиняє
+  задачі читання та закриває джерела (aclose)
+
+Використання:
+python3 async_merge.py
+"""
+
+import asyncio
+import heapq
+import time
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Callable, List, Optional, Sequence
+
+from datasets import generate
+from merge_k_lists import _ReversedKey, merge_k_lists
+from sorting_core import DATA_SEED, timsort
+
+# Розмір буфера попереднього читання для одного джерела (елементів)
+DEFAULT_PREFETCH = 1024
+
+# Позначка вичерпаного джерела
+_END = object()
+
+class _Prefetcher:
+    """
+    Фонова задача, що читає джерело в обмежений буфер.
+    """
+
+    def __init__(self, source: AsyncIterable[Any], prefetch: int):
+        self.buffer = deque()
+        self.prefetch = max(1, prefetch)
+        self.low_water = self.prefetch // 2
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.task = asyncio.ensure_future(self._fill(source))
+
+    async def _fill(self, source: AsyncIterable[Any]) -> None:
+        iterator = source.__aiter__()
+        try:
+            async for value in iterator:
+                self.buffer.append(value)
+                self._readable.set()
+                # Зворотний тиск: чекаємо, доки споживач не звільнить буфер
+                if len(self.buffer) >= self.prefetch:
+                    self._writable.clear()
+                    await self._writable.wait()
+        except Exception as exc:
+            self.error = exc
+        finally:
+            self.done = True
+            self._readable.set()
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def get(self) -> Any:
+        """
+        Наступний елемент джерела або _END; без очікування, якщо буфер не порожній.
+        """
+        buffer = self.buffer
+        while not buffer:
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return _END
+            self._readable.clear()
+            await self._readable.wait()
+        value = buffer.popleft()
+        if len(buffer) <= self.low_water and not self._writable.is_set():
+            self._writable.set()
+        return value
+
+async def amerge_k_lists(sources: Sequence[AsyncIterable[Any]],
+                         key: Optional[Callable[[Any], Any]] = None,
+                         reverse: bool = False,
+                         prefetch: int = DEFAULT_PREFETCH) -> AsyncIterator[Any]:
+    """
+    Асинхронне k-шляхове злиття відсортованих джерел за допомогою купи.
+
+    Злиття стабільне (рівні елементи - у порядку номерів джерел), як
+    iter_merge_k_lists. Пам'ять - не більше k·prefetch елементів у буферах.
+    Помилка джерела передається споживачу, коли потрібен його елемент.
+
+    Args:
+        sources: Відсортовані асинхронні ітеровані об'єкти
+        key: Функція обчислення ключа порівняння (як у sorted())
+        reverse: True, якщо джерела відсортовані за спаданням
+        prefetch: Розмір буфера попереднього читання для кожного джерела
+
+    Yields:
+        Елементи у відсортованому порядку
+    """
+    fetchers = [_Prefetcher(source, prefetch) for source in sources]
+    try:
+        heap = []
+        for index, fetcher in enumerate(fetchers):
+            value = await fetcher.get()
+            if value is _END:
+                continue
+            sort_key = value if key is None else key(value)
+            heap.append([_ReversedKey(sort_key) if reverse else sort_key, index, value, fetcher])
+        heapq.heapify(heap)
+
+        while len(heap) > 1:
+            entry = heap[0]
+            yield entry[2]
+
+            # Чекаємо лише на джерело, чий елемент щойно видано
+            value = await entry[3].get()
+            if value is _END:
+                heapq.heappop(heap)
+                continue
+            sort_key = value if key is None else key(value)
+            entry[0] = _ReversedKey(sort_key) if reverse else sort_key
+            entry[2] = value
+            heapq.heapreplace(heap, entry)
+
+        # Останнє джерело віддаємо без порівнянь
+        if heap:
+            _, _, value, fetcher = heap[0]
+            while value is not _END:
+                yield value
+                value = await fetcher.get()
+    finally:
+        for fetcher in fetchers:
+            fetcher.task.cancel()
+        await asyncio.gather(*(fetcher.task for fetcher in fetchers), return_exceptions=True)
+
+async def paged_source(values: List[Any], page_size: int, latency: float) -> AsyncIterator[Any]:
+    """
+    Імітація посторінкового джерела: затримка latency перед кожною сторінкою.
+
+    Args:
+        values: Відсортовані значення
+        page_size: Кількість елементів на сторінці
+        latency: Затримка отримання сторінки (секунди)
+
+    Yields:
+        Значення джерела
+    """
+    for start in range(0, len(values), page_size):
+        await asyncio.sleep(latency)
+        for value in values[start:start + page_size]:
+            yield value
+
+async def _drain(source: AsyncIterable[Any]) -> List[Any]:
+    return [value async for value in source]
+
+async def drain_then_merge(sources: Sequence[AsyncIterable[Any]]) -> List[Any]:
+    """
+    Базовий варіант: паралельно вичитати всі джерела, потім merge_k_lists.
+    """
+    return merge_k_lists(await asyncio.gather(*(_drain(source) for source in sources)))
+
+async def _time_streaming(make_sources: Callable[[], list], prefetch: int) -> tuple:
+    start = time.perf_counter()
+    first = None
+    result = []
+    async for value in amerge_k_lists(make_sources(), prefetch=prefetch):
+        if first is None:
+            first = time.perf_counter() - start
+        result.append(value)
+    return first, time.perf_counter() - start, result
+
+async def _time_drain(make_sources: Callable[[], list]) -> tuple:
+    start = time.perf_counter()
+    result = await drain_then_merge(make_sources())
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, result
+
+def benchmark_async_merge(k: int = 8, size: int = 20000, page_size: int = 500,
+                          latency: float = 0.005, slow_latency: float = 0.02,
+                          prefetches: Sequence[int] = (1, 500, 4096)):
+    """
+    Порівнює потокове злиття з вичитуванням джерел і merge_k_lists.
+
+    Одне з k джерел повільне (slow_latency на сторінку), решта - latency.
+
+    Args:
+        k: Кількість джерел
+        size: Кількість елементів у кожному джерелі
+        page_size: Розмір сторінки джерела
+        latency: Затримка сторінки звичайного джерела (секунди)
+        slow_latency: Затримка сторінки повільного джерела (секунди)
+        prefetches: Розміри буфера попереднього читання для порівняння
+
+    Returns:
+        Словник {варіант: (час до першого елемента, загальний час)}
+    """
+    data = generate(k * size, "random", seed=DATA_SEED)
+    shards = [timsort(data[i::k]) for i in range(k)]
+    expected = merge_k_lists(shards)
+
+    def make_sources():
+        return [paged_source(shard, page_size, slow_latency if i == 0 else latency)
+                for i, shard in enumerate(shards)]
+
+    print(f"\n🌊 Асинхронне злиття: {k} джерел × {size:,} елементів, сторінки по {page_size}, "
+          f"затримка {latency * 1000:.0f} мс (повільне джерело - {slow_latency * 1000:.0f} мс)")
+    print("-" * 86)
+    print(f"{'Варіант':<28} {'Перший елемент, с':<20} {'Загалом, с':<14} {'Елементів/с':<14} {'Буфер':<10}")
+    print("-" * 86)
+
+    variants = [(f"amerge (prefetch={p})", lambda p=p: _time_streaming(make_sources, p), f"≤ {k * p:,}")
+                for p in prefetches]
+    variants.append(("вичитати + merge_k_lists", lambda: _time_drain(make_sources), f"{k * size:,}"))
+
+    results = {}
+    for name, run, buffered in variants:
+        first, total, result = asyncio.run(run())
+        assert result == expected, name
+        results[name] = (first, total)
+        print(f"{name:<28} {first:<20.4f} {total:<14.4f} {len(result) / total:<14,.0f} {buffered:<10}")
+
+    return results
+
+async def _self_test():
+    """
+    Перевірка коректності, помилок та скасування.
+    """
+    shards = [[1, 4, 5], [1, 3, 4], [], [2, 6]]
+    merged = [value async for value in amerge_k_lists([paged_source(s, 2, 0) for s in shards])]
+    assert merged == merge_k_lists(shards), merged
+
+    descending = [[5, 4, 1], [6, 2]]
+    merged = [value async for value in amerge_k_lists([paged_source(s, 1, 0) for s in descending],
+                                                       reverse=True, prefetch=1)]
+    assert merged == [6, 5, 4, 2, 1]
+
+    records = [[("b", 1), ("a", 2)], [("c", 2), ("d", 3)], [("e", 1), ("f", 2)]]
+    merged = [value async for value in amerge_k_lists([paged_source(s, 1, 0) for s in records],
+                                                       key=lambda record: record[1])]
+    assert merged == merge_k_lists(records, key=lambda record: record[1])
+
+    # Помилка джерела доходить до споживача
+    async def failing():
+        yield 1
+        raise RuntimeError("обрив з'єднання")
+    try:
+        [value async for value in amerge_k_lists([failing(), paged_source([0, 2], 1, 0)])]
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("помилка джерела не передана")
+
+    # Ранній вихід: задачі читання скасовуються, джерела закриваються
+    closed = []
+    async def endless(start):
+        try:
+            value = start
+            while True:
+                await asyncio.sleep(0)
+                yield value
+                value += 2
+        finally:
+            closed.append(start)
+    stream = amerge_k_lists([endless(0), endless(1)], prefetch=4)
+    head = []
+    async for value in stream:
+        head.append(value)
+        if len(head) == 10:
+            break
+    await stream.aclose()
+    assert head == list(range(10)) and sorted(closed) == [0, 1], (head, closed)
+
+def main():
+    """
+    Головна функція програми.
+    """
+    asyncio.run(_self_test())
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_async_merge()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+benchmark.py - Статистично коректне вимірювання часу виконання
+
+Замість одного усередненого timeit-запуску кожне вимірювання:
+- виконує прогрівальні запуски, які не враховуються
+- автоматично підбирає кількість викликів в одному повторі, щоб повтор був
+  довшим за роздільну здатність таймера
+- готує вхідні дані (копії для сортувань на місці) поза вимірюваною ділянкою
+- вимикає збирач сміття під час вимірювання
+- відкидає викиди за правилом Тьюкі (1.5 · IQR)
+- обчислює медіану, міжквартильний розмах та довірчий інтервал медіани
+
+Результат повертається як об'єкт BenchmarkResult, з яким працюють
+таблиці, CSV та графіки.
+"""
+
+import gc
+import math
+import statistics
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, List, Optional
+
+# Мінімальна тривалість одного повтору (секунди) для автокалібрування
+REPEAT_TIME = 0.005
+
+# Максимальна кількість викликів в одному повторі
+MAX_NUMBER = 10000
+
+# Колонки CSV з результатами (один рядок на комірку)
+CSV_FIELDS = ['data_type', 'size', 'algorithm', 'median', 'mean', 'stdev', 'q1', 'q3', 'iqr',
+              'ci_low', 'ci_high', 'confidence', 'repeats', 'number', 'outliers', 'warmup',
+              'comparisons', 'moves', 'peak_memory', 'phase_recursion', 'phase_merge', 'phase_copy']
+
+@dataclass
+class BenchmarkResult:
+    """
+    Результат вимірювання однієї комірки (алгоритм, тип даних, розмір).
+
+    Усі часові величини - секунди на один виклик функції. Лічильники
+    comparisons, moves та peak_memory (байти) заповнюються лише тоді, коли
+    їх увімкнено (див. instrumentation.py), інакше - None. Так само час фаз
+    phase_recursion, phase_merge та phase_copy (секунди на виклик, разом -
+    median) заповнюється лише в режимі профілювання (див. profiling.py).
+    """
+    algorithm: str
+    data_type: str
+    size: int
+    median: float
+    mean: float
+    stdev: float
+    q1: float
+    q3: float
+    iqr: float
+    ci_low: float
+    ci_high: float
+    confidence: float
+    repeats: int
+    number: int
+    outliers: int
+    warmup: int
+    comparisons: Optional[int] = None
+    moves: Optional[int] = None
+    peak_memory: Optional[int] = None
+    phase_recursion: Optional[float] = None
+    phase_merge: Optional[float] = None
+    phase_copy: Optional[float] = None
+    samples: List[float] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> dict:
+        """
+        Повертає поля результату без сирих вибірок (для CSV та історії).
+        """
+        row = asdict(self)
+        del row["samples"]
+        return row
+
+    @classmethod
+    def from_dict(cls, row: dict) -> "BenchmarkResult":
+        """
+        Відновлює результат зі словника (наприклад, із запису історії).
+        """
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in row.items() if k in names})
+
+def medians(results: List[Optional[BenchmarkResult]]) -> List[Optional[float]]:
+    """
+    Перетворює список результатів на список медіан (None залишається None).
+
+    Args:
+        results: Список BenchmarkResult або None
+
+    Returns:
+        Список медіанних часів
+    """
+    return [r.median if r is not None else None for r in results]
+
+def fit_exponent(sizes: List[int], values: List[Optional[float]]) -> Optional[float]:
+    """
+    Оцінює показник k у залежності value ≈ c · n^k.
+
+    Пряма підбирається методом найменших квадратів у логарифмічних координатах;
+    відсутні (None) та нульові значення пропускаються.
+
+    Args:
+        sizes: Розміри вхідних даних
+        values: Виміряні величини (час, порівняння, записи, пам'ять)
+
+    Returns:
+        Показник k або None, якщо точок менше двох
+    """
+    points = [(math.log(n), math.log(v)) for n, v in zip(sizes, values)
+              if v is not None and v > 0 and n > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+def _no_setup(data: Any) -> Any:
+    return data
+
+def _time_calls(func: Callable, inputs: List[Any]) -> float:
+    """
+    Вимірює сумарний час викликів func для вже підготовлених вхідних даних.
+    """
+    start = time.perf_counter()
+    for item in inputs:
+        func(item)
+    return time.perf_counter() - start
+
+def _median_confidence_interval(values: List[float], confidence: float):
+    """
+    Непараметричний довірчий інтервал медіани за порядковими статистиками.
+    """
+    n = len(values)
+    if n < 3:
+        return values[0], values[-1]
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    low_rank = max(1, math.floor((n - z * math.sqrt(n)) / 2))
+    high_rank = min(n, math.ceil(1 + (n + z * math.sqrt(n)) / 2))
+    return values[low_rank - 1], values[high_rank - 1]
+
+def summarize(samples: List[float], confidence: float = 0.95, outlier_k: float = 1.5):
+    """
+    Обчислює статистики вибірки з відкиданням викидів за правилом Тьюкі.
+
+    Args:
+        samples: Час одного виклику для кожного повтору
+        confidence: Рівень довіри для інтервалу медіани
+        outlier_k: Множник IQR для меж Тьюкі
+
+    Returns:
+        Словник зі статистиками та відфільтрованою вибіркою
+    """
+    ordered = sorted(samples)
+    if len(ordered) >= 4:
+        q1, _, q3 = statistics.quantiles(ordered, n=4, method='inclusive')
+        low, high = q1 - outlier_k * (q3 - q1), q3 + outlier_k * (q3 - q1)
+        kept = [x for x in ordered if low <= x <= high]
+    else:
+        kept = ordered
+
+    if len(kept) >= 2:
+        q1, _, q3 = statistics.quantiles(kept, n=4, method='inclusive')
+    else:
+        q1 = q3 = kept[0]
+    ci_low, ci_high = _median_confidence_interval(kept, confidence)
+
+    return {
+        "median": statistics.median(kept),
+        "mean": statistics.fmean(kept),
+        "stdev": statistics.stdev(kept) if len(kept) >= 2 else 0.0,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "outliers": len(ordered) - len(kept),
+        "kept": kept,
+    }
+
+def run_benchmark(func: Callable, data: Any,
+                  setup: Optional[Callable[[Any], Any]] = None,
+                  algorithm: str = "",
+                  data_type: str = "",
+                  warmup: int = 1,
+                  min_repeats: int = 5,
+                  max_repeats: int = 30,
+                  min_time: float = 0.2,
+                  max_time: float = 3.0,
+                  confidence: float = 0.95,
+                  outlier_k: float = 1.5) -> BenchmarkResult:
+    """
+    Вимірює час виконання func(data) з прогрівом, калібруванням та статистикою.
+
+    Повтори додаються, доки не виконано min_repeats повторів загальною
+    тривалістю min_time, але не більше max_repeats повторів і не довше
+    max_time секунд (принаймні один повтор виконується завжди).
+
+    Args:
+        func: Функція для вимірювання
+        data: Вхідні дані
+        setup: Підготовка вхідних даних для одного виклику, виконується поза
+               вимірюваною ділянкою. За замовчуванням дані передаються без копії,
+               тож функції, що змінюють вхід, мають передати setup (наприклад, копіювання)
+        algorithm: Назва алгоритму (для результату)
+        data_type: Тип даних (для результату)
+        warmup: Кількість прогрівальних запусків
+        min_repeats: Мінімальна кількість повторів
+        max_repeats: Максимальна кількість повторів
+        min_time: Мінімальний сумарний час вимірювання (секунди)
+        max_time: Максимальний сумарний час вимірювання (секунди)
+        confidence: Рівень довіри для інтервалу медіани
+        outlier_k: Множник IQR для відкидання викидів
+
+    Returns:
+        BenchmarkResult з медіаною, IQR та довірчим інтервалом
+    """
+    if setup is None:
+        setup = _no_setup
+
+    gc_was_enabled = gc.isenabled()
+    try:
+        # Прогрів: кеші, ліниві імпорти, спеціалізація інтерпретатора
+        for _ in range(warmup):
+            func(setup(data))
+
+        gc.collect()
+        gc.disable()
+
+        # Калібрування: скільки викликів потрібно, щоб повтор тривав REPEAT_TIME
+        single = _time_calls(func, [setup(data)])
+        number = 1
+        if single < REPEAT_TIME:
+            number = min(MAX_NUMBER, math.ceil(REPEAT_TIME / max(single, 1e-9)))
+
+        samples = [single] if number == 1 else []
+        total = single
+        while len(samples) < max_repeats and total < max_time:
+            if len(samples) >= min_repeats and total >= min_time:
+                break
+            inputs = [setup(data) for _ in range(number)]
+            elapsed = _time_calls(func, inputs)
+            samples.append(elapsed / number)
+            total += elapsed
+            del inputs
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    stats = summarize(samples, confidence, outlier_k)
+    return BenchmarkResult(
+        algorithm=algorithm,
+        data_type=data_type,
+        size=len(data) if hasattr(data, "__len__") else 0,
+        median=stats["median"],
+        mean=stats["mean"],
+        stdev=stats["stdev"],
+        q1=stats["q1"],
+        q3=stats["q3"],
+        iqr=stats["iqr"],
+        ci_low=stats["ci_low"],
+        ci_high=stats["ci_high"],
+        confidence=confidence,
+        repeats=len(samples),
+        number=number,
+        outliers=stats["outliers"],
+        warmup=warmup,
+        samples=stats["kept"],
+    )
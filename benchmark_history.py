@@ -0,0 +1,305 @@
+"""
+benchmark_history.py - Історія бенчмарків та порівняння з базовим запуском
+
+Кожен запуск порівняння дописується у файл benchmark_history.jsonl (один
+JSON-запис на комірку). Запис містить статистики BenchmarkResult, сирі
+вибірки, ідентифікатор запуску, git-коміт, версію Python, інформацію про
+процесор та час запуску.
+
+Режим порівняння зіставляє поточний (останній) запуск з базовим для кожної
+комірки (algorithm, data_type, size) і позначає статистично значущі
+регресії (U-критерій Манна-Уітні). Якщо регресії є, програма завершується
+з ненульовим кодом, тож її можна використовувати як перевірку змін.
+
+Використання:
+python3 benchmark_history.py list
+python3 benchmark_history.py compare                     # останній запуск проти попереднього
+python3 benchmark_history.py compare --baseline a1b2c3d  # проти запуску або коміту
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+HISTORY_FILE = "benchmark_history.jsonl"
+
+# Мінімальне відносне сповільнення медіани, яке вважається регресією
+DEFAULT_THRESHOLD = 0.05
+
+# Рівень значущості для U-критерію
+DEFAULT_ALPHA = 0.05
+
+# Поля метаданих запуску (див. run_metadata)
+METADATA_KEYS = ("run_id", "git_commit", "python_version", "python_implementation", "cpu", "timestamp")
+
+def git_commit() -> Optional[str]:
+    """
+    Повертає поточний git-коміт (з позначкою "-dirty", якщо є незбережені зміни).
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+def cpu_info() -> str:
+    """
+    Повертає опис процесора (модель та кількість ядер).
+    """
+    model = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    model = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return f"{model} ({os.cpu_count()} cores)"
+
+def run_metadata() -> dict:
+    """
+    Збирає метадані запуску: ідентифікатор, коміт, Python, процесор, час.
+    """
+    return {
+        "run_id": uuid.uuid4().hex[:12],
+        "git_commit": git_commit(),
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "cpu": cpu_info(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+def append_results(results, sizes, data_types, filename: str = HISTORY_FILE,
+                   metadata: Optional[dict] = None) -> str:
+    """
+    Дописує результати запуску у файл історії.
+
+    Args:
+        results: Словник {data_type: {алгоритм: [BenchmarkResult або None, ...]}}
+        sizes: Список розмірів
+        data_types: Список типів даних
+        filename: Файл історії (JSONL)
+        metadata: Метадані запуску (за замовчуванням - run_metadata())
+
+    Returns:
+        Ідентифікатор запуску
+    """
+    metadata = metadata or run_metadata()
+    for data_type in data_types:
+        for cells in results[data_type].values():
+            for result in cells:
+                if result is not None:
+                    append_record(result, metadata, filename)
+
+    print(f"\n🗂️  Результати додано до історії: {filename} (запуск {metadata['run_id']})")
+    return metadata["run_id"]
+
+def append_record(result, metadata: dict, filename: str = HISTORY_FILE) -> None:
+    """
+    Дописує у файл історії одну комірку (BenchmarkResult) з метаданими запуску.
+    """
+    record = {**metadata, **result.to_dict(), "samples": result.samples}
+    with open(filename, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def load_history(filename: str = HISTORY_FILE) -> List[dict]:
+    """
+    Читає всі записи історії.
+    """
+    if not os.path.exists(filename):
+        return []
+    with open(filename, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def list_runs(records: List[dict]) -> List[dict]:
+    """
+    Повертає метадані запусків у хронологічному порядку.
+    """
+    runs = {}
+    for record in records:
+        runs.setdefault(record["run_id"], {
+            "run_id": record["run_id"],
+            "git_commit": record.get("git_commit"),
+            "python_version": record.get("python_version"),
+            "cpu": record.get("cpu"),
+            "timestamp": record.get("timestamp"),
+            "cells": 0,
+        })["cells"] += 1
+    return list(runs.values())
+
+def select_run(records: List[dict], ref: Optional[str], offset: int = -1) -> List[dict]:
+    """
+    Вибирає записи одного запуску.
+
+    Args:
+        records: Усі записи історії
+        ref: Ідентифікатор запуску або префікс git-коміту (останній такий запуск);
+             None - запуск за позицією offset
+        offset: Позиція запуску в хронологічному списку (якщо ref не вказано)
+
+    Returns:
+        Записи обраного запуску
+    """
+    runs = list_runs(records)
+    if ref is None:
+        if len(runs) < abs(offset):
+            return []
+        run_id = runs[offset]["run_id"]
+    else:
+        matches = [r["run_id"] for r in runs
+                   if r["run_id"] == ref or (r["git_commit"] or "").startswith(ref)]
+        if not matches:
+            return []
+        run_id = matches[-1]
+    return [record for record in records if record["run_id"] == run_id]
+
+def mann_whitney_u(x: List[float], y: List[float]) -> float:
+    """
+    Односторонній U-критерій Манна-Уітні (нормальне наближення з поправкою на зв'язки).
+
+    Перевіряє гіпотезу, що значення y систематично більші за x.
+
+    Returns:
+        p-значення
+    """
+    n1, n2 = len(x), len(y)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+
+    combined = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    rank_sum_y = sum(r for r, (_, group) in zip(ranks, combined) if group == 1)
+    u_y = rank_sum_y - n2 * (n2 + 1) / 2
+
+    n = n1 + n2
+    mean_u = n1 * n2 / 2
+    var_u = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0
+    if var_u <= 0:
+        return 1.0
+    z = (u_y - mean_u - 0.5) / math.sqrt(var_u)
+    return 1 - statistics.NormalDist().cdf(z)
+
+def compare_runs(baseline: List[dict], current: List[dict],
+                 threshold: float = DEFAULT_THRESHOLD,
+                 alpha: float = DEFAULT_ALPHA) -> List[dict]:
+    """
+    Порівнює два запуски за кожною спільною коміркою (algorithm, data_type, size).
+
+    Регресія - медіана зросла більше ніж на threshold і U-критерій значущий на рівні alpha.
+
+    Returns:
+        Список словників з порівнянням для кожної комірки
+    """
+    def key(record) -> Tuple[str, str, int]:
+        return record["algorithm"], record["data_type"], record["size"]
+
+    baseline_cells: Dict[Tuple[str, str, int], dict] = {key(r): r for r in baseline}
+    rows = []
+    for record in current:
+        base = baseline_cells.get(key(record))
+        if base is None:
+            continue
+        change = record["median"] / base["median"] - 1 if base["median"] else 0.0
+        p_value = mann_whitney_u(base.get("samples", []), record.get("samples", []))
+        if change > threshold and p_value < alpha:
+            status = "regression"
+        elif change < -threshold and mann_whitney_u(record.get("samples", []),
+                                                    base.get("samples", [])) < alpha:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        rows.append({
+            "algorithm": record["algorithm"],
+            "data_type": record["data_type"],
+            "size": record["size"],
+            "baseline": base["median"],
+            "current": record["median"],
+            "change": change,
+            "p_value": p_value,
+            "status": status,
+        })
+    return rows
+
+def print_comparison(rows: List[dict]) -> None:
+    """
+    Виводить таблицю порівняння запусків.
+    """
+    marks = {"regression": "🔴", "improvement": "🟢", "unchanged": "  "}
+    print("-" * 92)
+    print(f"{'Алгоритм':<18} {'Тип даних':<18} {'Розмір':<10} {'Базовий':<12} "
+          f"{'Поточний':<12} {'Зміна':<9} {'p':<8}")
+    print("-" * 92)
+    for row in rows:
+        print(f"{row['algorithm']:<18} {row['data_type']:<18} {row['size']:<10,} "
+              f"{row['baseline']:<12.6f} {row['current']:<12.6f} {row['change']:<+9.1%} "
+              f"{row['p_value']:<8.3f}{marks[row['status']]}")
+
+def main():
+    """
+    Головна функція програми.
+    """
+    parser = argparse.ArgumentParser(description="Історія бенчмарків сортування")
+    parser.add_argument("--file", default=HISTORY_FILE, help="Файл історії (JSONL)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="Показати збережені запуски")
+
+    compare = subparsers.add_parser("compare", help="Порівняти запуск з базовим")
+    compare.add_argument("--baseline", help="Ідентифікатор запуску або префікс коміту (за замовчуванням - попередній запуск)")
+    compare.add_argument("--current", help="Ідентифікатор запуску або префікс коміту (за замовчуванням - останній запуск)")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="Мінімальне відносне сповільнення медіани")
+    compare.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                         help="Рівень значущості U-критерію")
+    args = parser.parse_args()
+
+    records = load_history(args.file)
+
+    if args.command == "list":
+        for run in list_runs(records):
+            print(f"{run['run_id']}  {run['timestamp']}  {run['git_commit'] or '-':<48} "
+                  f"Python {run['python_version']}  {run['cells']} комірок  {run['cpu']}")
+        return
+
+    current = select_run(records, args.current, offset=-1)
+    baseline = select_run(records, args.baseline, offset=-2)
+    if not current or not baseline:
+        print("❌ Не знайдено поточний або базовий запуск в історії")
+        sys.exit(2)
+
+    rows = compare_runs(baseline, current, args.threshold, args.alpha)
+    print(f"📊 Базовий: {baseline[0]['run_id']} ({baseline[0]['git_commit']}), "
+          f"поточний: {current[0]['run_id']} ({current[0]['git_commit']})")
+    print_comparison(rows)
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\n🔴 Виявлено регресій: {len(regressions)}")
+        sys.exit(1)
+    print("\n✅ Статистично значущих регресій не виявлено")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+datasets.py - Детермінована генерація та кешування тестових даних
+
+Особливості:
+- відтворюваність: однаковий seed дає однакові дані
+- векторизована генерація через numpy (якщо встановлено), інакше - генератор
+  випадкових чисел стандартної бібліотеки без поелементних викликів randint
+- дисковий кеш: згенеровані набори зберігаються як сирі файли int64 і
+  завантажуються через mmap, тож повторні прогони та паралельні процеси
+  використовують один набір зі спільних сторінок пам'яті без копіювання
+
+Типи даних:
+random, sorted, reversed, partially_sorted - як і раніше;
+few_unique - мало унікальних значень;
+sawtooth - повторювані зростаючі "зубці";
+organ_pipe - зростання до середини, потім спадання;
+zipf - значення з розподілом Ціпфа (частоти ~ 1/rank^s);
+sorted_random_tail - відсортований префікс і випадковий "хвіст" (10%);
+killer - перестановка, побудована супротивником МакІлроя проти introsort
+(змушує кожне розбиття бути якомога гіршим)
+"""
+
+import math
+import mmap
+import os
+import random
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+DATA_TYPES = (
+    "random", "sorted", "reversed", "partially_sorted",
+    "few_unique", "sawtooth", "organ_pipe", "zipf", "sorted_random_tail", "killer",
+)
+
+# Максимальне значення для випадкових даних
+MAX_VALUE = 1000000
+
+# Кількість унікальних значень для few_unique
+FEW_UNIQUE_VALUES = 16
+
+# Кількість рангів та показник для розподілу Ціпфа
+ZIPF_VALUES = 10000
+ZIPF_EXPONENT = 1.2
+
+# Частка випадкового "хвоста" для sorted_random_tail
+RANDOM_TAIL_FRACTION = 0.1
+
+DEFAULT_CACHE_DIR = ".dataset_cache"
+
+# Типи даних, що не кешуються на диску: killer залежить від реалізації
+# introsort, а не від seed, тож після змін сортування кеш був би застарілим
+UNCACHED_DATA_TYPES = {"killer"}
+
+# Літери для імен записів (зокрема з діакритикою та у різному регістрі)
+NAME_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZàáâäçèéêëíïñóöúüÀÉÖÜ"
+
+@dataclass
+class Record:
+    """
+    Запис для бенчмарків сортування за ключем.
+    """
+    id: int
+    name: str
+    score: float
+    group: int
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    Ліниво імпортує numpy (None, якщо не встановлено), щоб не сповільнювати запуск.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _sawtooth_period(size: int) -> int:
+    return max(1, math.isqrt(size))
+
+def _zipf_weights():
+    return [1 / rank ** ZIPF_EXPONENT for rank in range(1, ZIPF_VALUES + 1)]
+
+class _Adversary:
+    """
+    Супротивник МакІлроя ("A Killer Adversary for Quicksort"): значення
+    елементів визначаються лише під час порівнянь. Поки обидва елементи -
+    "газ" (ще не визначені), один з них заморожується найменшим вільним
+    значенням, а кандидатом в опорні стає той, що лишився газом. Так кожен
+    опорний елемент виявляється одним з найменших у своїй ділянці.
+    """
+
+    def __init__(self, size: int):
+        self.gas = size
+        self.values = [size] * size
+        self.solid = 0
+        self.candidate = 0
+
+    def freeze(self, index: int) -> None:
+        self.values[index] = self.solid
+        self.solid += 1
+
+    def less(self, x: int, y: int) -> bool:
+        values, gas = self.values, self.gas
+        if values[x] == gas and values[y] == gas:
+            self.freeze(x if x == self.candidate else y)
+        if values[x] == gas:
+            self.candidate = x
+        elif values[y] == gas:
+            self.candidate = y
+        return values[x] < values[y]
+
+class _AdversaryItem:
+    __slots__ = ("adversary", "index")
+
+    def __init__(self, adversary: _Adversary, index: int):
+        self.adversary = adversary
+        self.index = index
+
+    def __lt__(self, other: "_AdversaryItem") -> bool:
+        return self.adversary.less(self.index, other.index)
+
+    def __gt__(self, other: "_AdversaryItem") -> bool:
+        return self.adversary.less(other.index, self.index)
+
+def killer_sequence(size: int, sort_func: Optional[Callable] = None) -> List[int]:
+    """
+    Будує перестановку range(size), найгіршу для заданого сортування.
+
+    Сортування виконується над елементами-супротивниками; значення, що
+    вони отримали, і є вхідними даними, на яких детерміноване швидке
+    сортування робить найгірші розбиття. Генерація коштує один запуск
+    сортування над обгортками, тож для великих розмірів варто load_dataset.
+
+    Args:
+        size: Розмір даних
+        sort_func: Функція сортування (за замовчуванням sorting_core.introsort)
+
+    Returns:
+        Перестановка чисел 0..size-1
+    """
+    if sort_func is None:
+        # Лінивий імпорт: sorting_core сам імпортує datasets
+        from sorting_core import introsort
+        sort_func = introsort
+
+    adversary = _Adversary(size)
+    sort_func([_AdversaryItem(adversary, i) for i in range(size)])
+    # Елементи, що лишилися газом, заморожуються у довільному порядку
+    for index in range(size):
+        if adversary.values[index] == adversary.gas:
+            adversary.freeze(index)
+    return adversary.values
+
+class _DuplicateAdversary:
+    """
+    Супротивник, що робить рівними всіх кандидатів в опорні: два елементи-газ
+    при порівнянні заморожуються однаковим найменшим допустимим значенням,
+    а газ завжди більший за заморожені елементи. Кожен опорний елемент
+    виявляється найменшим у ділянці разом з кількома рівними йому.
+    """
+
+    def __init__(self, size: int):
+        self.values = [None] * size
+        # Найменше значення, яке ще може отримати кожен елемент-газ
+        self.floor = [0] * size
+
+    def less(self, x: int, y: int) -> bool:
+        values, floor = self.values, self.floor
+        if values[x] is None and values[y] is None:
+            values[x] = values[y] = max(floor[x], floor[y])
+            return False
+        if values[x] is None:
+            floor[x] = max(floor[x], values[y] + 1)
+            return False
+        if values[y] is None:
+            floor[y] = max(floor[y], values[x] + 1)
+            return True
+        return values[x] < values[y]
+
+def duplicate_killer_sequence(size: int, sort_func: Optional[Callable] = None) -> List[int]:
+    """
+    Будує дані з дублікатами, де всі кандидати в опорні рівні найменшому значенню ділянки.
+
+    На відміну від killer_sequence (лише різні значення) такі дані ведуть
+    introsort у гілку розбиття на три частини, яка відкидає лише кілька
+    рівних опорному елементів за крок.
+
+    Args:
+        size: Розмір даних
+        sort_func: Функція сортування (за замовчуванням sorting_core.introsort)
+
+    Returns:
+        Список невід'ємних цілих чисел з повторами
+    """
+    if sort_func is None:
+        # Лінивий імпорт: sorting_core сам імпортує datasets
+        from sorting_core import introsort
+        sort_func = introsort
+
+    adversary = _DuplicateAdversary(size)
+    sort_func([_AdversaryItem(adversary, i) for i in range(size)])
+    return [value if value is not None else adversary.floor[index]
+            for index, value in enumerate(adversary.values)]
+
+def _generate_numpy(size: int, data_type: str, seed: Optional[int]):
+    """
+    Векторизована генерація у numpy.ndarray int64.
+    """
+    np = _numpy()
+    rng = np.random.default_rng(seed)
+
+    if data_type == "random":
+        return rng.integers(0, MAX_VALUE, size=size, endpoint=True, dtype=np.int64)
+    elif data_type == "sorted":
+        return np.arange(size, dtype=np.int64)
+    elif data_type == "reversed":
+        return np.arange(size, 0, -1, dtype=np.int64)
+    elif data_type == "partially_sorted":
+        # size // 4 обмінів зачіпають до половини позицій: перемішуємо такі позиції між собою
+        arr = np.arange(size, dtype=np.int64)
+        positions = rng.choice(size, size=min(size, 2 * (size // 4)), replace=False)
+        arr[positions] = arr[rng.permutation(positions)]
+        return arr
+    elif data_type == "few_unique":
+        values = rng.integers(0, MAX_VALUE, size=FEW_UNIQUE_VALUES, endpoint=True, dtype=np.int64)
+        return values[rng.integers(0, FEW_UNIQUE_VALUES, size=size)]
+    elif data_type == "sawtooth":
+        return np.arange(size, dtype=np.int64) % _sawtooth_period(size)
+    elif data_type == "organ_pipe":
+        index = np.arange(size, dtype=np.int64)
+        return np.minimum(index, size - 1 - index)
+    elif data_type == "zipf":
+        weights = np.array(_zipf_weights())
+        return rng.choice(ZIPF_VALUES, size=size, p=weights / weights.sum()).astype(np.int64) + 1
+    elif data_type == "sorted_random_tail":
+        tail = int(size * RANDOM_TAIL_FRACTION)
+        head = np.arange(size - tail, dtype=np.int64)
+        return np.concatenate([head, rng.integers(0, MAX_VALUE, size=tail, endpoint=True, dtype=np.int64)])
+    elif data_type == "killer":
+        return np.array(killer_sequence(size), dtype=np.int64)
+    raise ValueError(f"Невідомий тип даних: {data_type}")
+
+def _generate_python(size: int, data_type: str, seed: Optional[int]) -> list:
+    """
+    Генерація на чистому Python (без numpy).
+    """
+    rng = random.Random(seed)
+    values = range(MAX_VALUE + 1)
+
+    if data_type == "random":
+        return rng.choices(values, k=size)
+    elif data_type == "sorted":
+        return list(range(size))
+    elif data_type == "reversed":
+        return list(range(size, 0, -1))
+    elif data_type == "partially_sorted":
+        arr = list(range(size))
+        for _ in range(size // 4):
+            i, j = rng.randrange(size), rng.randrange(size)
+            arr[i], arr[j] = arr[j], arr[i]
+        return arr
+    elif data_type == "few_unique":
+        unique = rng.choices(values, k=FEW_UNIQUE_VALUES)
+        return rng.choices(unique, k=size)
+    elif data_type == "sawtooth":
+        period = _sawtooth_period(size)
+        return [i % period for i in range(size)]
+    elif data_type == "organ_pipe":
+        return [min(i, size - 1 - i) for i in range(size)]
+    elif data_type == "zipf":
+        return rng.choices(range(1, ZIPF_VALUES + 1), weights=_zipf_weights(), k=size)
+    elif data_type == "sorted_random_tail":
+        tail = int(size * RANDOM_TAIL_FRACTION)
+        return list(range(size - tail)) + rng.choices(values, k=tail)
+    elif data_type == "killer":
+        return killer_sequence(size)
+    raise ValueError(f"Невідомий тип даних: {data_type}")
+
+def generate(size: int, data_type: str = "random", seed: Optional[int] = None,
+             backend: str = "list"):
+    """
+    Генерує тестові дані.
+
+    Якщо встановлено numpy, генерація завжди векторизована (і для списків),
+    тому той самий seed дає однакові дані для всіх бекендів.
+
+    Args:
+        size: Розмір даних
+        data_type: Один з DATA_TYPES
+        seed: Зерно генератора (None - недетерміновано)
+        backend: "list", "array" (array('q')) або "numpy"
+
+    Returns:
+        Список, array('q') або numpy.ndarray int64
+    """
+    if data_type not in DATA_TYPES:
+        raise ValueError(f"Невідомий тип даних: {data_type}")
+
+    if _numpy() is not None:
+        data = _generate_numpy(size, data_type, seed)
+        if backend == "numpy":
+            return data
+        if backend == "array":
+            buf = array('q')
+            buf.frombytes(data.tobytes())
+            return buf
+        if backend == "list":
+            return data.tolist()
+    else:
+        if backend == "numpy":
+            raise ImportError("Бекенд 'numpy' потребує numpy: pip3 install numpy")
+        data = _generate_python(size, data_type, seed)
+        if backend == "array":
+            return array('q', data)
+        if backend == "list":
+            return data
+
+    raise ValueError(f"Невідомий бекенд: {backend}")
+
+def cache_path(size: int, data_type: str, seed: int, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """
+    Шлях до файлу кешу. Назва включає генератор, бо numpy та Python дають різні дані.
+    """
+    generator = "np" if _numpy() is not None else "py"
+    return os.path.join(cache_dir, f"{data_type}_{size}_seed{seed}_{generator}.i64")
+
+def load_dataset(size: int, data_type: str = "random", seed: int = 0,
+                 cache_dir: str = DEFAULT_CACHE_DIR) -> memoryview:
+    """
+    Повертає набір даних з дискового кешу, генеруючи його за потреби.
+
+    Файл відображається у пам'ять через mmap лише для читання: дані не
+    копіюються, а різні процеси спільно використовують ті самі сторінки.
+    Типи з UNCACHED_DATA_TYPES щоразу генеруються заново.
+
+    Args:
+        size: Розмір даних
+        data_type: Один з DATA_TYPES
+        seed: Зерно генератора
+        cache_dir: Каталог кешу
+
+    Returns:
+        memoryview формату 'q' (int64); .tolist() дає список для сортувальників
+    """
+    if data_type in UNCACHED_DATA_TYPES:
+        return memoryview(generate(size, data_type, seed, backend="array"))
+
+    path = cache_path(size, data_type, seed, cache_dir)
+
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        data = generate(size, data_type, seed, backend="array")
+
+        # Атомарний запис: паралельні процеси не побачать недописаний файл
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            data.tofile(f)
+        os.replace(tmp_path, path)
+
+    if size == 0:
+        return memoryview(array('q'))
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast('q')
+
+def generate_records(size: int, seed: Optional[int] = None) -> List[Record]:
+    """
+    Генерує записи (dataclass Record) для сортування за обчислюваним ключем.
+
+    Значення group та score часто повторюються, тож стабільність сортування
+    за ними помітна.
+
+    Args:
+        size: Кількість записів
+        seed: Зерно генератора (None - недетерміновано)
+
+    Returns:
+        Список записів
+    """
+    rng = random.Random(seed)
+    return [
+        Record(
+            id=i,
+            name="".join(rng.choices(NAME_ALPHABET, k=rng.randint(6, 16))),
+            score=round(rng.uniform(0, 100), 1),
+            group=rng.randrange(16),
+        )
+        for i in range(size)
+    ]
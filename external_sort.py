@@ -0,0 +1,302 @@
+"""
+external_sort.py - Зовнішнє сортування злиттям для даних, більших за оперативну пам'ять
+
+Алгоритм складається з двох фаз:
+1. Вхідні дані читаються порціями, що вміщуються у бюджет пам'яті. Кожна порція
+   сортується одним з наявних алгоритмів (timsort, merge_sort) і записується
+   у тимчасовий бінарний файл ("run") у форматі int64.
+2. Файли-run'и зливаються k-шляховим злиттям (iter_merge_k_lists) з обмеженими
+   буферами читання та запису. Якщо run'ів більше, ніж fan_in, злиття
+   виконується у кілька проходів.
+
+Використання:
+python3 external_sort.py                       # бенчмарк проти timsort
+python3 external_sort.py input.bin output.bin  # сортування бінарного файлу int64
+"""
+
+import argparse
+import os
+import tempfile
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from merge_k_lists import iter_merge_k_lists
+from sorting_core import generate_data, measure_time, timsort
+
+# Розмір одного елемента у файлі (int64)
+ITEM_SIZE = array('q').itemsize
+
+# Приблизна вартість одного елемента у списку Python: об'єкт int (28 байт)
+# плюс вказівник у списку (8 байт)
+LIST_BYTES_PER_ELEMENT = 36
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_FAN_IN = 16
+
+def run_size_for_budget(memory_budget: int) -> int:
+    """
+    Обчислює кількість елементів в одному run'і для заданого бюджету пам'яті.
+
+    Сортувальники повертають новий список, тому під час сортування у пам'яті
+    одночасно перебувають дві копії порції.
+
+    Args:
+        memory_budget: Бюджет пам'яті у байтах
+
+    Returns:
+        Кількість елементів в одному run'і
+    """
+    return max(1, memory_budget // (2 * LIST_BYTES_PER_ELEMENT))
+
+def buffer_size_for_budget(memory_budget: int, fan_in: int) -> int:
+    """
+    Обчислює розмір буфера (в елементах) для кожного файлу під час злиття.
+
+    Бюджет рівномірно ділиться між fan_in буферами читання та одним буфером запису.
+
+    Args:
+        memory_budget: Бюджет пам'яті у байтах
+        fan_in: Кількість run'ів, що зливаються за один прохід
+
+    Returns:
+        Кількість елементів в одному буфері
+    """
+    return max(1, memory_budget // ((fan_in + 1) * ITEM_SIZE))
+
+def read_int64_file(path: str, buffer_elements: int) -> Iterator[int]:
+    """
+    Послідовно читає бінарний файл int64 блоками фіксованого розміру.
+
+    Args:
+        path: Шлях до файлу
+        buffer_elements: Кількість елементів, що читаються за один раз
+
+    Yields:
+        Цілі числа з файлу
+    """
+    with open(path, 'rb') as f:
+        while True:
+            chunk = array('q')
+            data = f.read(buffer_elements * ITEM_SIZE)
+            if not data:
+                break
+            chunk.frombytes(data)
+            yield from chunk
+
+def write_int64_file(values: Iterable[int], path: str, buffer_elements: int) -> int:
+    """
+    Записує цілі числа у бінарний файл int64, накопичуючи їх у буфері.
+
+    Args:
+        values: Цілі числа для запису
+        path: Шлях до файлу
+        buffer_elements: Кількість елементів, що записуються за один раз
+
+    Returns:
+        Кількість записаних елементів
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        chunk = array('q')
+        for value in values:
+            chunk.append(value)
+            if len(chunk) >= buffer_elements:
+                chunk.tofile(f)
+                count += len(chunk)
+                chunk = array('q')
+        chunk.tofile(f)
+        count += len(chunk)
+    return count
+
+def _split_into_runs(data: Iterable[int], run_size: int, sorter: Callable[[List[int]], List[int]],
+                     tmp_dir: str, buffer_elements: int) -> List[str]:
+    """
+    Розбиває вхідні дані на відсортовані run'и та записує їх у тимчасові файли.
+    """
+    paths = []
+    run = []
+
+    def spill():
+        path = os.path.join(tmp_dir, f"run_{len(paths):06d}.bin")
+        write_int64_file(sorter(run), path, buffer_elements)
+        paths.append(path)
+
+    for value in data:
+        run.append(value)
+        if len(run) >= run_size:
+            spill()
+            run = []
+
+    if run or not paths:
+        spill()
+
+    return paths
+
+def _merge_passes(paths: List[str], fan_in: int, tmp_dir: str, buffer_elements: int) -> List[str]:
+    """
+    Зливає run'и групами по fan_in, доки їх не залишиться не більше fan_in.
+    """
+    generation = 0
+    while len(paths) > fan_in:
+        merged_paths = []
+        for start in range(0, len(paths), fan_in):
+            group = paths[start:start + fan_in]
+            if len(group) == 1:
+                merged_paths.append(group[0])
+                continue
+            path = os.path.join(tmp_dir, f"merge_{generation:03d}_{start:06d}.bin")
+            readers = [read_int64_file(p, buffer_elements) for p in group]
+            write_int64_file(iter_merge_k_lists(readers), path, buffer_elements)
+
+            # Проміжні файли більше не потрібні
+            for p in group:
+                os.remove(p)
+            merged_paths.append(path)
+        paths = merged_paths
+        generation += 1
+    return paths
+
+def external_sort(data: Iterable[int],
+                  memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                  fan_in: int = DEFAULT_FAN_IN,
+                  sorter: Callable[[List[int]], List[int]] = timsort,
+                  tmp_dir: Optional[str] = None) -> Iterator[int]:
+    """
+    Зовнішнє сортування злиттям.
+
+    Дані споживаються потоково, тому вхід може бути генератором або файлом,
+    що значно перевищує оперативну пам'ять. Тимчасові файли видаляються,
+    щойно ітератор буде вичерпано або закрито. Параметри перевіряються
+    одразу під час виклику, а не на першому next().
+
+    Args:
+        data: Ітерований об'єкт з цілими числами (int64)
+        memory_budget: Бюджет пам'яті у байтах
+        fan_in: Максимальна кількість run'ів, що зливаються за один прохід
+        sorter: Алгоритм сортування порцій у пам'яті (timsort, merge_sort, ...)
+        tmp_dir: Каталог для тимчасових файлів (за замовчуванням системний)
+
+    Returns:
+        Ітератор елементів у відсортованому порядку
+    """
+    if fan_in < 2:
+        raise ValueError(f"fan_in має бути не менше 2: {fan_in}")
+
+    run_size = run_size_for_budget(memory_budget)
+    buffer_elements = buffer_size_for_budget(memory_budget, fan_in)
+    return _external_sort_iter(data, run_size, buffer_elements, fan_in, sorter, tmp_dir)
+
+def _external_sort_iter(data: Iterable[int], run_size: int, buffer_elements: int, fan_in: int,
+                        sorter: Callable[[List[int]], List[int]],
+                        tmp_dir: Optional[str]) -> Iterator[int]:
+    """
+    Генератор зовнішнього сортування з уже перевіреними параметрами.
+    """
+    with tempfile.TemporaryDirectory(prefix="external_sort_", dir=tmp_dir) as work_dir:
+        paths = _split_into_runs(data, run_size, sorter, work_dir, buffer_elements)
+        paths = _merge_passes(paths, fan_in, work_dir, buffer_elements)
+
+        readers = [read_int64_file(p, buffer_elements) for p in paths]
+        yield from iter_merge_k_lists(readers)
+
+def external_sort_file(input_path: str, output_path: str,
+                       memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                       fan_in: int = DEFAULT_FAN_IN,
+                       sorter: Callable[[List[int]], List[int]] = timsort,
+                       tmp_dir: Optional[str] = None) -> int:
+    """
+    Сортує бінарний файл int64 і записує результат в інший файл.
+
+    Args:
+        input_path: Шлях до вхідного файлу
+        output_path: Шлях до вихідного файлу
+        memory_budget: Бюджет пам'яті у байтах
+        fan_in: Максимальна кількість run'ів, що зливаються за один прохід
+        sorter: Алгоритм сортування порцій у пам'яті
+        tmp_dir: Каталог для тимчасових файлів
+
+    Returns:
+        Кількість відсортованих елементів
+    """
+    buffer_elements = buffer_size_for_budget(memory_budget, fan_in)
+    data = read_int64_file(input_path, buffer_elements)
+    sorted_data = external_sort(data, memory_budget, fan_in, sorter, tmp_dir)
+    return write_int64_file(sorted_data, output_path, buffer_elements)
+
+def benchmark_external_sort(memory_budget: int, fan_in: int = DEFAULT_FAN_IN,
+                            factors=(0.5, 1, 2, 4, 8)):
+    """
+    Порівнює зовнішнє сортування з timsort у пам'яті навколо точки переходу.
+
+    Точка переходу - розмір, за якого дані перестають вміщуватися в один run.
+
+    Args:
+        memory_budget: Бюджет пам'яті у байтах
+        fan_in: Максимальна кількість run'ів, що зливаються за один прохід
+        factors: Множники розміру відносно точки переходу
+
+    Returns:
+        Список кортежів (розмір, час external_sort, час timsort)
+    """
+    crossover = run_size_for_budget(memory_budget)
+    results = []
+
+    print(f"\n📊 Бюджет пам'яті: {memory_budget:,} байт, fan_in={fan_in}, "
+          f"точка переходу: {crossover:,} елементів")
+    print("-" * 60)
+    print(f"{'Розмір':<12} {'External':<12} {'Timsort':<12} {'Сповільнення':<12}")
+    print("-" * 60)
+
+    for factor in factors:
+        size = max(1, int(crossover * factor))
+        data = generate_data(size, "random")
+
+        external_time = measure_time(
+            lambda d: list(external_sort(d, memory_budget, fan_in)), data, runs=1)
+        timsort_time = measure_time(timsort, data, runs=1)
+        results.append((size, external_time, timsort_time))
+
+        print(f"{size:<12,} {external_time:<12.6f} {timsort_time:<12.6f} "
+              f"{external_time / timsort_time:<.2f}x")
+
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    parser = argparse.ArgumentParser(description="Зовнішнє сортування злиттям файлів int64")
+    parser.add_argument("input", nargs="?", help="Вхідний бінарний файл int64")
+    parser.add_argument("output", nargs="?", help="Вихідний бінарний файл int64")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_BUDGET / 2**20,
+                        help="Бюджет пам'яті у мегабайтах")
+    parser.add_argument("--fan-in", type=int, default=DEFAULT_FAN_IN,
+                        help="Кількість run'ів, що зливаються за один прохід")
+    args = parser.parse_args()
+
+    memory_budget = int(args.memory_mb * 2**20)
+
+    if args.input is None:
+        # Без аргументів запускаємо бенчмарк з невеликим бюджетом
+        data = generate_data(10000)
+        result = list(external_sort(data, memory_budget=64 * 1024, fan_in=4))
+        # Порівняння з sorted(data) помічає і втрачені чи продубльовані записи
+        assert result == sorted(data), "external_sort повернув неправильний результат"
+        try:
+            external_sort(data, fan_in=1)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("external_sort не перевірив fan_in під час виклику")
+        print("✅ Перевірка коректності пройдена")
+        benchmark_external_sort(memory_budget=4 * 1024 * 1024, fan_in=args.fan_in)
+        return
+
+    if args.output is None:
+        parser.error("потрібно вказати вихідний файл")
+
+    count = external_sort_file(args.input, args.output, memory_budget, args.fan_in)
+    print(f"✅ Відсортовано {count:,} елементів -> {args.output}")
+
+if __name__ == "__main__":
+    main()
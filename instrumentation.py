@@ -0,0 +1,288 @@
+"""
+instrumentation.py - Лічильники операцій та пікової пам'яті для сортувальників
+
+Для кожного запуску рахуються:
+- порівняння: елементи обгортаються у CountedKey, методи порівняння якого
+  збільшують лічильник (працює і для вбудованого sorted(), і для bisect/heapq)
+- переміщення (записи елементів): сортувальник виконується з
+  інструментованої копії свого модуля, у якій кожен запис елемента
+  (arr[i] = x, присвоєння зрізу, append/extend/insert, генератор списку)
+  збільшує лічильник
+- пікова пам'ять: tracemalloc під час окремого запуску без лічильників
+
+Інструментовані копії створюються лише на вимогу, а оригінальні функції
+не змінюються, тому без увімкнених лічильників накладних витрат немає.
+Записи всередині C-коду (sorted(), list.copy()) не рахуються.
+
+Використання:
+python3 instrumentation.py
+"""
+
+import ast
+import inspect
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+class OperationCounter:
+    """
+    Лічильник порівнянь та переміщень елементів.
+    """
+    __slots__ = ("comparisons", "moves")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.comparisons = 0
+        self.moves = 0
+
+COUNTER = OperationCounter()
+
+class CountedKey:
+    """
+    Обгортка елемента, що рахує кожне порівняння у COUNTER.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "CountedKey") -> bool:
+        COUNTER.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other: "CountedKey") -> bool:
+        COUNTER.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other: "CountedKey") -> bool:
+        COUNTER.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other: "CountedKey") -> bool:
+        COUNTER.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other: object) -> bool:
+        COUNTER.comparisons += 1
+        return self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __repr__(self) -> str:
+        return f"CountedKey({self.value!r})"
+
+def _moved(value: Any, count: int = 1) -> Any:
+    """
+    Враховує count записів елементів і повертає значення без змін.
+
+    Списки не вважаються елементами: це службові структури (описи run'ів, кошики).
+    """
+    if not isinstance(value, list):
+        COUNTER.moves += count
+    return value
+
+def _moved_all(values: Any) -> Any:
+    """
+    Враховує запис усіх елементів послідовності (зріз, extend, генератор списку).
+    """
+    if not hasattr(values, "__len__"):
+        values = list(values)
+    if not (len(values) and isinstance(values[0], list)):
+        COUNTER.moves += len(values)
+    return values
+
+class _MoveCounter(ast.NodeTransformer):
+    """
+    Переписує записи елементів у виклики _moved/_moved_all.
+    """
+
+    @staticmethod
+    def _call(name: str, *args: ast.expr) -> ast.Call:
+        return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+    def visit_Assign(self, node: ast.Assign) -> ast.Assign:
+        self.generic_visit(node)
+        target = node.targets[0]
+        if isinstance(target, ast.Subscript):
+            if isinstance(target.slice, ast.Slice):
+                node.value = self._call("_moved_all", node.value)
+            else:
+                node.value = self._call("_moved", node.value)
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            # Обмін на зразок arr[i], arr[j] = arr[j], arr[i]
+            count = sum(isinstance(elt, ast.Subscript) for elt in target.elts)
+            if count:
+                node.value = self._call("_moved", node.value, ast.Constant(count))
+        elif isinstance(node.value, ast.ListComp):
+            node.value = self._call("_moved_all", node.value)
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.Call:
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Attribute) and node.args:
+            if node.func.attr == "append":
+                node.args[0] = self._call("_moved", node.args[0])
+            elif node.func.attr == "extend":
+                node.args[0] = self._call("_moved_all", node.args[0])
+            elif node.func.attr == "insert" and len(node.args) == 2:
+                node.args[1] = self._call("_moved", node.args[1])
+        return node
+
+# Кеш інструментованих модулів: (вид інструментування, ім'я модуля) -> простір імен
+_instrumented_modules: Dict[tuple, dict] = {}
+
+def instrumented_copy(func: Callable, transformer: ast.NodeTransformer,
+                      helpers: Dict[str, Any]) -> Callable:
+    """
+    Повертає копію функції з модуля, переписаного transformer'ом.
+
+    Увесь модуль функції компілюється заново, тому рекурсивні виклики та
+    допоміжні функції модуля теж інструментовані. Копії кешуються окремо
+    для кожного виду інструментування (класу transformer'а).
+
+    Args:
+        func: Функція модуля (не з __main__)
+        transformer: Перетворювач AST модуля
+        helpers: Імена, що додаються до простору імен копії (виклики з переписаного коду)
+
+    Returns:
+        Інструментована функція з тією ж сигнатурою
+    """
+    module = sys.modules[func.__module__]
+    cache_key = (type(transformer).__name__, module.__name__)
+    namespace = _instrumented_modules.get(cache_key)
+    if namespace is None:
+        tree = transformer.visit(ast.parse(inspect.getsource(module)))
+        ast.fix_missing_locations(tree)
+        namespace = dict(vars(module))
+        namespace.update(helpers)
+        exec(compile(tree, inspect.getsourcefile(module), "exec"), namespace)
+        _instrumented_modules[cache_key] = namespace
+    return namespace[func.__name__]
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Повертає копію функції, що рахує записи елементів у COUNTER.moves.
+
+    Args:
+        func: Функція сортування або злиття
+
+    Returns:
+        Інструментована функція з тією ж сигнатурою
+    """
+    return instrumented_copy(func, _MoveCounter(), {"_moved": _moved, "_moved_all": _moved_all})
+
+def _wrap(data: Any) -> Any:
+    """
+    Обгортає елементи (також у вкладених списках) у CountedKey.
+    """
+    if any(isinstance(item, list) for item in data):
+        return [_wrap(item) for item in data]
+    return [CountedKey(item) for item in data]
+
+def _copy(data: Any) -> Any:
+    """
+    Копіює вхідні дані (також вкладені списки), щоб кожен запуск мав свою копію.
+    """
+    if any(isinstance(item, list) for item in data):
+        return [list(item) for item in data]
+    return list(data)
+
+def peak_memory(func: Callable, *inputs: Any) -> int:
+    """
+    Вимірює пікову пам'ять, виділену під час виклику func(*inputs), у байтах.
+    """
+    inputs = [_copy(data) for data in inputs]
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        func(*inputs)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+def measure_operations(func: Callable, *inputs: Any,
+                       count_comparisons: bool = True,
+                       count_moves: bool = True) -> Dict[str, Optional[int]]:
+    """
+    Рахує порівняння, переміщення та пікову пам'ять для одного виклику func(*inputs).
+
+    Кожна метрика вимірюється окремим запуском, тож лічильники не впливають
+    на пікову пам'ять, а вимірювання часу виконується без них.
+
+    Args:
+        func: Функція сортування або злиття
+        inputs: Вхідні списки (для merge_k_lists - список списків)
+        count_comparisons: Рахувати порівняння (False для сортувань без порівнянь)
+        count_moves: Рахувати записи (False для функцій, реалізованих у C)
+
+    Returns:
+        Словник {"comparisons", "moves", "peak_memory"}; None - метрика не вимірювалась
+    """
+    comparisons = moves = None
+
+    if count_comparisons:
+        COUNTER.reset()
+        func(*[_wrap(data) for data in inputs])
+        comparisons = COUNTER.comparisons
+
+    if count_moves:
+        COUNTER.reset()
+        instrumented(func)(*[_copy(data) for data in inputs])
+        moves = COUNTER.moves
+
+    return {"comparisons": comparisons, "moves": moves,
+            "peak_memory": peak_memory(func, *inputs)}
+
+def main():
+    """
+    Головна функція програми.
+    """
+    from benchmark import fit_exponent
+    from merge_k_lists import merge_k_lists
+    from sorting_core import generate_data, insertion_sort, merge, merge_sort, timsort
+
+    sizes = [250, 500, 1000, 2000, 4000]
+
+    def merge_input(n):
+        data = generate_data(n, "random", seed=n)
+        return sorted(data[:n // 2]), sorted(data[n // 2:])
+
+    def k_lists_input(n):
+        data = generate_data(n, "random", seed=n)
+        return ([sorted(data[i::8]) for i in range(8)],)
+
+    cases = [
+        ("insertion_sort", insertion_sort, lambda n: (generate_data(n, "random", seed=n),), True),
+        ("merge_sort", merge_sort, lambda n: (generate_data(n, "random", seed=n),), True),
+        ("merge", merge, merge_input, True),
+        ("timsort", timsort, lambda n: (generate_data(n, "random", seed=n),), False),
+        ("merge_k_lists (k=8)", merge_k_lists, k_lists_input, True),
+    ]
+
+    print("🔢 Лічильники операцій (випадкові дані)")
+    print("-" * 70)
+    print(f"{'Функція':<22} {'n':<8} {'Порівняння':<14} {'Записи':<14} {'Пам`ять, КБ':<12}")
+    print("-" * 70)
+    for label, func, make_input, count_moves in cases:
+        rows = []
+        for n in sizes:
+            ops = measure_operations(func, *make_input(n), count_moves=count_moves)
+            rows.append(ops)
+            moves = f"{ops['moves']:,}" if ops["moves"] is not None else "N/A"
+            print(f"{label:<22} {n:<8,} {ops['comparisons']:<14,} {moves:<14} "
+                  f"{ops['peak_memory'] / 1024:<12.1f}")
+        exponents = [fit_exponent(sizes, [row[metric] for row in rows])
+                     for metric in ("comparisons", "moves", "peak_memory")]
+        cells = "".join(f"{'N/A' if k is None else f'n^{k:.2f}':<15}" for k in exponents)
+        print(f"{'':<22} {'оцінка':<8} {cells}")
+
+if __name__ == "__main__":
+    main()
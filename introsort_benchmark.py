@@ -0,0 +1,126 @@
+"""
+introsort_benchmark.py - Найгірший випадок та пам'ять introsort
+
+Перевіряє три речі:
+1. Час introsort проти merge_sort і timsort на всіх типах даних, зокрема
+   на "killer" - перестановці, побудованій супротивником МакІлроя.
+2. Кількість порівнянь на killer-даних: introsort лишається O(n log n)
+   завдяки переходу на heapsort, а те саме швидке сортування без цього
+   переходу на власних killer-даних деградує до O(n^2). Окремо - дані з
+   рівними кандидатами в опорні (duplicate_killer_sequence), що ведуть у
+   гілку розбиття на три частини.
+3. Пікову пам'ять: introsort сортує на місці з O(log n) стеком, а
+   merge_sort створює нові списки на кожному рівні рекурсії.
+
+Використання:
+python3 introsort_benchmark.py
+"""
+
+from typing import List
+
+from benchmark import fit_exponent
+from datasets import DATA_TYPES, duplicate_killer_sequence, killer_sequence
+from instrumentation import measure_operations, peak_memory
+from sorting_core import (
+    DATA_SEED, generate_data, introsort, introsort_range, measure_time, merge_sort, timsort,
+)
+
+def quicksort_without_fallback(arr: List[int]) -> List[int]:
+    """
+    Той самий introsort, але без переходу на heapsort (для демонстрації killer-даних).
+    """
+    arr = arr.copy()
+    introsort_range(arr, 0, len(arr), bad_allowed=len(arr) + 1)
+    return arr
+
+def introsort_in_place(arr: List[int]) -> None:
+    """
+    Сортування на місці без копії входу (для вимірювання власної пам'яті алгоритму).
+    """
+    introsort_range(arr, 0, len(arr))
+
+def benchmark_times(size: int = 50000):
+    """
+    Час introsort, merge_sort та timsort на всіх типах даних.
+    """
+    print(f"\n⏱️  Час сортування ({size:,} елементів):")
+    print("-" * 62)
+    print(f"{'Тип даних':<20} {'Introsort':<14} {'Merge':<14} {'Timsort':<14}")
+    print("-" * 62)
+    results = {}
+    for data_type in DATA_TYPES:
+        data = generate_data(size, data_type, seed=DATA_SEED)
+        times = [measure_time(func, data) for func in (introsort, merge_sort, timsort)]
+        results[data_type] = times
+        print(f"{data_type:<20} " + "".join(f"{t:<14.6f}" for t in times))
+    return results
+
+def benchmark_killer(sizes=(500, 1000, 2000, 4000)):
+    """
+    Порівняння на killer-даних: introsort проти швидкого сортування без heapsort.
+
+    Кожен варіант отримує killer-перестановку, побудовану саме проти нього.
+    """
+    print("\n💣 Порівняння на killer-даних (супротивник МакІлроя):")
+    print("-" * 88)
+    print(f"{'n':<8} {'Introsort':<16} {'Без heapsort':<16} {'Рівні кандидати':<16} "
+          f"{'Introsort, random':<20}")
+    print("-" * 88)
+
+    rows = {"introsort": [], "plain": [], "duplicates": [], "random": []}
+    for n in sizes:
+        rows["introsort"].append(measure_operations(
+            introsort, killer_sequence(n), count_moves=False)["comparisons"])
+        rows["plain"].append(measure_operations(
+            quicksort_without_fallback, killer_sequence(n, quicksort_without_fallback),
+            count_moves=False)["comparisons"])
+        rows["duplicates"].append(measure_operations(
+            introsort, duplicate_killer_sequence(n), count_moves=False)["comparisons"])
+        rows["random"].append(measure_operations(
+            introsort, generate_data(n, "random", seed=DATA_SEED), count_moves=False)["comparisons"])
+        print(f"{n:<8,} {rows['introsort'][-1]:<16,} {rows['plain'][-1]:<16,} "
+              f"{rows['duplicates'][-1]:<16,} {rows['random'][-1]:<20,}")
+
+    exponents = [fit_exponent(list(sizes), rows[name]) for name in rows]
+    print(f"{'оцінка':<8} " + "".join(f"{f'n^{k:.2f}':<16}" for k in exponents[:3])
+          + f"{f'n^{exponents[3]:.2f}':<20}")
+    return rows
+
+def benchmark_memory(sizes=(10000, 50000, 100000)):
+    """
+    Пікова пам'ять introsort (з копією та на місці) проти merge_sort.
+    """
+    print("\n💾 Пікова пам'ять (tracemalloc, random):")
+    print("-" * 72)
+    print(f"{'n':<10} {'Introsort, КБ':<16} {'на місці, КБ':<16} {'Merge, КБ':<14} {'Merge / Intro':<14}")
+    print("-" * 72)
+    results = []
+    for n in sizes:
+        data = generate_data(n, "random", seed=DATA_SEED)
+        intro = peak_memory(introsort, data)
+        in_place = peak_memory(introsort_in_place, data)
+        merge = peak_memory(merge_sort, data)
+        results.append((n, intro, in_place, merge))
+        print(f"{n:<10,} {intro / 1024:<16.1f} {in_place / 1024:<16.1f} {merge / 1024:<14.1f} "
+              f"{merge / intro:<14.1f}")
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    for data_type in DATA_TYPES:
+        for n in (0, 1, 2, 25, 200, 3000):
+            data = generate_data(n, data_type, seed=n)
+            assert introsort(data) == sorted(data), (data_type, n)
+    for n in (0, 1, 25, 3000):
+        data = duplicate_killer_sequence(n)
+        assert introsort(data) == sorted(data), ("duplicate_killer", n)
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_times()
+    benchmark_killer()
+    benchmark_memory()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+key_benchmark.py - Сортування записів за ключем: кешування ключів проти обчислення при кожному порівнянні
+
+Усі сортувальники приймають key= та reverse= і обчислюють ключ рівно один
+раз для кожного елемента (схема "прикрасити - відсортувати - зняти
+прикраси", а у злитті - перетворення Шварца). Бенчмарк порівнює це з
+наївним підходом, коли дорогий ключ обчислюється заново при кожному
+порівнянні, на записах (dataclass Record) з дорогим ключем.
+
+Використання:
+python3 key_benchmark.py
+"""
+
+import unicodedata
+from typing import List, Sequence
+
+from datasets import generate_records
+from sorting_core import ALGORITHMS, DATA_SEED, measure_time
+
+# Алгоритми для порівняння (квадратичні пропущено - на записах вони надто повільні)
+KEY_ALGORITHMS = ("shell", "merge", "bottom_up", "adaptive", "timsort")
+
+def record_key(record):
+    """
+    Дорогий ключ запису: нормалізоване ім'я без урахування регістру, потім бал за спаданням.
+    """
+    return unicodedata.normalize("NFKD", record.name).casefold(), -record.score
+
+class _UncachedKey:
+    """
+    Обгортка, що обчислює ключ заново при кожному порівнянні.
+    """
+    __slots__ = ("item", "key")
+
+    def __init__(self, item, key):
+        self.item = item
+        self.key = key
+
+    def __lt__(self, other: "_UncachedKey") -> bool:
+        return self.key(self.item) < other.key(other.item)
+
+    def __le__(self, other: "_UncachedKey") -> bool:
+        return self.key(self.item) <= other.key(other.item)
+
+    def __gt__(self, other: "_UncachedKey") -> bool:
+        return self.key(self.item) > other.key(other.item)
+
+    def __ge__(self, other: "_UncachedKey") -> bool:
+        return self.key(self.item) >= other.key(other.item)
+
+def _sort_uncached(func, records, key=record_key):
+    return [wrapped.item for wrapped in func([_UncachedKey(record, key) for record in records])]
+
+def count_key_calls(func, records, cached: bool) -> int:
+    """
+    Рахує виклики record_key за одне сортування (окремий запуск без вимірювання часу).
+    """
+    calls = 0
+
+    def counting_key(record):
+        nonlocal calls
+        calls += 1
+        return record_key(record)
+
+    if cached:
+        func(records, key=counting_key)
+    else:
+        _sort_uncached(func, records, counting_key)
+    return calls
+
+def benchmark_key_caching(size: int = 10000, algorithms: Sequence[str] = KEY_ALGORITHMS) -> List[tuple]:
+    """
+    Порівнює сортування записів з кешованими ключами та з ключем при кожному порівнянні.
+
+    Args:
+        size: Кількість записів
+        algorithms: Ключі алгоритмів з ALGORITHMS
+
+    Returns:
+        Список кортежів (алгоритм, час без кешу, час з кешем, викликів key без кешу, з кешем)
+    """
+    records = generate_records(size, seed=DATA_SEED)
+
+    print(f"\n🗂️  Сортування записів за дорогим ключем ({size:,} записів):")
+    print("-" * 86)
+    print(f"{'Алгоритм':<12} {'Без кешу':<12} {'З кешем':<12} {'Прискорення':<13} "
+          f"{'key() без кешу':<16} {'key() з кешем':<14}")
+    print("-" * 86)
+
+    results = []
+    for name in algorithms:
+        func, label, _ = ALGORITHMS[name]
+        assert func(records, key=record_key) == sorted(records, key=record_key), name
+
+        uncached = measure_time(lambda d: _sort_uncached(func, d), records)
+        cached = measure_time(lambda d: func(d, key=record_key), records)
+        uncached_calls = count_key_calls(func, records, cached=False)
+        cached_calls = count_key_calls(func, records, cached=True)
+
+        results.append((name, uncached, cached, uncached_calls, cached_calls))
+        print(f"{label:<12} {uncached:<12.6f} {cached:<12.6f} {uncached / cached:<13.2f} "
+              f"{uncached_calls:<16,} {cached_calls:<14,}")
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    benchmark_key_caching()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+merge_files.py - Злиття відсортованих файлів-шардів в один файл
+
+Зливає сотні відсортованих файлів (текстові - по одному цілому числу в
+рядку, або бінарні int64) одним проходом через iter_merge_k_lists:
+- читання великими блоками (буферизоване або через mmap) з обмеженим
+  попереднім читанням для кожного файлу
+- запис пакетами через буфер
+- необов'язкове видалення дублікатів (--unique)
+- звіт про пропускну здатність у МБ/с та елементах/с
+
+Результат збігається з merge_k_lists для тих самих даних у пам'яті
+(перевіряється прапорцем --verify).
+
+Використання:
+python3 merge_files.py                                   # перевірка та бенчмарк
+python3 merge_files.py merged.bin shards/*.bin --reader mmap
+python3 merge_files.py merged.txt shards/*.txt --unique --verify
+"""
+
+import argparse
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from external_sort import ITEM_SIZE, read_int64_file, write_int64_file
+from merge_k_lists import iter_merge_k_lists, merge_k_lists
+from sorting_core import DATA_SEED, generate_data, timsort
+
+FORMATS = ("int64", "text")
+READERS = ("buffered", "mmap")
+
+# Попереднє читання для кожного файлу та буфер запису (байти)
+DEFAULT_READ_AHEAD = 256 * 1024
+DEFAULT_WRITE_BUFFER = 4 * 1024 * 1024
+
+# Середній розмір одного текстового рядка для оцінки буфера запису
+TEXT_BYTES_PER_ELEMENT = 8
+
+@dataclass
+class MergeStats:
+    """
+    Результат злиття файлів.
+    """
+    elements: int
+    input_bytes: int
+    output_bytes: int
+    seconds: float
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.input_bytes / 2**20 / self.seconds if self.seconds else 0.0
+
+    @property
+    def elements_per_second(self) -> float:
+        return self.elements / self.seconds if self.seconds else 0.0
+
+def detect_format(path: str) -> str:
+    """
+    Формат за розширенням: .bin/.i64 - int64, інакше - текст.
+    """
+    return "int64" if os.path.splitext(path)[1] in (".bin", ".i64") else "text"
+
+def _mmap_blocks(path: str, block_size: int) -> Iterator[bytes]:
+    """
+    Блоки файлу, відображеного у пам'ять (копіюється лише поточний блок).
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for start in range(0, len(mapped), block_size):
+                yield mapped[start:start + block_size]
+
+def _file_blocks(path: str, block_size: int) -> Iterator[bytes]:
+    """
+    Блоки файлу, прочитані буферизованим читанням.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+def _decode_text(blocks: Iterable[bytes]) -> Iterator[int]:
+    """
+    Цілі числа з рядків; рядок, розірваний межею блоку, дописується з наступного.
+    """
+    tail = b""
+    for block in blocks:
+        lines = (tail + block).split(b"\n")
+        tail = lines.pop()
+        yield from map(int, filter(None, lines))
+    if tail.strip():
+        yield int(tail)
+
+def _decode_int64(blocks: Iterable[bytes]) -> Iterator[int]:
+    for block in blocks:
+        yield from array('q', block)
+
+def open_shard(path: str, fmt: str, reader: str = "buffered",
+               read_ahead: int = DEFAULT_READ_AHEAD) -> Iterator[int]:
+    """
+    Потік значень відсортованого файлу.
+
+    Args:
+        path: Шлях до файлу
+        fmt: "int64" або "text"
+        reader: "buffered" або "mmap"
+        read_ahead: Розмір блоку попереднього читання (байти)
+
+    Returns:
+        Ітератор цілих чисел
+    """
+    if fmt == "int64":
+        elements = max(1, read_ahead // ITEM_SIZE)
+        if reader == "buffered":
+            return read_int64_file(path, elements)
+        # Блок кратний розміру елемента, тож елементи не розриваються
+        return _decode_int64(_mmap_blocks(path, elements * ITEM_SIZE))
+    blocks = _file_blocks if reader == "buffered" else _mmap_blocks
+    return _decode_text(blocks(path, read_ahead))
+
+def write_text_file(values: Iterable[int], path: str, buffer_elements: int) -> int:
+    """
+    Записує цілі числа по одному в рядку пакетами по buffer_elements.
+
+    Returns:
+        Кількість записаних елементів
+    """
+    count = 0
+    iterator = iter(values)
+    with open(path, 'w', encoding='ascii') as f:
+        while True:
+            batch = list(islice(iterator, buffer_elements))
+            if not batch:
+                return count
+            f.write("\n".join(map(str, batch)))
+            f.write("\n")
+            count += len(batch)
+
+def unique_sorted(values: Iterable[int]) -> Iterator[int]:
+    """
+    Пропускає повтори у відсортованому потоці.
+    """
+    iterator = iter(values)
+    for previous in iterator:
+        yield previous
+        for value in iterator:
+            if value != previous:
+                yield value
+                previous = value
+
+def merge_files(paths: List[str], output: str, fmt: str = "int64", reader: str = "buffered",
+                read_ahead: int = DEFAULT_READ_AHEAD, write_buffer: int = DEFAULT_WRITE_BUFFER,
+                unique: bool = False, output_format: Optional[str] = None) -> MergeStats:
+    """
+    Зливає відсортовані файли в один відсортований файл.
+
+    Args:
+        paths: Відсортовані файли-шарди
+        output: Вихідний файл
+        fmt: Формат шардів ("int64" або "text")
+        reader: Спосіб читання ("buffered" або "mmap")
+        read_ahead: Попереднє читання для кожного файлу (байти)
+        write_buffer: Буфер запису (байти)
+        unique: Видаляти дублікати
+        output_format: Формат виходу (за замовчуванням - як у шардів)
+
+    Returns:
+        Статистика злиття
+    """
+    output_format = output_format or fmt
+    start = time.perf_counter()
+
+    merged = iter_merge_k_lists([open_shard(path, fmt, reader, read_ahead) for path in paths])
+    if unique:
+        merged = unique_sorted(merged)
+
+    if output_format == "int64":
+        count = write_int64_file(merged, output, max(1, write_buffer // ITEM_SIZE))
+    else:
+        count = write_text_file(merged, output, max(1, write_buffer // TEXT_BYTES_PER_ELEMENT))
+
+    return MergeStats(
+        elements=count,
+        input_bytes=sum(os.path.getsize(path) for path in paths),
+        output_bytes=os.path.getsize(output),
+        seconds=time.perf_counter() - start,
+    )
+
+def load_shard(path: str, fmt: str) -> List[int]:
+    """
+    Завантажує файл цілком у список (для перевірки).
+    """
+    return list(open_shard(path, fmt))
+
+def verify_merge(paths: List[str], output: str, fmt: str, output_format: str,
+                 unique: bool = False) -> bool:
+    """
+    Порівнює вихідний файл з merge_k_lists над тими самими даними в пам'яті.
+    """
+    expected = merge_k_lists([load_shard(path, fmt) for path in paths])
+    if unique:
+        expected = list(unique_sorted(expected))
+    return load_shard(output, output_format) == expected
+
+def write_shards(directory: str, shards: int, size: int, fmt: str) -> List[str]:
+    """
+    Створює відсортовані файли-шарди з випадковими даними.
+
+    Returns:
+        Шляхи до файлів
+    """
+    data = generate_data(shards * size, "random", seed=DATA_SEED)
+    extension = ".bin" if fmt == "int64" else ".txt"
+    paths = []
+    for i in range(shards):
+        path = os.path.join(directory, f"shard_{i:04d}{extension}")
+        values = timsort(data[i::shards])
+        if fmt == "int64":
+            write_int64_file(values, path, 65536)
+        else:
+            write_text_file(values, path, 65536)
+        paths.append(path)
+    return paths
+
+def benchmark_merge_files(shards: int = 200, size: int = 5000,
+                          read_aheads=(4 * 1024, DEFAULT_READ_AHEAD)):
+    """
+    Вимірює пропускну здатність злиття файлів для форматів, способів читання
+    та розмірів попереднього читання.
+
+    Returns:
+        Список кортежів (формат, спосіб читання, попереднє читання, MergeStats)
+    """
+    print(f"\n🗂️  Злиття файлів: {shards} шардів × {size:,} елементів")
+    print("-" * 80)
+    print(f"{'Формат':<8} {'Читання':<10} {'Блок, КБ':<10} {'Час, с':<10} {'МБ/с':<10} "
+          f"{'Елементів/с':<14} {'--unique':<10}")
+    print("-" * 80)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="merge_files_") as tmp_dir:
+        for fmt in FORMATS:
+            paths = write_shards(tmp_dir, shards, size, fmt)
+            output = os.path.join(tmp_dir, "merged" + (".bin" if fmt == "int64" else ".txt"))
+            for reader in READERS:
+                for read_ahead in read_aheads:
+                    stats = merge_files(paths, output, fmt, reader, read_ahead)
+                    unique_stats = merge_files(paths, output, fmt, reader, read_ahead, unique=True)
+                    results.append((fmt, reader, read_ahead, stats))
+                    print(f"{fmt:<8} {reader:<10} {read_ahead // 1024:<10} {stats.seconds:<10.3f} "
+                          f"{stats.mb_per_second:<10.1f} {stats.elements_per_second:<14,.0f} "
+                          f"{unique_stats.elements:,} ел.")
+            assert verify_merge(paths, output, fmt, fmt, unique=True)
+            for path in paths:
+                os.remove(path)
+    return results
+
+def _self_test() -> None:
+    """
+    Перевіряє збіг з merge_k_lists для всіх форматів, способів читання та --unique.
+    """
+    with tempfile.TemporaryDirectory(prefix="merge_files_") as tmp_dir:
+        for fmt in FORMATS:
+            paths = write_shards(tmp_dir, 7, 300, fmt)
+            # Порожній шард та шард з повторами
+            empty = os.path.join(tmp_dir, "empty" + (".bin" if fmt == "int64" else ".txt"))
+            open(empty, 'wb').close()
+            repeats = os.path.join(tmp_dir, "repeats" + (".bin" if fmt == "int64" else ".txt"))
+            (write_int64_file if fmt == "int64" else write_text_file)([5, 5, 5, 10**6], repeats, 2)
+            paths += [empty, repeats]
+
+            for reader in READERS:
+                for unique in (False, True):
+                    for output_format in FORMATS:
+                        output = os.path.join(tmp_dir, "out")
+                        # Малий блок перевіряє рядки та елементи на межах блоків
+                        merge_files(paths, output, fmt, reader, read_ahead=64, write_buffer=100,
+                                    unique=unique, output_format=output_format)
+                        assert verify_merge(paths, output, fmt, output_format, unique), \
+                            (fmt, reader, unique, output_format)
+
+def main():
+    """
+    Головна функція програми.
+    """
+    parser = argparse.ArgumentParser(description="Злиття відсортованих файлів-шардів")
+    parser.add_argument("output", nargs="?", help="Вихідний файл")
+    parser.add_argument("shards", nargs="*", help="Відсортовані файли-шарди")
+    parser.add_argument("--format", choices=("auto",) + FORMATS, default="auto",
+                        help="Формат шардів (auto - за розширенням: .bin/.i64 - int64)")
+    parser.add_argument("--output-format", choices=FORMATS, default=None,
+                        help="Формат вихідного файлу (за замовчуванням - як у шардів)")
+    parser.add_argument("--reader", choices=READERS, default="buffered", help="Спосіб читання")
+    parser.add_argument("--read-ahead-kb", type=int, default=DEFAULT_READ_AHEAD // 1024,
+                        help="Попереднє читання для кожного файлу (КБ)")
+    parser.add_argument("--write-buffer-kb", type=int, default=DEFAULT_WRITE_BUFFER // 1024,
+                        help="Буфер запису (КБ)")
+    parser.add_argument("--unique", action="store_true", help="Видаляти дублікати")
+    parser.add_argument("--verify", action="store_true",
+                        help="Порівняти результат з merge_k_lists над даними в пам'яті")
+    args = parser.parse_args()
+
+    if args.output is None:
+        _self_test()
+        print("✅ Перевірка коректності пройдена")
+        benchmark_merge_files()
+        return
+
+    if not args.shards:
+        parser.error("потрібно вказати хоча б один файл-шард")
+
+    fmt = detect_format(args.shards[0]) if args.format == "auto" else args.format
+    output_format = args.output_format or fmt
+    stats = merge_files(args.shards, args.output, fmt, args.reader,
+                        args.read_ahead_kb * 1024, args.write_buffer_kb * 1024,
+                        args.unique, output_format)
+
+    print(f"✅ Злито {len(args.shards)} файлів: {stats.elements:,} елементів -> {args.output}")
+    print(f"   ⏱️  {stats.seconds:.3f} с, {stats.mb_per_second:.1f} МБ/с, "
+          f"{stats.elements_per_second:,.0f} елементів/с")
+
+    if args.verify:
+        if not verify_merge(args.shards, args.output, fmt, output_format, args.unique):
+            parser.exit(1, "❌ Результат не збігається з merge_k_lists\n")
+        print("   ✅ Результат збігається з merge_k_lists")
+
+if __name__ == "__main__":
+    main()
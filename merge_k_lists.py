@@ -1,16 +1,29 @@
-from typing import List
+import argparse
+import heapq
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
-def merge_two_lists(list1: List[int], list2: List[int]) -> List[int]:
+def merge_two_lists(list1: List[Any], list2: List[Any],
+                    key: Optional[Callable[[Any], Any]] = None,
+                    reverse: bool = False) -> List[Any]:
     """
     Злиття двох відсортованих списків у один відсортований список.
     
     Args:
         list1: Перший відсортований список
         list2: Другий відсортований список
+        key: Функція ключа, за якою відсортовані списки (обчислюється один раз
+             для кожного елемента)
+        reverse: Списки відсортовані за спаданням
         
     Returns:
-        Об'єднаний відсортований список
+        Об'єднаний відсортований список (рівні елементи list1 - першими)
     """
+    if key is not None or reverse:
+        merged = _merge_two_decorated(_decorate(list1, key), _decorate(list2, key), reverse)
+        return [item for _, item in merged]
+    
     result = []
     i = j = 0
     
@@ -29,36 +42,344 @@ def merge_two_lists(list1: List[int], list2: List[int]) -> List[int]:
     
     return result
 
-def merge_k_lists(lists: List[List[int]]) -> List[int]:
+def _decorate(items: List[Any], key: Optional[Callable[[Any], Any]]) -> List[tuple]:
+    """
+    Перетворює список на пари (ключ, елемент), обчислюючи кожен ключ один раз.
+    """
+    if key is None:
+        return [(item, item) for item in items]
+    return [(key(item), item) for item in items]
+
+def _merge_two_decorated(list1: List[tuple], list2: List[tuple], reverse: bool) -> List[tuple]:
+    """
+    Стабільне злиття списків пар (ключ, елемент) з порівнянням лише ключів.
+    """
+    result = []
+    i = j = 0
+    
+    while i < len(list1) and j < len(list2):
+        # Елемент першого списку береться першим і при рівності ключів
+        if reverse:
+            take_first = not (list1[i][0] < list2[j][0])
+        else:
+            take_first = not (list2[j][0] < list1[i][0])
+        if take_first:
+            result.append(list1[i])
+            i += 1
+        else:
+            result.append(list2[j])
+            j += 1
+    
+    result.extend(list1[i:])
+    result.extend(list2[j:])
+    return result
+
+def _merge_halves(lists: List[List[Any]], merge_two: Callable = merge_two_lists) -> List[Any]:
+    """
+    Попарне злиття з поділом за кількістю списків (без урахування їх довжин).
+    
+    Залишено для порівняння з _merge_balanced у бенчмарку.
+    """
+    if not lists:
+        return []
+    if len(lists) == 1:
+        return lists[0]
+    mid = len(lists) // 2
+    return merge_two(_merge_halves(lists[:mid], merge_two), _merge_halves(lists[mid:], merge_two))
+
+def _merge_balanced(lists: List[List[Any]], merge_two: Callable,
+                    key_of: Callable[[Any], Any], reverse: bool) -> List[Any]:
+    """
+    Злиття з урахуванням довжин: спочатку зливаються найкоротші сусідні списки.
+    
+    Як в оптимальних шаблонах злиття (код Гаффмана), пара з найменшою сумарною
+    довжиною зливається першою, тож довгий список копіюється якомога рідше.
+    Зливаються лише сусідні (за номером) списки - так рівні елементи
+    зберігають порядок джерел. Списки, діапазони яких не перетинаються,
+    з'єднуються конкатенацією без порівняння елементів.
+    
+    Args:
+        lists: Відсортовані списки
+        merge_two: Стабільне злиття двох списків
+        key_of: Ключ порівняння елемента списку
+        reverse: Списки відсортовані за спаданням
+        
+    Returns:
+        Об'єднаний відсортований список
+    """
+    runs = [items for items in lists if items]
+    if not runs:
+        return []
+    if len(runs) == 1:
+        # Копія: результат не повинен бути списком, який передав викликач
+        return list(runs[0])
+    
+    def less(a: Any, b: Any) -> bool:
+        return b < a if reverse else a < b
+    
+    def concat(*parts: List[Any]) -> List[Any]:
+        result = []
+        for part in parts:
+            result.extend(part)
+        return result
+    
+    # Швидкий шлях: діапазони всіх списків не перетинаються - упорядковуємо
+    # списки за першим елементом (k порівнянь замість N) і з'єднуємо. Рівні
+    # межі допустимі лише тоді, коли порядок джерел зберігається
+    order = sorted(range(len(runs)), key=lambda i: key_of(runs[i][0]), reverse=reverse)
+    if all(not less(key_of(runs[b][0]), key_of(runs[a][-1])) and
+           (a < b or less(key_of(runs[a][-1]), key_of(runs[b][0])))
+           for a, b in zip(order, order[1:])):
+        return concat(*(runs[i] for i in order))
+    
+    def merge_adjacent(left: List[Any], right: List[Any]) -> List[Any]:
+        if not less(key_of(right[0]), key_of(left[-1])):
+            return concat(left, right)
+        if less(key_of(right[-1]), key_of(left[0])):
+            return concat(right, left)
+        return merge_two(left, right)
+    
+    # Двобічно зв'язаний список сусідів і купа пар (сумарна довжина, лівий, правий);
+    # застарілі пари відкидаються під час вилучення з купи
+    n = len(runs)
+    sizes = [len(items) for items in runs]
+    next_run = list(range(1, n + 1))
+    prev_run = list(range(-1, n - 1))
+    heap = [(sizes[i] + sizes[i + 1], i, i + 1) for i in range(n - 1)]
+    heapq.heapify(heap)
+    
+    while heap:
+        total, i, j = heapq.heappop(heap)
+        if runs[i] is None or runs[j] is None or next_run[i] != j or sizes[i] + sizes[j] != total:
+            continue
+        runs[i] = merge_adjacent(runs[i], runs[j])
+        runs[j] = None
+        sizes[i] = total
+        next_run[i] = next_run[j]
+        if next_run[i] < n:
+            prev_run[next_run[i]] = i
+            heapq.heappush(heap, (total + sizes[next_run[i]], i, next_run[i]))
+        if prev_run[i] >= 0:
+            heapq.heappush(heap, (sizes[prev_run[i]] + total, prev_run[i], i))
+    
+    return runs[0]
+
+def _merge_k_decorated(lists: List[List[tuple]], reverse: bool) -> List[tuple]:
+    """
+    Злиття списків пар (ключ, елемент) з урахуванням довжин.
+    """
+    return _merge_balanced(lists, lambda left, right: _merge_two_decorated(left, right, reverse),
+                           itemgetter(0), reverse)
+
+def merge_k_lists(lists: List[List[Any]], key: Optional[Callable[[Any], Any]] = None,
+                  reverse: bool = False, limit: Optional[int] = None) -> List[Any]:
     """
     Злиття k відсортованих списків у один відсортований список.
     
     Args:
         lists: Список відсортованих списків
+        key: Функція ключа, за якою відсортовані списки
+        reverse: Списки відсортовані за спаданням
+        limit: Повернути лише перші limit елементів (None - усі)
         
     Returns:
         Об'єднаний відсортований список
     """
-    # Базовий випадок: якщо немає списків, повертаємо порожній список
-    if not lists:
-        return []
+    # Лише перші limit елементів: ліниве злиття купою зупиняється після
+    # limit кроків - O(k + limit·log k) замість злиття всіх N елементів
+    if limit is not None:
+        return list(islice(iter_merge_k_lists(lists, key, reverse), max(0, limit)))
     
-    # Базовий випадок: якщо є лише один список, повертаємо його
-    if len(lists) == 1:
-        return lists[0]
+    # З ключем - перетворення Шварца: ключі обчислюються один раз на початку,
+    # усі рівні злиття порівнюють готові ключі, а в кінці пари знімаються
+    if key is not None or reverse:
+        decorated = [_decorate(items, key) for items in lists]
+        return [item for _, item in _merge_k_decorated(decorated, reverse)]
     
-    # Рекурсивно об'єднуємо списки, розділяючи їх на пари
-    mid = len(lists) // 2
-    left = merge_k_lists(lists[:mid])
-    right = merge_k_lists(lists[mid:])
+    # Злиття з урахуванням довжин списків (найкоротші - першими) та
+    # конкатенацією списків з діапазонами, що не перетинаються
+    return _merge_balanced(lists, merge_two_lists, _identity, False)
+
+def _identity(value: Any) -> Any:
+    return value
+
+class _ReversedKey:
+    """
+    Обгортка ключа, що інвертує порівняння (для злиття у спадному порядку).
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_ReversedKey") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        # Потрібне для порівняння записів купи [ключ, номер, ...]: список
+        # переходить до номера джерела лише тоді, коли ключі рівні за ==
+        if not isinstance(other, _ReversedKey):
+            return NotImplemented
+        return self.value == other.value
+
+def iter_merge_k_lists(lists: Iterable[Iterable[Any]],
+                       key: Optional[Callable[[Any], Any]] = None,
+                       reverse: bool = False) -> Iterator[Any]:
+    """
+    Ліниве k-шляхове злиття відсортованих послідовностей за допомогою купи.
+    
+    На відміну від merge_k_lists, не створює проміжних списків: у купі
+    одночасно зберігається лише по одному поточному елементу з кожного
+    джерела, тому пікова пам'ять O(k), а не O(N). Злиття стабільне: рівні
+    елементи видаються у порядку номерів джерел.
     
-    # Об'єднуємо дві половини
-    return merge_two_lists(left, right)
+    Args:
+        lists: Відсортовані ітеровані об'єкти (списки, генератори, файли тощо)
+        key: Функція обчислення ключа порівняння (як у sorted())
+        reverse: True, якщо джерела відсортовані за спаданням
+        
+    Yields:
+        Елементи у відсортованому порядку
+    """
+    heap = []
+    
+    # Беремо перший елемент з кожного джерела
+    for index, iterable in enumerate(lists):
+        iterator = iter(iterable)
+        for value in iterator:
+            sort_key = value if key is None else key(value)
+            if reverse:
+                sort_key = _ReversedKey(sort_key)
+            # Номер джерела розриває нічиї та гарантує стабільність
+            heap.append([sort_key, index, value, iterator])
+            break
+    
+    heapq.heapify(heap)
+    
+    while len(heap) > 1:
+        entry = heap[0]
+        yield entry[2]
+        
+        # Замінюємо вершину купи наступним елементом того ж джерела
+        for value in entry[3]:
+            sort_key = value if key is None else key(value)
+            entry[0] = _ReversedKey(sort_key) if reverse else sort_key
+            entry[2] = value
+            heapq.heapreplace(heap, entry)
+            break
+        else:
+            heapq.heappop(heap)
+    
+    # Останнє джерело віддаємо без порівнянь
+    if heap:
+        _, _, value, iterator = heap[0]
+        yield value
+        yield from iterator
+
+def _shard_scenarios(total: int, k: int, seed: int) -> dict:
+    """
+    Набори відсортованих списків для бенчмарку планування злиття.
+    """
+    import random
+    from bisect import bisect_left
+    from datasets import generate
+    
+    if not 2 <= k <= total // 2:
+        raise ValueError(f"Кількість списків має бути від 2 до {total // 2}: {k}")
+    
+    rng = random.Random(seed)
+    data = generate(total, "random", seed=seed)
+    
+    # Рівні за розміром списки з перемішаними значеннями
+    equal = [sorted(data[i::k]) for i in range(k)]
+    
+    # Перекіс: один великий список (половина даних) і k - 1 малих різного розміру
+    cuts = sorted(rng.sample(range(1, total // 2), k - 2))
+    bounds = [0] + cuts + [total // 2]
+    skewed = [sorted(data[total // 2:])] + [sorted(data[lo:hi]) for lo, hi in zip(bounds, bounds[1:])]
+    rng.shuffle(skewed)
+    
+    # Діапазони не перетинаються (шарди за діапазонами значень, тож рівні
+    # значення потрапляють в один шард), порядок шардів перемішаний
+    ordered = sorted(data)
+    step = total // k
+    cuts = [bisect_left(ordered, ordered[i * step]) for i in range(k)] + [total]
+    disjoint = [ordered[lo:hi] for lo, hi in zip(cuts, cuts[1:])]
+    rng.shuffle(disjoint)
+    
+    # Часові шарди з невеликим перекриттям сусідніх діапазонів
+    overlap = step // 10
+    time_shards = [sorted(ordered[max(0, i * step - overlap):(i + 1) * step][::2] +
+                          ordered[(i + 1) * step:(i + 1) * step + overlap][1::2])
+                   for i in range(k)]
+    
+    return {
+        "рівні": equal,
+        "перекіс": skewed,
+        "без перетину": disjoint,
+        "часові з перекриттям": time_shards,
+    }
+
+def benchmark_merge_planning(total: int = 200000, k: int = 64):
+    """
+    Порівнює поділ за кількістю списків зі злиттям з урахуванням довжин.
+    
+    Для кожного набору виводяться час і кількість переміщень елементів
+    (записів у проміжні та результуючий списки).
+    
+    Args:
+        total: Загальна кількість елементів
+        k: Кількість списків
+        
+    Returns:
+        Словник {набір: {варіант: (час, переміщення)}}
+    """
+    # Функції беруться з імпортованого модуля: інструментування перекомпілює
+    # модуль, а при запуску як скрипта це був би __main__
+    import merge_k_lists as module
+    from instrumentation import measure_operations
+    from sorting_core import DATA_SEED, measure_time
+    
+    def by_heap(lists):
+        return list(module.iter_merge_k_lists(lists))
+    
+    variants = [
+        ("поділ навпіл", module._merge_halves, True),
+        ("за довжинами", module.merge_k_lists, True),
+        ("купа (iter)", by_heap, False),
+    ]
+    
+    print(f"\n🧮 Планування злиття: {k} списків, {total:,} елементів")
+    print("-" * 92)
+    print(f"{'Набір':<22} " + "".join(f"{name + ', с':<16} {'записи':<12}" for name, _, _ in variants[:2])
+          + f"{variants[2][0] + ', с':<16}")
+    print("-" * 92)
+    
+    results = {}
+    for scenario, lists in _shard_scenarios(total, k, DATA_SEED).items():
+        expected = sorted(value for items in lists for value in items)
+        row = {}
+        for name, func, count_moves in variants:
+            assert func(lists) == expected, name
+            moves = None
+            if count_moves:
+                moves = measure_operations(func, lists, count_comparisons=False)["moves"]
+            row[name] = (measure_time(func, lists), moves)
+        results[scenario] = row
+        cells = "".join(f"{row[name][0]:<16.4f} {row[name][1]:<12,}" for name, _, _ in variants[:2])
+        print(f"{scenario:<22} {cells}{row[variants[2][0]][0]:<16.4f}")
+    
+    return results
 
 def main():
     """
     Тестування функції merge_k_lists.
     """
+    parser = argparse.ArgumentParser(description="Злиття k відсортованих списків")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Запустити бенчмарк планування злиття (200 000 елементів, 64 списки)")
+    args = parser.parse_args()
+    
     # Тестовий випадок з прикладу
     lists = [[1, 4, 5], [1, 3, 4], [2, 6]]
     merged_list = merge_k_lists(lists)
@@ -81,6 +402,39 @@ def main():
     for i, test_case in enumerate(test_cases):
         result = merge_k_lists(test_case)
         print(f"Тест {i+1}: {test_case} -> {result}")
+        
+        # Потокове злиття має давати точно такий самий результат
+        streamed = list(iter_merge_k_lists(test_case))
+        assert streamed == result, f"iter_merge_k_lists: {streamed} != {result}"
+    
+    # Злиття у спадному порядку та з ключем
+    descending = list(iter_merge_k_lists([[5, 4, 1], [6, 2]], reverse=True))
+    print("Спадне злиття:", descending)
+    by_length = list(iter_merge_k_lists([["a", "ccc"], ["bb", "dddd"]], key=len))
+    print("Злиття за ключем len:", by_length)
+    
+    # Злиття записів за ключем: стабільне, однакове для обох реалізацій
+    records = [[("b", 1), ("a", 2)], [("c", 2), ("d", 3)], [("e", 1), ("f", 2)]]
+    by_score = merge_k_lists(records, key=lambda record: record[1])
+    assert by_score == list(iter_merge_k_lists(records, key=lambda record: record[1]))
+    print("Злиття записів за ключем:", by_score)
+    descending = merge_k_lists([[5, 4, 1], [6, 2]], reverse=True)
+    assert descending == [6, 5, 4, 2, 1]
+    # Спадне злиття за ключем теж стабільне: рівні ключі в порядку джерел
+    records = [[("a", 3), ("b", 1)], [("c", 3), ("d", 1)]]
+    by_score = list(iter_merge_k_lists(records, key=lambda record: record[1], reverse=True))
+    assert by_score == [("a", 3), ("c", 3), ("b", 1), ("d", 1)], by_score
+    
+    # Діапазони не перетинаються: конкатенація у порядку значень
+    assert merge_k_lists([[7, 8], [1, 2], [4, 5]]) == [1, 2, 4, 5, 7, 8]
+    
+    # Результат - завжди новий список, навіть якщо непорожній список один
+    single = [1, 2, 3]
+    assert merge_k_lists([[], single]) is not single
+    assert merge_k_lists([single], key=abs) is not single
+    
+    if args.benchmark:
+        benchmark_merge_planning()
 
 if __name__ == "__main__":
     main()
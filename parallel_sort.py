@@ -0,0 +1,330 @@
+"""
+parallel_sort.py - Паралельне сортування злиттям на всіх ядрах процесора
+
+Алгоритм:
+1. Вхідні дані копіюються у спільну пам'ять (multiprocessing.shared_memory) як int64,
+   тому процеси-обробники не отримують дані через pickle.
+2. Масив ділиться на стільки частин, скільки є обробників; кожна частина
+   сортується у ProcessPoolExecutor прямо у спільній пам'яті.
+3. Відсортовані частини зливаються паралельно: за вибіркою з частин обираються
+   роздільники (splitters), які ділять діапазон значень на незалежні відрізки.
+   Кожен обробник зливає свій відрізок з усіх частин через merge_k_lists і
+   записує його у вихідний буфер спільної пам'яті.
+
+У збірках CPython без GIL (3.13t+) потоки виконують Python-код паралельно,
+тому threaded_merge_sort сортує та зливає частини у ThreadPoolExecutor над
+звичайними списками - без спільної пам'яті, копіювання у int64 та pickle.
+auto_parallel_sort під час виконання перевіряє, чи вимкнено GIL, і інакше
+переходить на пул процесів або на послідовне сортування.
+
+Використання:
+python3 parallel_sort.py
+"""
+
+import os
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from multiprocessing import shared_memory
+from array import array
+from typing import Any, List, Optional, Tuple
+
+from merge_k_lists import merge_k_lists
+from sorting_core import generate_data, measure_time, merge_sort, timsort
+
+ITEM_SIZE = array('q').itemsize
+
+# Кількість елементів вибірки з кожної частини для обчислення роздільників
+SAMPLES_PER_CHUNK = 32
+
+# Менші входи сортуються послідовно: запуск пулу дорожчий за виграш
+PARALLEL_THRESHOLD = 20000
+
+def gil_enabled() -> bool:
+    """
+    Чи увімкнено GIL у поточному процесі (False лише у free-threaded збірках без GIL).
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Під'єднується до існуючого блоку спільної пам'яті.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+def _sort_chunk(name: str, lo: int, hi: int) -> None:
+    """
+    Сортує ділянку [lo, hi) масиву int64 у спільній пам'яті (виконується в обробнику).
+    """
+    shm = _attach(name)
+    try:
+        view = shm.buf.cast('q')
+        view[lo:hi] = array('q', merge_sort(view[lo:hi].tolist()))
+        view.release()
+    finally:
+        shm.close()
+
+def _merge_partition(src_name: str, dst_name: str,
+                     ranges: List[Tuple[int, int]], offset: int) -> None:
+    """
+    Зливає відрізки відсортованих частин і записує результат у вихідний буфер
+    з позиції offset (виконується в обробнику).
+    """
+    src, dst = _attach(src_name), _attach(dst_name)
+    try:
+        src_view, dst_view = src.buf.cast('q'), dst.buf.cast('q')
+        merged = merge_k_lists([src_view[lo:hi].tolist() for lo, hi in ranges])
+        dst_view[offset:offset + len(merged)] = array('q', merged)
+        src_view.release()
+        dst_view.release()
+    finally:
+        src.close()
+        dst.close()
+
+def _chunk_bounds(n: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Ділить діапазон [0, n) на parts майже рівних ділянок.
+    """
+    step, extra = divmod(n, parts)
+    bounds = []
+    lo = 0
+    for i in range(parts):
+        hi = lo + step + (1 if i < extra else 0)
+        bounds.append((lo, hi))
+        lo = hi
+    return bounds
+
+def _choose_splitters(view, chunks: List[Tuple[int, int]], parts: int) -> List[int]:
+    """
+    Обирає parts - 1 роздільників з рівномірної вибірки відсортованих частин.
+    """
+    sample = []
+    for lo, hi in chunks:
+        length = hi - lo
+        if length:
+            count = min(length, SAMPLES_PER_CHUNK)
+            sample.extend(view[lo + (i * length) // count] for i in range(count))
+    sample.sort()
+    if not sample:
+        return []
+    return [sample[(i * len(sample)) // parts] for i in range(1, parts)]
+
+def parallel_merge_sort(arr: List[int], workers: Optional[int] = None,
+                        executor: Optional[ProcessPoolExecutor] = None) -> List[int]:
+    """
+    Паралельне сортування злиттям у кількох процесах через спільну пам'ять.
+
+    Значення мають вміщуватися в int64.
+
+    Args:
+        arr: Список цілих чисел для сортування
+        workers: Кількість процесів (за замовчуванням - кількість ядер)
+        executor: Готовий пул процесів (щоб не створювати його при кожному виклику)
+
+    Returns:
+        Відсортований список
+    """
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    if n <= 1 or workers == 1:
+        return merge_sort(arr)
+
+    # Перетворення до int64 - до створення пулу та спільної пам'яті:
+    # TypeError/OverflowError для невідповідних даних нічого не залишає
+    values = array('q', arr)
+
+    # Пул і спільна пам'ять звільняються у зворотному порядку, навіть якщо
+    # виділення пам'яті чи копіювання завершилося помилкою
+    with ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+        nbytes = max(1, n * ITEM_SIZE)
+        src = _shared_block(stack, nbytes)
+        dst = _shared_block(stack, nbytes)
+        src_view = src.buf.cast('q')
+        stack.callback(src_view.release)
+        src_view[:n] = values
+
+        # Фаза 1: сортуємо частини паралельно
+        chunks = _chunk_bounds(n, workers)
+        for future in [executor.submit(_sort_chunk, src.name, lo, hi) for lo, hi in chunks]:
+            future.result()
+
+        # Фаза 2: ділимо діапазон значень роздільниками та зливаємо відрізки паралельно
+        splitters = _choose_splitters(src_view, chunks, workers)
+        cuts = [[lo] + [bisect_left(src_view, s, lo, hi) for s in splitters] + [hi]
+                for lo, hi in chunks]
+
+        futures = []
+        offset = 0
+        for p in range(len(splitters) + 1):
+            ranges = [(c[p], c[p + 1]) for c in cuts]
+            futures.append(executor.submit(_merge_partition, src.name, dst.name, ranges, offset))
+            offset += sum(hi - lo for lo, hi in ranges)
+        for future in futures:
+            future.result()
+
+        dst_view = dst.buf.cast('q')
+        stack.callback(dst_view.release)
+        return dst_view[:n].tolist()
+
+def _shared_block(stack: ExitStack, nbytes: int) -> shared_memory.SharedMemory:
+    """
+    Створює блок спільної пам'яті, що закривається та видаляється разом зі stack.
+    """
+    block = shared_memory.SharedMemory(create=True, size=nbytes)
+    stack.callback(block.unlink)
+    stack.callback(block.close)
+    return block
+
+def _choose_run_splitters(runs: List[List[Any]], parts: int) -> List[Any]:
+    """
+    Обирає parts - 1 роздільників з рівномірної вибірки відсортованих списків.
+    """
+    sample = []
+    for run in runs:
+        if run:
+            count = min(len(run), SAMPLES_PER_CHUNK)
+            sample.extend(run[(i * len(run)) // count] for i in range(count))
+    sample.sort()
+    if not sample:
+        return []
+    return [sample[(i * len(sample)) // parts] for i in range(1, parts)]
+
+def threaded_merge_sort(arr: List[Any], workers: Optional[int] = None,
+                        executor: Optional[ThreadPoolExecutor] = None) -> List[Any]:
+    """
+    Паралельне сортування злиттям у пулі потоків (для збірок без GIL).
+
+    Частини сортуються merge_sort у потоках, потім роздільники ділять
+    діапазон значень на відрізки, що зливаються merge_k_lists незалежно.
+    Потоки працюють зі спільними списками, тож елементи можуть бути будь-якими
+    порівнюваними об'єктами. З увімкненим GIL результат правильний, але
+    прискорення немає.
+
+    Args:
+        arr: Список для сортування
+        workers: Кількість потоків (за замовчуванням - кількість ядер)
+        executor: Готовий пул потоків
+
+    Returns:
+        Відсортований список
+    """
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    if n <= 1 or workers == 1:
+        return merge_sort(arr)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Фаза 1: кожен потік сортує свою частину
+        runs = list(executor.map(lambda bounds: merge_sort(arr[bounds[0]:bounds[1]]),
+                                 _chunk_bounds(n, workers)))
+
+        # Фаза 2: відрізки між роздільниками зливаються незалежно і
+        # з'єднуються у порядку відрізків
+        splitters = _choose_run_splitters(runs, workers)
+        cuts = [[0] + [bisect_left(run, s) for s in splitters] + [len(run)] for run in runs]
+        partitions = [[run[c[p]:c[p + 1]] for run, c in zip(runs, cuts)]
+                      for p in range(len(splitters) + 1)]
+        result = []
+        for merged in executor.map(merge_k_lists, partitions):
+            result.extend(merged)
+        return result
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+def auto_parallel_sort(arr: List[Any], workers: Optional[int] = None) -> List[Any]:
+    """
+    Обирає спосіб паралельного сортування під час виконання.
+
+    - GIL вимкнено: пул потоків (threaded_merge_sort)
+    - GIL увімкнено: пул процесів (parallel_merge_sort), якщо дані - int64
+    - інакше, для одного ядра чи малого входу - послідовний merge_sort
+
+    Args:
+        arr: Список для сортування
+        workers: Кількість обробників (за замовчуванням - кількість ядер)
+
+    Returns:
+        Відсортований список
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(arr) < PARALLEL_THRESHOLD:
+        return merge_sort(arr)
+    if not gil_enabled():
+        return threaded_merge_sort(arr, workers)
+    try:
+        return parallel_merge_sort(arr, workers)
+    except (TypeError, OverflowError):
+        # Значення не вміщуються у спільний буфер int64
+        return merge_sort(arr)
+
+def benchmark_worker_scaling(size: int = 100000, data_type: str = "random",
+                             max_workers: Optional[int] = None):
+    """
+    Вимірює прискорення паралельного сортування залежно від кількості
+    процесів і потоків на тих самих даних.
+
+    Args:
+        size: Розмір вхідних даних
+        data_type: Тип даних
+        max_workers: Максимальна кількість обробників (за замовчуванням - кількість ядер)
+
+    Returns:
+        Список кортежів (кількість обробників, час процесів, прискорення процесів,
+        час потоків, прискорення потоків) відносно послідовного merge_sort
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    data = generate_data(size, data_type)
+
+    serial_time = measure_time(merge_sort, data)
+    timsort_time = measure_time(timsort, data)
+
+    gil = "увімкнено" if gil_enabled() else "вимкнено (free-threaded)"
+    print(f"\n⚙️  Масштабування паралельного сортування ({size:,} елементів, {data_type}, GIL {gil}):")
+    print("-" * 62)
+    print(f"{'Обробники':<10} {'Процеси':<12} {'Прискор.':<10} {'Потоки':<12} {'Прискор.':<10}")
+    print("-" * 62)
+    print(f"{'serial':<10} {serial_time:<12.6f} {1.0:<10.2f} {serial_time:<12.6f} {1.0:<10.2f}")
+
+    results = []
+    for workers in range(1, max_workers + 1):
+        # Пули створюються заздалегідь, щоб не вимірювати запуск процесів і потоків
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parallel_merge_sort(data[:1000], workers, executor)
+            process_time = measure_time(lambda d: parallel_merge_sort(d, workers, executor), data)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            thread_time = measure_time(lambda d: threaded_merge_sort(d, workers, executor), data)
+        results.append((workers, process_time, serial_time / process_time,
+                        thread_time, serial_time / thread_time))
+        print(f"{workers:<10} {process_time:<12.6f} {serial_time / process_time:<10.2f} "
+              f"{thread_time:<12.6f} {serial_time / thread_time:<10.2f}")
+
+    print(f"{'timsort':<10} {timsort_time:<12.6f} {serial_time / timsort_time:<10.2f}")
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    for workers in (1, 2, 3, 4):
+        for data_type in ("random", "sorted", "reversed", "partially_sorted"):
+            data = generate_data(5000, data_type)
+            assert parallel_merge_sort(data, workers) == sorted(data), (workers, data_type)
+            assert threaded_merge_sort(data, workers) == sorted(data), (workers, data_type)
+    words = [str(value) for value in generate_data(5000, "random")]
+    assert threaded_merge_sort(words, 3) == sorted(words)
+    assert auto_parallel_sort(words * 5, 2) == sorted(words * 5)
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_worker_scaling(max_workers=max(2, os.cpu_count() or 1))
+
+if __name__ == "__main__":
+    main()
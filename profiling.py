@@ -0,0 +1,430 @@
+"""
+profiling.py - Профілювання окремих комірок бенчмарку
+
+Режим профілювання вмикається для вибраних комірок матриці
+(алгоритм/тип даних/розмір) і для кожної з них:
+- записує профіль у форматі pstats (файл .pstats - для pstats, snakeviz
+  тощо) та у форматі згорнутих стеків (файл .collapsed - рядки
+  "кадр;кадр;кадр значення" для flamegraph.pl, speedscope, inferno)
+- профайлер на вибір: детермінований cProfile або вибірковий, що з окремого
+  потоку кожну мілісекунду знімає стек головного потоку
+- вимірює частки часу фаз: рекурсія та решта роботи, злиття (виклики
+  merge, merge_into, _merge_*) і копіювання (зрізи, .copy(), list()), - і
+  записує їх у BenchmarkResult (phase_recursion, phase_merge, phase_copy)
+
+Фази вимірюються в інструментованій копії модуля сортувальника (як
+лічильники записів у instrumentation.py), а в результат потрапляють
+частки, помножені на медіану звичайного запуску. Оригінальні функції не
+змінюються, профайлер вмикається лише на час окремого запуску, тому без
+режиму профілювання накладних витрат немає.
+
+Використання:
+python3 profiling.py
+python3 sorting_comparison_alternative.py --profile merge/random/10000 --profiler sampling
+"""
+
+import ast
+import cProfile
+import fnmatch
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from instrumentation import instrumented_copy
+
+PROFILERS = ("cprofile", "sampling")
+
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Мінімальна сумарна тривалість профільованих викликів (секунди)
+PROFILE_MIN_TIME = 0.2
+
+# Інтервал вибіркового профайлера (секунди)
+SAMPLING_INTERVAL = 0.001
+
+PHASES = ("recursion", "merge", "copy")
+
+# Функції, виклики яких належать до фази злиття (а також усі _merge*, крім
+# самих сортувальників на кшталт _merge_sort_core - їхня робота розподіляється по фазах)
+MERGE_FUNCTIONS = {"merge", "merge_into", "merge_two_lists"}
+
+# Функція (як у pstats): (файл, рядок, ім'я)
+Frame = Tuple[str, int, str]
+
+@dataclass
+class ProfileConfig:
+    """
+    Налаштування режиму профілювання.
+
+    cells - шаблони fnmatch виду "алгоритм/тип даних/розмір"; пропущені
+    частини означають "*" ("merge" - усі комірки merge_sort).
+    """
+    cells: Sequence[str] = ("*",)
+    profiler: str = "cprofile"
+    output_dir: str = DEFAULT_PROFILE_DIR
+    interval: float = SAMPLING_INTERVAL
+    min_time: float = PROFILE_MIN_TIME
+
+    def matches(self, algorithm: str, data_type: str, size: int) -> bool:
+        cell = f"{algorithm}/{data_type}/{size}"
+        for pattern in self.cells:
+            parts = pattern.split("/")
+            if fnmatch.fnmatchcase(cell, "/".join(parts + ["*"] * (3 - len(parts)))):
+                return True
+        return False
+
+def add_profile_arguments(parser) -> None:
+    """
+    Додає до argparse-парсера прапорці режиму профілювання.
+    """
+    parser.add_argument("--profile", action="append", metavar="CELL",
+                        help="Профілювати комірки алгоритм/тип/розмір (шаблони fnmatch, можна кілька)")
+    parser.add_argument("--profiler", choices=PROFILERS, default="cprofile",
+                        help="Профайлер для --profile")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR,
+                        help="Каталог для файлів .pstats та .collapsed")
+
+def config_from_args(args):
+    """
+    ProfileConfig з аргументів командного рядка або None, якщо режим вимкнено.
+    """
+    if not args.profile:
+        return None
+    return ProfileConfig(cells=args.profile, profiler=args.profiler, output_dir=args.profile_dir)
+
+def _repeat_calls(func: Callable, data: Any, min_time: float) -> int:
+    """
+    Викликає func(data), доки сумарний час не досягне min_time; повертає кількість викликів.
+
+    Стеки вибіркового профайлера обрізаються на цій функції.
+    """
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func(data)
+        calls += 1
+        if time.perf_counter() - start >= min_time:
+            return calls
+
+def _frame_name(frame: Frame) -> str:
+    """
+    Назва кадру для згорнутих стеків: "ім'я (файл:рядок)".
+    """
+    filename, line, name = frame
+    if filename == "~":
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+class SamplingProfiler:
+    """
+    Вибірковий профайлер: окремий потік кожні interval секунд знімає стек
+    потоку, що його запустив.
+
+    Інтервал перемикання GIL на час профілювання зменшується до interval,
+    інакше потік-вибірник отримував би керування раз на 5 мс.
+    """
+
+    def __init__(self, interval: float = SAMPLING_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        root = _repeat_calls.__code__
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and frame.f_code is not root:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # Вибірки поза профільованими викликами (старт, зупинка) відкидаються
+            if frame is not None and stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def stats(self) -> Dict[Frame, tuple]:
+        """
+        Вибірки у форматі pstats: {функція: (cc, nc, tt, ct, {викликач: (nc, cc, tt, ct)})}.
+
+        Кількість викликів тут - кількість вибірок, у яких функція є у стеку.
+        """
+        entries: Dict[Frame, list] = {}
+        for stack, count in self.samples.items():
+            elapsed = count * self.interval
+            seen = set()
+            for depth, frame in enumerate(stack):
+                entry = entries.setdefault(frame, [0, 0, 0.0, 0.0, {}])
+                if frame not in seen:
+                    seen.add(frame)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += elapsed
+                if depth:
+                    edge = entry[4].setdefault(stack[depth - 1], [0, 0, 0.0, 0.0])
+                    edge[0] += count
+                    edge[1] += count
+                    edge[3] += elapsed
+                    if depth == len(stack) - 1:
+                        edge[2] += elapsed
+            entries[stack[-1]][2] += elapsed
+        return {frame: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.items()})
+                for frame, (cc, nc, tt, ct, callers) in entries.items()}
+
+    def collapsed(self) -> Dict[str, int]:
+        """
+        Згорнуті стеки: {"кадр;кадр;...": кількість вибірок}.
+        """
+        lines = Counter()
+        for stack, count in self.samples.items():
+            lines[";".join(_frame_name(frame) for frame in stack)] += count
+        return dict(lines)
+
+def collapse_pstats(stats: Dict[Frame, tuple]) -> Dict[str, int]:
+    """
+    Згорнуті стеки з графа викликів pstats (значення - мікросекунди).
+
+    pstats зберігає лише пари викликач -> функція, тому власний час функції
+    розподіляється між шляхами від кореня пропорційно до сукупного часу
+    кожного ребра. Рекурсивні виклики згортаються в один кадр.
+    """
+    def paths(frame: Frame, visiting: frozenset) -> List[Tuple[Tuple[Frame, ...], float]]:
+        callers = {caller: edge[3] for caller, edge in stats[frame][4].items()
+                   if caller != frame and caller not in visiting and caller in stats and edge[3] > 0}
+        total = sum(callers.values())
+        if not total:
+            return [((frame,), 1.0)]
+        visiting = visiting | {frame}
+        return [(stack + (frame,), share * weight / total)
+                for caller, weight in callers.items()
+                for stack, share in paths(caller, visiting)]
+
+    lines = defaultdict(float)
+    for frame, (_, _, tottime, _, _) in stats.items():
+        if tottime > 0:
+            for stack, share in paths(frame, frozenset()):
+                lines[";".join(_frame_name(f) for f in stack)] += tottime * share * 1e6
+    return {stack: round(value) for stack, value in lines.items() if round(value) > 0}
+
+def write_collapsed(lines: Dict[str, int], filename: str) -> None:
+    """
+    Записує згорнуті стеки: один рядок "кадр;кадр;кадр значення" на стек.
+    """
+    with open(filename, 'w', encoding='utf-8') as f:
+        for stack, value in sorted(lines.items()):
+            f.write(f"{stack} {value}\n")
+
+def profile_cell(func: Callable, data: Any, config: ProfileConfig,
+                 algorithm: str = "", data_type: str = "") -> str:
+    """
+    Профілює повторні виклики func(data) та записує файли .pstats і .collapsed.
+
+    Args:
+        func: Функція сортування
+        data: Вхідні дані комірки (не змінюються)
+        config: Налаштування профілювання
+        algorithm: Назва алгоритму (для імені файлів)
+        data_type: Тип даних (для імені файлів)
+
+    Returns:
+        Шлях до файлів без розширення
+    """
+    os.makedirs(config.output_dir, exist_ok=True)
+    base = os.path.join(config.output_dir, f"{algorithm or func.__name__}-{data_type or 'data'}-{len(data)}")
+
+    if config.profiler == "sampling":
+        with SamplingProfiler(config.interval) as sampler:
+            _repeat_calls(func, data, config.min_time)
+        with open(base + ".pstats", 'wb') as f:
+            marshal.dump(sampler.stats(), f)
+        lines = sampler.collapsed()
+    elif config.profiler == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.runcall(_repeat_calls, func, data, config.min_time)
+        profiler.dump_stats(base + ".pstats")
+        lines = collapse_pstats(pstats.Stats(profiler).stats)
+    else:
+        raise ValueError(f"Невідомий профайлер: {config.profiler} (можливі: {', '.join(PROFILERS)})")
+
+    write_collapsed(lines, base + ".collapsed")
+    return base
+
+class _PhaseTimer(ast.NodeTransformer):
+    """
+    Переписує злиття, зрізи та копії у виклики з вимірюванням часу фази.
+    """
+
+    @staticmethod
+    def _call(name: str, *args: ast.expr, keywords=()) -> ast.Call:
+        return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=list(keywords))
+
+    @staticmethod
+    def _slice_args(node: ast.Slice) -> List[ast.expr]:
+        return [part or ast.Constant(None) for part in (node.lower, node.upper, node.step)]
+
+    def visit_Call(self, node: ast.Call) -> ast.Call:
+        self.generic_visit(node)
+        func = node.func
+        if isinstance(func, ast.Name) and (func.id in MERGE_FUNCTIONS or
+                                          func.id.startswith("_merge") and "sort" not in func.id):
+            phase = "merge"
+        elif (isinstance(func, ast.Attribute) and func.attr == "copy" and not node.args) or \
+                (isinstance(func, ast.Name) and func.id == "list" and node.args):
+            phase = "copy"
+        else:
+            return node
+        return self._call("_timed", ast.Constant(phase), func, *node.args, keywords=node.keywords)
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.ctx, ast.Load) and isinstance(node.slice, ast.Slice):
+            return self._call("_timed_slice", node.value, *self._slice_args(node.slice))
+        return node
+
+    def visit_Assign(self, node: ast.Assign) -> ast.AST:
+        self.generic_visit(node)
+        target = node.targets[0]
+        if len(node.targets) == 1 and isinstance(target, ast.Subscript) and isinstance(target.slice, ast.Slice):
+            return ast.Expr(self._call("_timed_store", target.value, *self._slice_args(target.slice),
+                                       node.value))
+        return node
+
+class _PhaseClock:
+    """
+    Сумарний час фаз; вкладена фаза (зріз усередині merge) належить зовнішній.
+    """
+    __slots__ = ("active", "totals")
+
+    def __init__(self):
+        self.active = False
+        self.totals = dict.fromkeys(PHASES, 0.0)
+
+CLOCK = _PhaseClock()
+
+def _timed(phase: str, func: Callable, *args, **kwargs) -> Any:
+    if CLOCK.active:
+        return func(*args, **kwargs)
+    CLOCK.active = True
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        CLOCK.totals[phase] += time.perf_counter() - start
+        CLOCK.active = False
+
+def _timed_slice(value: Any, lower: Any, upper: Any, step: Any) -> Any:
+    return _timed("copy", value.__getitem__, slice(lower, upper, step))
+
+def _timed_store(target: Any, lower: Any, upper: Any, step: Any, value: Any) -> None:
+    _timed("copy", target.__setitem__, slice(lower, upper, step), value)
+
+def phase_instrumented(func: Callable) -> Callable:
+    """
+    Копія функції, що накопичує час фаз злиття та копіювання у CLOCK.
+    """
+    return instrumented_copy(func, _PhaseTimer(), {
+        "_timed": _timed, "_timed_slice": _timed_slice, "_timed_store": _timed_store,
+    })
+
+def measure_phases(func: Callable, data: Any, min_time: float = PROFILE_MIN_TIME,
+                   setup: Optional[Callable[[Any], Any]] = None) -> Dict[str, float]:
+    """
+    Частки часу фаз recursion / merge / copy (у сумі - 1) для func(data).
+
+    Фаза recursion - усе, що не є злиттям чи копіюванням: виклики,
+    розбиття, сортування вставками коротких ділянок тощо.
+
+    Args:
+        func: Функція сортування з модуля (не з __main__)
+        data: Вхідні дані
+        min_time: Мінімальна сумарна тривалість вимірювання (секунди)
+        setup: Підготовка вхідних даних для одного виклику (наприклад, копія для
+               ядер, що сортують на місці); виконується поза вимірюваною ділянкою,
+               як у benchmark.run_benchmark
+
+    Returns:
+        Словник {фаза: частка}
+    """
+    timed = phase_instrumented(func)
+    CLOCK.totals = dict.fromkeys(PHASES, 0.0)
+    total = 0.0
+    while total < min_time:
+        item = data if setup is None else setup(data)
+        start = time.perf_counter()
+        timed(item)
+        total += time.perf_counter() - start
+
+    shares = {phase: CLOCK.totals[phase] / total for phase in ("merge", "copy")}
+    shares["recursion"] = max(0.0, 1 - shares["merge"] - shares["copy"])
+    return {phase: shares[phase] for phase in PHASES}
+
+def top_functions(filename: str, limit: int = 8) -> List[Tuple[str, float, float]]:
+    """
+    Функції з найбільшим власним часом у файлі .pstats: [(кадр, tottime, cumtime)].
+    """
+    stats = pstats.Stats(filename).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [(_frame_name(frame), tt, ct) for frame, (_, _, tt, ct, _) in rows]
+
+def main():
+    """
+    Головна функція програми.
+    """
+    from sorting_core import (
+        ALGORITHMS, BUILTIN_ALGORITHMS, DATA_SEED, SORT_CORES, benchmark_sorter, generate_data,
+        merge_sort,
+    )
+
+    size = 20000
+    data = generate_data(size, "random", seed=DATA_SEED)
+
+    # Перевірка: інструментовані копії сортують так само, профайлер не лишається увімкненим
+    for name, (func, _, _) in ALGORITHMS.items():
+        if name not in BUILTIN_ALGORITHMS:
+            assert phase_instrumented(func)(data[:500]) == sorted(data[:500]), name
+    assert ProfileConfig(cells=["merge"]).matches("merge", "random", size)
+    assert not ProfileConfig(cells=["merge/sorted"]).matches("merge", "random", size)
+    print("✅ Перевірка коректності пройдена")
+
+    print(f"\n🔥 Профілювання merge/random/{size:,}:")
+    for profiler in PROFILERS:
+        config = ProfileConfig(profiler=profiler)
+        base = profile_cell(merge_sort, data, config, "merge", "random")
+        assert sys.getprofile() is None
+        with open(base + ".collapsed", encoding="utf-8") as f:
+            stacks = f.read().splitlines()
+        print(f"\n  🔸 {profiler}: {base}.pstats, {base}.collapsed ({len(stacks)} стеків)")
+        print(f"  {'Функція':<56} {'Власний, с':<12} {'Сукупний, с':<12}")
+        for frame, tottime, cumtime in top_functions(base + ".pstats", 5):
+            print(f"  {frame[:56]:<56} {tottime:<12.4f} {cumtime:<12.4f}")
+
+    print(f"\n⏱️  Фази (random, {size:,} елементів, частки часу):")
+    print("-" * 64)
+    print(f"{'Алгоритм':<18} {'Медіана, с':<12} {'Рекурсія':<11} {'Злиття':<11} {'Копіювання':<11}")
+    print("-" * 64)
+    for name in ("merge", "bottom_up", "adaptive", "introsort", "radix"):
+        # Фази та медіана вимірюються на тому самому ядрі без копії входу
+        median = benchmark_sorter(name, data).median
+        shares = measure_phases(SORT_CORES[name], data, setup=list.copy)
+        print(f"{name:<18} {median:<12.6f} " + "".join(f"{shares[phase]:<11.1%}" for phase in PHASES))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+selection.py - Часткове сортування та вибір без повного сортування
+
+Функції:
+- nsmallest / nlargest: k найменших / найбільших елементів через обмежену
+  купу розміру k - O(n log k) часу та O(k) пам'яті
+- select_kth: k-й за порядком елемент (introselect): швидкий вибір з
+  випадковим опорним елементом, а після 2·log2(n) поганих розбиттів -
+  медіана медіан, тож O(n) в середньому та O(n log n) у найгіршому випадку
+- partial_sort: k найменших елементів у відсортованому порядку, далі решта
+  (як std::partial_sort у C++)
+- merge_k_lists(..., limit=k): злиття, що зупиняється після k елементів
+
+Усі функції стабільні: серед рівних ключів перевагу має елемент, що йде
+раніше, - результат збігається з sorted(...)[:k].
+
+Використання:
+python3 selection.py
+"""
+
+import heapq
+import random
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from datasets import generate
+from merge_k_lists import merge_k_lists
+from sorting_core import DATA_SEED, measure_time, timsort
+
+# Довжина, з якої вибір виконується простим сортуванням
+SMALL_SELECT = 16
+
+# Частки k/n для бенчмарку
+TOP_K_FRACTIONS = (0.0001, 0.001, 0.01, 0.1, 0.5)
+
+class _MaxEntry:
+    """
+    Елемент купи для nsmallest: вершина купи - найбільший (ключ, номер).
+    """
+    __slots__ = ("key", "index", "item")
+
+    def __init__(self, key: Any, index: int, item: Any):
+        self.key = key
+        self.index = index
+        self.item = item
+
+    def __lt__(self, other: "_MaxEntry") -> bool:
+        if self.key == other.key:
+            return self.index > other.index
+        return other.key < self.key
+
+def nsmallest(iterable: Iterable[Any], k: int,
+              key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Повертає k найменших елементів у відсортованому порядку.
+
+    Купа зберігає k кращих кандидатів з найгіршим на вершині; новий елемент
+    порівнюється лише з вершиною, тож для більшості елементів робота - одне
+    порівняння сирих ключів.
+
+    Args:
+        iterable: Будь-який ітерований об'єкт (читається один раз)
+        k: Кількість елементів
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+
+    Returns:
+        Список, рівний sorted(iterable, key=key)[:k]
+    """
+    if k <= 0:
+        return []
+
+    iterator = iter(iterable)
+    heap = []
+    for index, item in enumerate(iterator):
+        heap.append(_MaxEntry(item if key is None else key(item), index, item))
+        if len(heap) == k:
+            break
+    heapq.heapify(heap)
+
+    if len(heap) == k:
+        top_key = heap[0].key
+        for index, item in enumerate(iterator, k):
+            item_key = item if key is None else key(item)
+            # Рівний ключ не витісняє вершину: раніший елемент має перевагу
+            if item_key < top_key:
+                heapq.heapreplace(heap, _MaxEntry(item_key, index, item))
+                top_key = heap[0].key
+
+    heap.sort(reverse=True)
+    return [entry.item for entry in heap]
+
+def nlargest(iterable: Iterable[Any], k: int,
+             key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Повертає k найбільших елементів у спадному порядку.
+
+    Args:
+        iterable: Будь-який ітерований об'єкт (читається один раз)
+        k: Кількість елементів
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+
+    Returns:
+        Список, рівний sorted(iterable, key=key, reverse=True)[:k]
+    """
+    if k <= 0:
+        return []
+
+    # Купа мінімумів з (ключ, -номер): вершина - найгірший кандидат
+    iterator = iter(iterable)
+    heap = []
+    for index, item in enumerate(iterator):
+        heap.append((item if key is None else key(item), -index, item))
+        if len(heap) == k:
+            break
+    heapq.heapify(heap)
+
+    if len(heap) == k:
+        top_key = heap[0][0]
+        for index, item in enumerate(iterator, k):
+            item_key = item if key is None else key(item)
+            if top_key < item_key:
+                heapq.heapreplace(heap, (item_key, -index, item))
+                top_key = heap[0][0]
+
+    heap.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+    return [item for _, _, item in heap]
+
+def _median_of_medians(values: List[Any]) -> Any:
+    """
+    Опорний елемент "медіана медіан" груп по 5 (гарантує розбиття не гірше 30/70).
+    """
+    medians = [sorted(values[i:i + 5])[(min(5, len(values) - i) - 1) // 2]
+               for i in range(0, len(values), 5)]
+    return _select(medians, (len(medians) - 1) // 2, budget=0)
+
+def _select(values: List[Any], k: int, budget: int) -> Any:
+    """
+    Introselect: k-й елемент (з нуля) списку значень, що попарно порівнювані.
+
+    Поки budget > 0, опорний елемент - медіана трьох випадкових. Бюджет
+    зменшується лише на поганих розбиттях (далі обробляється більше 3/4
+    значень); після його вичерпання опорний елемент - медіана медіан.
+    """
+    while True:
+        if len(values) <= SMALL_SELECT:
+            return sorted(values)[k]
+
+        if budget > 0:
+            pivot = sorted(random.sample(values, 3))[1]
+        else:
+            pivot = _median_of_medians(values)
+        size = len(values)
+
+        # Розбиття на три частини: рівні опорному елементу не обробляються повторно
+        lows = [x for x in values if x < pivot]
+        if k < len(lows):
+            values = lows
+        else:
+            highs = [x for x in values if pivot < x]
+            equal = size - len(lows) - len(highs)
+            if k < len(lows) + equal:
+                return pivot
+            k -= len(lows) + equal
+            values = highs
+
+        # Погане розбиття: відкинуто менше чверті значень
+        if 4 * len(values) > 3 * size:
+            budget -= 1
+
+def select_kth(arr: Sequence[Any], k: int,
+               key: Optional[Callable[[Any], Any]] = None) -> Any:
+    """
+    Повертає k-й (з нуля) елемент у відсортованому порядку без повного сортування.
+
+    Середня складність O(n). Після 2·log2(n) поганих розбиттів (відкинуто
+    менше чверті значень) опорним елементом стає медіана медіан, тож у
+    найгіршому випадку O(n log n): не більше 2·log2(n) поганих кроків по O(n).
+
+    Args:
+        arr: Послідовність елементів
+        k: Номер елемента у відсортованому порядку (0 <= k < len(arr))
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+
+    Returns:
+        Елемент, рівний sorted(arr, key=key)[k]
+    """
+    n = len(arr)
+    if not 0 <= k < n:
+        raise IndexError(f"k поза межами: {k} (n = {n})")
+
+    budget = 2 * n.bit_length()
+    if key is None:
+        return _select(list(arr), k, budget)
+
+    # Пари (ключ, номер): порівнюються лише ключі, номер робить вибір стабільним
+    _, index = _select([(key(item), i) for i, item in enumerate(arr)], k, budget)
+    return arr[index]
+
+def partial_sort(arr: Sequence[Any], k: int,
+                 key: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Часткове сортування: перші k елементів - k найменших у відсортованому
+    (стабільному) порядку, далі решта елементів у довільному порядку.
+
+    Межа знаходиться вибором за O(n) в середньому, сортується лише голова:
+    O(n + k log k).
+
+    Args:
+        arr: Послідовність елементів
+        k: Кількість елементів, що мають опинитися на початку відсортованими
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+
+    Returns:
+        Новий список довжини len(arr)
+    """
+    n = len(arr)
+    k = max(0, min(k, n))
+    if k == 0:
+        return list(arr)
+
+    budget = 2 * n.bit_length()
+    if key is not None:
+        pairs = [(key(item), i) for i, item in enumerate(arr)]
+        boundary = _select(pairs.copy(), k - 1, budget)
+        head = sorted(pair for pair in pairs if not boundary < pair)
+        return [arr[i] for _, i in head] + [arr[pair[1]] for pair in pairs if boundary < pair]
+
+    # Без ключа: три проходи генераторами списків замість пар (ключ, номер);
+    # рівні межі елементи беруться у вихідному порядку, тож голова стабільна
+    # (вони доповнюють голову до k, а решта з них уже на своїх позиціях)
+    boundary = _select(list(arr), k - 1, budget)
+    head = sorted([x for x in arr if x < boundary])
+    equal = [x for x in arr if not x < boundary and not boundary < x]
+    return head + equal + [x for x in arr if boundary < x]
+
+def benchmark_top_k(size: int = 100000,
+                    data_types: Sequence[str] = ("random", "sorted", "reversed", "partially_sorted"),
+                    fractions: Sequence[float] = TOP_K_FRACTIONS,
+                    lists: int = 16):
+    """
+    Порівнює часткові операції з повним timsort і зрізом для різних k/n.
+
+    Для кожного типу даних виводиться таблиця часу та точка перетину -
+    найменше k/n, за якого повне сортування стає не повільнішим за nsmallest.
+
+    Args:
+        size: Розмір даних
+        data_types: Типи даних
+        fractions: Частки k/n
+        lists: Кількість списків для merge_k_lists(..., limit=k)
+
+    Returns:
+        Словник {data_type: [(k, {метод: час})]}
+    """
+    print(f"\n✂️  Часткове сортування проти timsort + зріз ({size:,} елементів):")
+    results = {}
+
+    for data_type in data_types:
+        data = generate(size, data_type, seed=DATA_SEED)
+        shards = [timsort(data[i::lists]) for i in range(lists)]
+
+        print(f"\n  🔸 {data_type}")
+        print("  " + "-" * 100)
+        print(f"  {'k':<9} {'k/n':<8} {'timsort+[:k]':<14} {'nsmallest':<12} {'heapq':<12} "
+              f"{'partial_sort':<14} {'select_kth':<12} {'merge[:k]':<12} {'merge limit':<12}")
+        print("  " + "-" * 100)
+
+        rows = []
+        crossover = None
+        for fraction in fractions:
+            k = max(1, int(size * fraction))
+            times = {
+                "timsort": measure_time(lambda d: timsort(d)[:k], data),
+                "nsmallest": measure_time(lambda d: nsmallest(d, k), data),
+                "heapq": measure_time(lambda d: heapq.nsmallest(k, d), data),
+                "partial_sort": measure_time(lambda d: partial_sort(d, k), data),
+                "select_kth": measure_time(lambda d: select_kth(d, k - 1), data),
+                "merge_full": measure_time(lambda s: merge_k_lists(s)[:k], shards),
+                "merge_limit": measure_time(lambda s: merge_k_lists(s, limit=k), shards),
+            }
+            rows.append((k, times))
+            if crossover is None and times["timsort"] <= times["nsmallest"]:
+                crossover = fraction
+            print(f"  {k:<9,} {fraction:<8.4f} {times['timsort']:<14.6f} {times['nsmallest']:<12.6f} "
+                  f"{times['heapq']:<12.6f} {times['partial_sort']:<14.6f} {times['select_kth']:<12.6f} "
+                  f"{times['merge_full']:<12.6f} {times['merge_limit']:<12.6f}")
+
+        if crossover is None:
+            print("  📍 nsmallest швидший за timsort + зріз для всіх k/n")
+        else:
+            print(f"  📍 Точка перетину: timsort + зріз не повільніший за nsmallest від k/n ≈ {crossover}")
+        results[data_type] = rows
+
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    rng = random.Random(DATA_SEED)
+    for n in (0, 1, 5, 17, 100, 1000):
+        data = [rng.randint(-50, 50) for _ in range(n)]
+        records = [(value, i) for i, value in enumerate(data)]
+        expected = sorted(data)
+        for k in {0, 1, n // 3, n}:
+            assert nsmallest(data, k) == expected[:k]
+            assert nlargest(data, k) == sorted(data, reverse=True)[:k]
+            assert nsmallest(records, k, key=lambda r: r[0]) == sorted(records, key=lambda r: r[0])[:k]
+            assert nlargest(records, k, key=lambda r: r[0]) == \
+                sorted(records, key=lambda r: r[0], reverse=True)[:k]
+            assert partial_sort(data, k)[:k] == expected[:k]
+            assert sorted(partial_sort(data, k)) == expected
+            if k < n:
+                assert select_kth(data, k) == expected[k]
+                assert select_kth(records, k, key=lambda r: r[0]) == sorted(records, key=lambda r: r[0])[k]
+        shards = [sorted(data[i::3]) for i in range(3)]
+        assert merge_k_lists(shards, limit=n // 2) == expected[:n // 2]
+
+    # Медіана медіан на даних, що провокують погані розбиття
+    assert _select(list(range(5000, 0, -1)), 2499, budget=0) == 2500
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_top_k()
+
+if __name__ == "__main__":
+    main()
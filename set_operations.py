@@ -0,0 +1,387 @@
+"""
+set_operations.py - Потокові множинні операції над відсортованими списками
+
+Відсортовані списки ідентифікаторів зазвичай зливають, а потім другим
+проходом видаляють дублікати або шукають перетин. Тут обидва кроки
+виконуються за один прохід поверх k-шляхового злиття:
+- iter_union: об'єднання без дублікатів
+- iter_at_least: елементи, що є щонайменше в m з k списків
+- iter_intersection: перетин; якщо довжини списків сильно відрізняються,
+  найкоротший список веде пошук, а в довших позиція просувається
+  галопуванням (експоненційний пошук + bisect) - O(m log(n/m)) замість O(n)
+- iter_difference: елементи першого джерела, яких немає в жодному іншому
+
+Семантика множинна: кожен ключ видається один раз, а з рівних за ключем
+елементів - той, що у списку з найменшим номером (перший у ньому).
+Усі функції - генератори, приймають key і reverse (як merge_k_lists) і
+порівнюють ключі лише оператором <.
+
+Використання:
+python3 set_operations.py
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+from datasets import generate
+from merge_k_lists import _ReversedKey, iter_merge_k_lists, merge_k_lists
+from sorting_core import DATA_SEED, measure_time
+
+# Перетин галопуванням, якщо найдовший список довший за найкоротший у стільки разів
+GALLOP_RATIO = 4
+
+# Стратегії перетину
+INTERSECTION_STRATEGIES = ("auto", "gallop", "merge")
+
+_MISSING = object()
+
+def _key_function(key: Optional[Callable[[Any], Any]], reverse: bool) -> Optional[Callable[[Any], Any]]:
+    """
+    Функція ключа, за якою списки впорядковані за зростанням (None - самі елементи).
+    """
+    if not reverse:
+        return key
+    if key is None:
+        return _ReversedKey
+    return lambda value: _ReversedKey(key(value))
+
+def _unique(values: Iterable[Any], key_of: Optional[Callable[[Any], Any]]) -> Iterator[tuple]:
+    """
+    Пари (ключ, елемент) відсортованого джерела без повторів ключа.
+    """
+    previous = _MISSING
+    for value in values:
+        sort_key = value if key_of is None else key_of(value)
+        if previous is _MISSING or previous < sort_key:
+            previous = sort_key
+            yield sort_key, value
+
+def gallop_left(arr: Sequence[Any], target: Any, lo: int = 0,
+                key: Optional[Callable[[Any], Any]] = None) -> int:
+    """
+    Перший індекс i >= lo, для якого ключ arr[i] не менший за target.
+
+    Експоненційний пошук від lo (кроки 1, 2, 4, ...) звужує діапазон, далі
+    bisect: O(log d), де d - відстань до результату, тож послідовні пошуки
+    зростаючих значень у довгому списку коштують O(m log(n/m)) разом.
+
+    Args:
+        arr: Список, відсортований за ключем
+        target: Ключ, що шукається
+        lo: Позиція, з якої починається пошук (усі ключі до неї менші за target)
+        key: Функція ключа (None - самі елементи)
+
+    Returns:
+        Індекс у діапазоні [lo, len(arr)]
+    """
+    n = len(arr)
+    hi = lo
+    step = 1
+    while hi < n and (arr[hi] if key is None else key(arr[hi])) < target:
+        lo = hi + 1
+        hi += step
+        step *= 2
+    return bisect_left(arr, target, lo, min(hi, n), key=key)
+
+def iter_union(lists: Iterable[Iterable[Any]], key: Optional[Callable[[Any], Any]] = None,
+               reverse: bool = False) -> Iterator[Any]:
+    """
+    Об'єднання відсортованих джерел без дублікатів за один прохід.
+
+    Args:
+        lists: Відсортовані ітеровані об'єкти (списки, генератори, файли)
+        key: Функція ключа (як у sorted())
+        reverse: True, якщо джерела відсортовані за спаданням
+
+    Yields:
+        Елементи з різними ключами у відсортованому порядку
+    """
+    key_of = _key_function(key, reverse)
+    for _, value in _unique(iter_merge_k_lists(lists, key=key, reverse=reverse), key_of):
+        yield value
+
+def iter_at_least(lists: Iterable[Iterable[Any]], m: int,
+                  key: Optional[Callable[[Any], Any]] = None,
+                  reverse: bool = False) -> Iterator[Any]:
+    """
+    Елементи, чиї ключі є щонайменше в m джерелах (повтори в одному джерелі рахуються один раз).
+
+    Кожне джерело спершу позбавляється повторів, тож після злиття група
+    рівних ключів має рівно стільки елементів, у скількох джерелах ключ є.
+
+    Args:
+        lists: Відсортовані ітеровані об'єкти
+        m: Мінімальна кількість джерел (1 - об'єднання, k - перетин)
+        key: Функція ключа (як у sorted())
+        reverse: True, якщо джерела відсортовані за спаданням
+
+    Yields:
+        Елементи у відсортованому порядку
+    """
+    key_of = _key_function(key, reverse)
+    merged = iter_merge_k_lists([_unique(values, key_of) for values in lists], key=itemgetter(0))
+
+    group_key = first = _MISSING
+    count = 0
+    for sort_key, value in merged:
+        if group_key is not _MISSING and not group_key < sort_key:
+            count += 1
+            continue
+        if count >= m:
+            yield first
+        group_key, first, count = sort_key, value, 1
+    if group_key is not _MISSING and count >= m:
+        yield first
+
+def _intersect_galloping(lists: Sequence[Sequence[Any]],
+                         key_of: Optional[Callable[[Any], Any]]) -> Iterator[Any]:
+    """
+    Перетин, у якому найкоротший список веде, а решта просуваються галопуванням.
+    """
+    driver = min(range(len(lists)), key=lambda index: len(lists[index]))
+    others = [index for index in range(len(lists)) if index != driver]
+    positions = dict.fromkeys(others, 0)
+
+    for sort_key, value in _unique(lists[driver], key_of):
+        owner = _MISSING
+        for index in others:
+            other = lists[index]
+            position = gallop_left(other, sort_key, positions[index], key_of)
+            positions[index] = position
+            if position == len(other):
+                return
+            found = other[position]
+            if sort_key < (found if key_of is None else key_of(found)):
+                break
+            # Видаємо елемент списку з найменшим номером
+            if owner is _MISSING and index < driver:
+                owner = found
+        else:
+            yield value if owner is _MISSING else owner
+
+def iter_intersection(lists: Sequence[Sequence[Any]], key: Optional[Callable[[Any], Any]] = None,
+                      reverse: bool = False, strategy: str = "auto") -> Iterator[Any]:
+    """
+    Перетин відсортованих списків за один прохід.
+
+    Стратегія "merge" - iter_at_least(lists, k): кожен елемент усіх списків
+    проходить через купу, O(N log k). Стратегія "gallop" перебирає лише
+    найкоротший список довжини m і шукає його ключі в інших галопуванням:
+    O(k · m log(N/m)). "auto" вибирає галопування, якщо найдовший список
+    довший за найкоротший щонайменше в GALLOP_RATIO разів.
+
+    Args:
+        lists: Відсортовані списки (потрібен довільний доступ)
+        key: Функція ключа (як у sorted())
+        reverse: True, якщо списки відсортовані за спаданням
+        strategy: "auto", "gallop" або "merge"
+
+    Yields:
+        Елементи, ключі яких є в усіх списках, у відсортованому порядку
+    """
+    if strategy not in INTERSECTION_STRATEGIES:
+        raise ValueError(f"Невідома стратегія: {strategy} (можливі: {', '.join(INTERSECTION_STRATEGIES)})")
+    if not lists or not min(len(values) for values in lists):
+        return
+
+    if strategy == "auto":
+        lengths = [len(values) for values in lists]
+        strategy = "gallop" if max(lengths) >= GALLOP_RATIO * min(lengths) else "merge"
+
+    if strategy == "gallop":
+        yield from _intersect_galloping(lists, _key_function(key, reverse))
+    else:
+        yield from iter_at_least(lists, len(lists), key, reverse)
+
+def iter_difference(first: Iterable[Any], others: Sequence[Sequence[Any]],
+                    key: Optional[Callable[[Any], Any]] = None,
+                    reverse: bool = False) -> Iterator[Any]:
+    """
+    Різниця: елементи first, ключів яких немає в жодному з others.
+
+    first читається потоково; у кожному з others позиція просувається
+    галопуванням, тож довгі списки others не переглядаються повністю.
+
+    Args:
+        first: Відсортоване ітероване джерело
+        others: Відсортовані списки, що віднімаються
+        key: Функція ключа (як у sorted())
+        reverse: True, якщо джерела відсортовані за спаданням
+
+    Yields:
+        Елементи first з різними ключами у відсортованому порядку
+    """
+    key_of = _key_function(key, reverse)
+    others = [values for values in others if len(values)]
+    positions = [0] * len(others)
+
+    for sort_key, value in _unique(first, key_of):
+        for index, other in enumerate(others):
+            position = gallop_left(other, sort_key, positions[index], key_of)
+            positions[index] = position
+            if position < len(other):
+                found = other[position]
+                if not sort_key < (found if key_of is None else key_of(found)):
+                    break
+        else:
+            yield value
+
+def _dedup_sorted(values: List[Any]) -> List[Any]:
+    """
+    Базовий другий прохід: видалення сусідніх дублікатів з відсортованого списку.
+    """
+    return [value for index, value in enumerate(values) if not index or values[index - 1] != value]
+
+def _id_lists(k: int, size: int, universe: int, seed: int) -> List[List[int]]:
+    """
+    k відсортованих списків ідентифікаторів (з повторами всередині) з діапазону [0, universe).
+    """
+    data = generate(k * size, "random", seed=seed)
+    return [sorted(value % universe for value in data[i * size:(i + 1) * size]) for i in range(k)]
+
+def benchmark_set_operations(k: int = 16, size: int = 20000,
+                             ratios: Sequence[int] = (1, 4, 16, 64, 256, 1024)):
+    """
+    Порівнює потокові операції з sorted(set(...)) та з merge_k_lists + другим проходом.
+
+    Args:
+        k: Кількість списків ідентифікаторів
+        size: Довжина кожного списку
+        ratios: Відношення довжин великого та малого списків для перетину
+
+    Returns:
+        Словник {операція: {варіант: час}}
+    """
+    results = {}
+    lists = _id_lists(k, size, universe=k * size, seed=DATA_SEED)
+    m = k // 4
+    big = lists[0] + lists[1]
+    big.sort()
+
+    operations = {
+        "об'єднання": {
+            "sorted(set)": lambda ls: sorted(set(chain.from_iterable(ls))),
+            "merge + dedup": lambda ls: _dedup_sorted(merge_k_lists(ls)),
+            "iter_union": lambda ls: list(iter_union(ls)),
+        },
+        f"≥ {m} з {k}": {
+            "Counter(set)": lambda ls: sorted(value for value, count in
+                                              Counter(chain.from_iterable(map(set, ls))).items()
+                                              if count >= m),
+            "merge + підрахунок": lambda ls: _count_pass(merge_k_lists([_dedup_sorted(v) for v in ls]), m),
+            "iter_at_least": lambda ls: list(iter_at_least(ls, m)),
+        },
+        f"різниця (1 - {k - 1})": {
+            "sorted(set)": lambda ls: sorted(set(ls[0]).difference(*ls[1:])),
+            "merge + прохід": lambda ls: _difference_pass(ls[0], merge_k_lists(ls[1:])),
+            "iter_difference": lambda ls: list(iter_difference(ls[0], ls[1:])),
+        },
+    }
+
+    print(f"\n🧩 Множинні операції: {k} списків × {size:,} ідентифікаторів")
+    print("-" * 72)
+    print(f"{'Операція':<20} {'Варіант':<22} {'Час, с':<12} {'Елементів':<12}")
+    print("-" * 72)
+    for operation, variants in operations.items():
+        outputs = {name: run(lists) for name, run in variants.items()}
+        expected = next(iter(outputs.values()))
+        results[operation] = {}
+        for name, run in variants.items():
+            assert outputs[name] == expected, (operation, name)
+            results[operation][name] = measure_time(run, lists)
+            print(f"{operation:<20} {name:<22} {results[operation][name]:<12.6f} {len(expected):<12,}")
+
+    print(f"\n🐎 Перетин: великий список ({len(big):,}) та малий (великий / відношення)")
+    print("-" * 88)
+    print(f"{'Відношення':<12} {'sorted(set &)':<16} {'merge + прохід':<16} {'merge':<12} "
+          f"{'gallop':<12} {'auto':<12}")
+    print("-" * 88)
+    for ratio in ratios:
+        small = sorted(set(big[::ratio * 2]) | set(lists[2][::ratio]))
+        pair = [big, small]
+        variants = {
+            "sorted(set &)": lambda p: sorted(set(p[0]) & set(p[1])),
+            "merge + прохід": lambda p: _count_pass(merge_k_lists([_dedup_sorted(p[0]), p[1]]), 2),
+            "merge": lambda p: list(iter_intersection(p, strategy="merge")),
+            "gallop": lambda p: list(iter_intersection(p, strategy="gallop")),
+            "auto": lambda p: list(iter_intersection(p)),
+        }
+        expected = variants["sorted(set &)"](pair)
+        times = {}
+        for name, run in variants.items():
+            assert run(pair) == expected, (ratio, name)
+            times[name] = measure_time(run, pair)
+        results[f"перетин 1:{ratio}"] = times
+        print(f"{f'1:{ratio}':<12} " + "".join(f"{times[name]:<16.6f}" if i < 2 else f"{times[name]:<12.6f}"
+                                               for i, name in enumerate(variants)))
+    return results
+
+def _count_pass(merged: List[Any], m: int) -> List[Any]:
+    """
+    Базовий другий прохід: значення, що трапляються у злитому списку щонайменше m разів.
+    """
+    result = []
+    index = 0
+    while index < len(merged):
+        end = index + 1
+        while end < len(merged) and merged[end] == merged[index]:
+            end += 1
+        if end - index >= m:
+            result.append(merged[index])
+        index = end
+    return result
+
+def _difference_pass(first: List[Any], merged_others: List[Any]) -> List[Any]:
+    """
+    Базовий другий прохід: різниця відсортованого first і злитих інших списків.
+    """
+    result = []
+    j = 0
+    for value in _dedup_sorted(first):
+        while j < len(merged_others) and merged_others[j] < value:
+            j += 1
+        if j == len(merged_others) or value < merged_others[j]:
+            result.append(value)
+    return result
+
+def main():
+    """
+    Головна функція програми.
+    """
+    import random
+    rng = random.Random(DATA_SEED)
+    for _ in range(300):
+        k = rng.randint(1, 5)
+        lists = [sorted(rng.randint(0, 30) for _ in range(rng.choice((0, 3, 20, 200)))) for _ in range(k)]
+        sets = [set(values) for values in lists]
+        assert list(iter_union(lists)) == sorted(set().union(*sets))
+        for m in range(1, k + 1):
+            assert list(iter_at_least(lists, m)) == sorted(
+                value for value in set().union(*sets) if sum(value in s for s in sets) >= m)
+        for strategy in INTERSECTION_STRATEGIES:
+            assert list(iter_intersection(lists, strategy=strategy)) == sorted(set.intersection(*sets))
+        assert list(iter_difference(lists[0], lists[1:])) == sorted(sets[0].difference(*sets[1:]))
+
+        # Записи за ключем у спадному порядку: елемент зі списку з найменшим номером
+        records = [sorted(((value, index) for value in values), reverse=True) for index, values in enumerate(lists)]
+        by_value = itemgetter(0)
+        for strategy in INTERSECTION_STRATEGIES:
+            assert list(iter_intersection(records, key=by_value, reverse=True, strategy=strategy)) == \
+                [(value, 0) for value in sorted(set.intersection(*sets), reverse=True)]
+        assert list(iter_union(records, key=by_value, reverse=True)) == \
+            [min((value, i) for i, s in enumerate(sets) if value in s)
+             for value in sorted(set().union(*sets), reverse=True)]
+        assert list(iter_difference(records[0], records[1:], key=by_value, reverse=True)) == \
+            [(value, 0) for value in sorted(sets[0].difference(*sets[1:]), reverse=True)]
+
+    assert [gallop_left(list(range(0, 100, 2)), target, lo) for target, lo in ((7, 0), (7, 4), (98, 10), (99, 0))] \
+        == [4, 4, 49, 50]
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_set_operations()
+
+if __name__ == "__main__":
+    main()
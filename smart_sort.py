@@ -0,0 +1,428 @@
+"""
+smart_sort.py - Гібридне сортування з вибором алгоритму за профілем входу
+
+smart_sort дешево профілює вхід за вибіркою з SAMPLE_SIZE позицій:
+довжина, кількість run'ів (частка спадних сусідніх пар), оцінка кількості
+інверсій (випадкові пари), частка дублікатів і діапазон цілих ключів, - та
+передає сортування найкращому з алгоритмів: сортуванню вставками,
+адаптивному злиттю, integer_sort (підрахунок / порозрядне) або timsort.
+
+Пороги вибору не задаються вручну: calibrate() вимірює всі алгоритми на
+типах даних з datasets.py для кількох розмірів на поточній машині й
+зберігає у файл профілю (JSON) для кожного типу даних і розміру ознаки
+входу та рейтинг алгоритмів. Вхід відноситься до найближчого за ознаками
+каліброваного типу; без файлу профілю smart_sort використовує timsort.
+
+Використання:
+python3 smart_sort.py               # калібрування (якщо профілю ще немає) та бенчмарк
+python3 smart_sort.py --calibrate   # примусове повторне калібрування
+"""
+
+import argparse
+import json
+import os
+import random
+from bisect import bisect_left
+from dataclasses import dataclass
+from operator import eq, lt
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmark import run_benchmark
+from benchmark_history import run_metadata
+from datasets import DATA_TYPES
+from sorting_core import (
+    DATA_SEED, adaptive_merge_sort, generate_data, insertion_sort, integer_sort, measure_time, timsort,
+)
+
+DEFAULT_PROFILE_FILE = "smart_sort_profile.json"
+
+# Кількість позицій вибірки для оцінки ознак входу
+SAMPLE_SIZE = 128
+
+# Кандидати для вибору: назва у профілі -> функція сортування
+SORTERS = {
+    "insertion": insertion_sort,
+    "adaptive": adaptive_merge_sort,
+    "radix": integer_sort,
+    "timsort": timsort,
+}
+
+# Розміри та типи даних для калібрування (killer будується надто довго)
+CALIBRATION_SIZES = (16, 64, 256, 1024, 4096, 16384, 65536)
+CALIBRATION_TYPES = tuple(data_type for data_type in DATA_TYPES if data_type != "killer")
+
+# Алгоритм, повільніший за найкращий у стільки разів і довший за
+# PRUNE_MIN_TIME секунд на виклик, на більших розмірах не вимірюється
+PRUNE_FACTOR = 20
+PRUNE_MIN_TIME = 0.01
+
+# Ширина діапазону ключів (бітів), за якої порозрядне сортування ще доцільне
+RADIX_MAX_BITS = 64
+
+@dataclass
+class InputProfile:
+    """
+    Ознаки входу, оцінені за вибіркою.
+    """
+    size: int
+    runs: int
+    descent_ratio: float
+    monotone_ratio: float
+    inversion_ratio: float
+    duplicate_ratio: float
+    integers: bool
+    key_range: Optional[int] = None
+
+    @property
+    def inversions(self) -> int:
+        """Оцінка кількості інверсій у всьому вході."""
+        return round(self.inversion_ratio * self.size * (self.size - 1) / 2)
+
+    def features(self) -> Tuple[float, float, float, float]:
+        """Вектор ознак для порівняння з каліброваними типами даних."""
+        return (self.descent_ratio, self.monotone_ratio, self.inversion_ratio, self.duplicate_ratio)
+
+def profile_input(arr: Sequence[Any], key: Optional[Callable[[Any], Any]] = None,
+                  sample_size: int = SAMPLE_SIZE, exact_range: bool = True) -> InputProfile:
+    """
+    Профілює вхід за O(sample_size) порівнянь.
+
+    Вибірка - трійки сусідніх елементів з рівномірним кроком (зрізи списку
+    без циклу на Python): частка спадних пар оцінює кількість run'ів, а
+    частка монотонних трійок відрізняє довгі run'и (organ_pipe, sawtooth)
+    від випадкових даних з тією ж часткою спадів. Інверсії оцінюються
+    порівнянням елементів вибірки, віддалених на половину входу. Ключ
+    обчислюється лише для елементів вибірки; точний діапазон ключів
+    (min/max за всім входом) - лише для цілих ключів і лише якщо exact_range.
+
+    Args:
+        arr: Список елементів
+        key: Функція ключа (як у sorted())
+        sample_size: Кількість трійок у вибірці
+        exact_range: Обчислити key_range одразу
+
+    Returns:
+        InputProfile
+    """
+    n = len(arr)
+    if n < 3:
+        keys = list(arr) if key is None else list(map(key, arr))
+        integers = all(type(value) is int for value in keys)
+        descent_ratio = float(n == 2 and keys[1] < keys[0])
+        return InputProfile(n, 1 + int(descent_ratio), descent_ratio, 1.0, descent_ratio, 0.0,
+                            integers, (max(keys) - min(keys) if keys else 0) if integers else None)
+
+    step = max(1, (n - 2) // sample_size)
+    first = step // 2
+    lefts = arr[first:n - 2:step]
+    middles = arr[first + 1:n - 1:step]
+    rights = arr[first + 2:n:step]
+    if key is not None:
+        lefts, middles, rights = list(map(key, lefts)), list(map(key, middles)), list(map(key, rights))
+    integers = {*map(type, lefts), *map(type, rights)} == {int}
+
+    pairs = len(lefts)
+    descents = list(map(lt, middles, lefts))
+    descent_ratio = sum(descents) / pairs
+    # Трійка монотонна, якщо обидві її пари спадні або обидві неспадні
+    monotone_ratio = sum(map(eq, map(lt, rights, middles), descents)) / pairs
+
+    # Інверсії: частка пар (i, i + n/2) вибірки з key[i + n/2] < key[i]
+    half = (pairs + 1) // 2
+    inversion_ratio = sum(map(lt, lefts[half:], lefts)) / (pairs - half) if pairs > 1 else descent_ratio
+
+    try:
+        duplicate_ratio = 1 - len(set(lefts)) / pairs
+    except TypeError:
+        # Нехешовані ключі: частку дублікатів не оцінюємо
+        duplicate_ratio = 0.0
+
+    info = InputProfile(
+        size=n,
+        runs=1 + round(descent_ratio * (n - 1)),
+        descent_ratio=descent_ratio,
+        monotone_ratio=monotone_ratio,
+        inversion_ratio=inversion_ratio,
+        duplicate_ratio=duplicate_ratio,
+        integers=integers,
+    )
+    if exact_range and integers:
+        info.key_range = key_range(arr, key)
+    return info
+
+def key_range(arr: Sequence[Any], key: Optional[Callable[[Any], Any]] = None) -> Optional[int]:
+    """
+    Діапазон max - min цілих ключів або None, якщо ключі не цілі.
+    """
+    keys = arr if key is None else [key(item) for item in arr]
+    try:
+        span = max(keys) - min(keys)
+    except (TypeError, ValueError):
+        return None
+    return span if type(span) is int else None
+
+_EMPTY_PROFILE = {"sizes": list(CALIBRATION_SIZES), "sorters": ["timsort"], "classes": {}, "uniform": None}
+
+_loaded_profiles: Dict[str, dict] = {}
+
+def load_profile(filename: str = DEFAULT_PROFILE_FILE) -> dict:
+    """
+    Читає профіль калібрування (з кешем); без файлу - порожній профіль (timsort).
+    """
+    if filename not in _loaded_profiles:
+        if os.path.exists(filename):
+            with open(filename, encoding='utf-8') as f:
+                _loaded_profiles[filename] = json.load(f)
+        else:
+            return _EMPTY_PROFILE
+    return _loaded_profiles[filename]
+
+def _uniform_choice(sizes: List[int], classes: dict) -> Optional[dict]:
+    """
+    Найбільший розмір, до якого всі типи даних мають одного переможця
+    (size = None, якщо переможець однаковий для всіх розмірів).
+
+    Для таких входів профілювання нічого не змінює, тож smart_sort його
+    пропускає. Порозрядне сортування потребує перевірки ключів і не
+    підходить для вибору без профілювання.
+    """
+    uniform = None
+    for index, size in enumerate(sizes):
+        winners = {entry["rankings"][index][0] for entry in classes.values()}
+        if len(winners) != 1 or "radix" in winners:
+            return uniform
+        uniform = {"size": size, "sorter": winners.pop()}
+    if uniform is not None:
+        uniform["size"] = None
+    return uniform
+
+def _nearest_class(profile: dict, bucket: int, features: Tuple[float, ...]) -> str:
+    """
+    Калібрований тип даних з найближчим (евклідова відстань) вектором ознак.
+    """
+    def distance(entry):
+        return sum((a - b) ** 2 for a, b in zip(entry["features"][bucket], features))
+    return min(profile["classes"], key=lambda name: distance(profile["classes"][name]))
+
+def choose_sorter(arr: Sequence[Any], key: Optional[Callable[[Any], Any]] = None,
+                  profile: Optional[dict] = None) -> Tuple[str, Optional[str], Optional[InputProfile]]:
+    """
+    Вибирає алгоритм для входу за профілем калібрування.
+
+    Args:
+        arr: Послідовність елементів
+        key: Функція ключа (як у sorted())
+        profile: Профіль калібрування (за замовчуванням - load_profile())
+
+    Returns:
+        (назва алгоритму, найближчий тип даних, ознаки входу); тип даних і
+        ознаки - None, якщо профілювання не знадобилося
+    """
+    profile = profile or load_profile()
+    if not profile["classes"]:
+        return "timsort", None, None
+
+    n = len(arr)
+    uniform = profile["uniform"]
+    if uniform is not None and (uniform["size"] is None or n <= uniform["size"]):
+        return uniform["sorter"], None, None
+
+    sizes = profile["sizes"]
+    bucket = min(bisect_left(sizes, n), len(sizes) - 1)
+    info = profile_input(arr, key, exact_range=False)
+    nearest = _nearest_class(profile, bucket, info.features())
+
+    for name in profile["classes"][nearest]["rankings"][bucket]:
+        if name == "radix":
+            if not info.integers:
+                continue
+            # Діапазон рахуємо лише тоді, коли порозрядне сортування - кандидат
+            info.key_range = key_range(arr, key)
+            if info.key_range is None or info.key_range.bit_length() > RADIX_MAX_BITS:
+                continue
+        return name, nearest, info
+    return "timsort", nearest, info
+
+def smart_sort(arr: List[Any], key: Optional[Callable[[Any], Any]] = None,
+               reverse: bool = False, profile: Optional[dict] = None) -> List[Any]:
+    """
+    Сортування з автоматичним вибором алгоритму за ознаками входу.
+
+    Усі кандидати стабільні, тож результат збігається з sorted(arr, key=key,
+    reverse=reverse) незалежно від вибору.
+
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (як у sorted())
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        profile: Профіль калібрування (за замовчуванням - load_profile())
+
+    Returns:
+        Відсортований список
+    """
+    name, _, _ = choose_sorter(arr, key, profile)
+    if name == "radix":
+        try:
+            return integer_sort(arr, key=key, reverse=reverse)
+        except TypeError:
+            # У вибірку не потрапили нецілі ключі
+            return timsort(arr, key=key, reverse=reverse)
+    return SORTERS[name](arr, key=key, reverse=reverse)
+
+def calibrate(sizes: Sequence[int] = CALIBRATION_SIZES,
+              data_types: Sequence[str] = CALIBRATION_TYPES,
+              filename: Optional[str] = DEFAULT_PROFILE_FILE,
+              sorters: Sequence[str] = tuple(SORTERS),
+              min_time: float = 0.05, max_time: float = 0.5) -> dict:
+    """
+    Калібрує вибір алгоритму на поточній машині та зберігає профіль.
+
+    Для кожного типу даних і розміру вимірюються всі кандидати (алгоритм,
+    що відстав від найкращого більш ніж у PRUNE_FACTOR разів і працює довше
+    за PRUNE_MIN_TIME, на більших розмірах не вимірюється й іде в кінець
+    рейтингу) та зберігаються ознаки входу.
+
+    Args:
+        sizes: Розміри (зростаючі); вхід відноситься до найменшого не меншого розміру
+        data_types: Типи даних з datasets.DATA_TYPES
+        filename: Файл профілю (None - не зберігати)
+        sorters: Кандидати з SORTERS
+        min_time: Мінімальний час вимірювання однієї комірки (секунди)
+        max_time: Максимальний час вимірювання однієї комірки (секунди)
+
+    Returns:
+        Профіль калібрування
+    """
+    sizes = sorted(sizes)
+    print(f"\n🎛️  Калібрування smart_sort: {len(data_types)} типів даних × {len(sizes)} розмірів")
+    print("-" * (21 + 11 * len(sizes)))
+    print(f"{'Тип даних':<20} " + "".join(f"{size:<11,}" for size in sizes))
+    print("-" * (21 + 11 * len(sizes)))
+
+    classes = {}
+    for data_type in data_types:
+        entry = {"features": [], "rankings": [], "times": []}
+        pruned = set()
+        for size in sizes:
+            data = generate_data(size, data_type, seed=DATA_SEED)
+            times = {name: run_benchmark(func, data, min_repeats=3, min_time=min_time,
+                                         max_time=max_time).median
+                     for name, func in SORTERS.items() if name in sorters and name not in pruned}
+            best = min(times.values())
+            pruned.update(name for name, elapsed in times.items()
+                          if elapsed > max(PRUNE_FACTOR * best, PRUNE_MIN_TIME))
+
+            entry["features"].append(list(profile_input(data).features()))
+            entry["rankings"].append(sorted(times, key=times.get)
+                                     + [name for name in sorters if name not in times])
+            entry["times"].append(times)
+        classes[data_type] = entry
+        print(f"{data_type:<20} " + "".join(f"{ranking[0]:<11}" for ranking in entry["rankings"]))
+
+    profile = {
+        "metadata": run_metadata(),
+        "sizes": sizes,
+        "sorters": list(sorters),
+        "classes": classes,
+        "uniform": _uniform_choice(sizes, classes),
+    }
+    uniform = profile["uniform"]
+    if uniform is not None:
+        limit = "для всіх розмірів" if uniform["size"] is None else f"до {uniform['size']:,} елементів"
+        print(f"📍 Профілювання пропускається {limit}: завжди {uniform['sorter']}")
+
+    if filename is not None:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+        _loaded_profiles[filename] = profile
+        print(f"💾 Профіль збережено: {filename}")
+    return profile
+
+def benchmark_smart_sort(sizes: Sequence[int] = (1000, 50000), data_types: Sequence[str] = DATA_TYPES,
+                         profile: Optional[dict] = None):
+    """
+    Порівнює smart_sort з кожним кандидатом і окремо вимірює ціну профілювання.
+
+    Колонка "Smart/краще" - відношення до найшвидшого з кандидатів профілю.
+
+    Args:
+        sizes: Розміри даних
+        data_types: Типи даних (зокрема такі, що не брали участі в калібруванні)
+        profile: Профіль калібрування (за замовчуванням - load_profile())
+
+    Returns:
+        Словник {(data_type, size): (вибраний алгоритм, {варіант: час})}
+    """
+    profile = profile or load_profile()
+    results = {}
+    for size in sizes:
+        print(f"\n🧠 smart_sort проти кандидатів ({size:,} елементів):")
+        print("-" * 112)
+        print(f"{'Тип даних':<20} {'Схожий на':<20} {'Вибір':<11} {'Smart':<11} {'Профіль':<11} "
+              f"{'Insertion':<11} {'Adaptive':<11} {'Radix':<11} {'Timsort':<11} {'Smart/краще':<11}")
+        print("-" * 112)
+        for data_type in data_types:
+            data = generate_data(size, data_type, seed=DATA_SEED)
+            chosen, nearest, _ = choose_sorter(data, profile=profile)
+            times = {"smart": measure_time(lambda d: smart_sort(d, profile=profile), data),
+                     "profile": measure_time(profile_input, data)}
+            for name, func in SORTERS.items():
+                # Квадратичне сортування вставками на великих випадкових даних пропускаємо
+                if name == "insertion" and size > 2000 and chosen != "insertion":
+                    times[name] = None
+                else:
+                    times[name] = measure_time(func, data)
+            best = min(times[name] for name in profile["sorters"] if times[name] is not None)
+            results[(data_type, size)] = (chosen, times)
+            cells = "".join(f"{times[name]:<11.6f}" if times[name] is not None else f"{'-':<11}"
+                            for name in ("smart", "profile", *SORTERS))
+            print(f"{data_type:<20} {nearest or '-':<20} {chosen:<11} {cells}{times['smart'] / best:<11.2f}")
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    parser = argparse.ArgumentParser(description="Гібридне сортування з автоматичним вибором алгоритму")
+    parser.add_argument("--calibrate", action="store_true", help="Повторно відкалібрувати пороги")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE_FILE, help="Файл профілю калібрування")
+    args = parser.parse_args()
+
+    if args.calibrate or not os.path.exists(args.profile):
+        calibrate(filename=args.profile)
+    profile = load_profile(args.profile)
+
+    # Вибір лише серед реалізацій на Python: вбудований timsort написаний на C
+    # і зазвичай виграє всюди, тож тут видно, як працює саме диспетчеризація
+    python_profile = calibrate(sizes=(16, 256, 4096), filename=None,
+                               sorters=("insertion", "adaptive", "radix"))
+
+    rng = random.Random(DATA_SEED)
+    for data_type in DATA_TYPES:
+        for n in (0, 1, 2, 17, 300, 5000):
+            data = generate_data(n, data_type, seed=n)
+            for calibration in (profile, python_profile):
+                assert smart_sort(data, profile=calibration) == sorted(data), (data_type, n)
+                assert smart_sort(data, reverse=True, profile=calibration) == sorted(data, reverse=True)
+    records = [(rng.randint(0, 20), i) for i in range(3000)]
+    mixed = [rng.random() if i % 97 == 0 else rng.randint(0, 100) for i in range(3000)]
+    words = [str(rng.randint(0, 10 ** 6)) for _ in range(3000)]
+    for calibration in (profile, python_profile):
+        assert smart_sort(records, key=lambda r: r[0], profile=calibration) == \
+            sorted(records, key=lambda r: r[0])
+        assert smart_sort(mixed, profile=calibration) == sorted(mixed)
+        assert smart_sort(words, profile=calibration) == sorted(words)
+    assert choose_sorter(words, profile=python_profile)[0] != "radix"
+    assert smart_sort([3, 1, 2], profile=_EMPTY_PROFILE) == [1, 2, 3]
+
+    info = profile_input(list(range(1000, 0, -1)))
+    assert info.descent_ratio == 1.0 and info.inversion_ratio == 1.0 and info.key_range == 999
+    assert profile_input(list(range(1000))).runs == 1
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_smart_sort(profile=profile)
+    print("\n🐍 Лише реалізації на Python:")
+    benchmark_smart_sort(sizes=(1000, 20000), profile=python_profile)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+sorted_container.py - Відсортований контейнер з інкрементними вставками
+
+SortedList зберігає елементи як список відсортованих порцій (chunk'ів)
+довжиною близько load (коефіцієнт заповнення), подібно до SortedList з
+бібліотеки sortedcontainers:
+- пошук порції - bisect за максимумами порцій, O(log n)
+- вставка/видалення - бінарна вставка всередині порції (зсув не більше
+  2·load елементів, memmove у C)
+- позиції - дерево Фенвіка за довжинами порцій, O(log n)
+- update() сортує пакет через timsort і зливає його з наявними елементами
+  через merge, або для малого пакета вставляє елементи по одному
+
+Використання:
+python3 sorted_container.py
+"""
+
+import bisect
+import random
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+from sorting_core import DATA_SEED, measure_time, merge, timsort
+
+# Коефіцієнт заповнення: бажана довжина порції (порція ділиться, коли
+# перевищує 2·load, і зливається з сусідньою, коли коротша за load/2)
+DEFAULT_LOAD = 1000
+
+# Пакет, менший за len / UPDATE_RATIO, вставляється поелементно, а не злиттям
+UPDATE_RATIO = 8
+
+class SortedList:
+    """
+    Список, що завжди відсортований.
+
+    Рівні елементи зберігаються у порядку додавання (нові - після наявних).
+    """
+
+    def __init__(self, iterable: Iterable[Any] = (), load: int = DEFAULT_LOAD):
+        """
+        Args:
+            iterable: Початкові елементи (у довільному порядку)
+            load: Коефіцієнт заповнення - бажана довжина порції
+        """
+        self._load = load
+        self._len = 0
+        self._lists: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        # Дерево Фенвіка за довжинами порцій; порожнє - потрібна перебудова
+        self._tree: List[int] = []
+        self.update(iterable)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return chain.from_iterable(reversed(chunk) for chunk in reversed(self._lists))
+
+    def __contains__(self, value: Any) -> bool:
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._lists[pos]
+        idx = bisect.bisect_left(chunk, value)
+        return chunk[idx] == value
+
+    def __getitem__(self, index: int) -> Any:
+        pos, idx = self._locate(index)
+        return self._lists[pos][idx]
+
+    def __repr__(self) -> str:
+        return f"SortedList({list(self)!r})"
+
+    # --- Позиційний індекс (дерево Фенвіка) ---
+
+    def _rebuild_index(self) -> None:
+        tree = [0] + [len(chunk) for chunk in self._lists]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _index_add(self, pos: int, delta: int) -> None:
+        tree = self._tree
+        if not tree:
+            return
+        i = pos + 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, pos: int) -> int:
+        """
+        Кількість елементів у порціях [0, pos).
+        """
+        if not self._tree:
+            self._rebuild_index()
+        tree = self._tree
+        total = 0
+        while pos:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _locate(self, index: int) -> tuple:
+        """
+        Перетворює позицію у (номер порції, зсув у порції) спуском по дереву Фенвіка.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("індекс поза межами SortedList")
+        if not self._tree:
+            self._rebuild_index()
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
+
+    # --- Зміна структури порцій ---
+
+    def _expand(self, pos: int) -> None:
+        """
+        Ділить порцію навпіл, якщо вона довша за 2·load.
+        """
+        chunk = self._lists[pos]
+        if len(chunk) > 2 * self._load:
+            half = chunk[self._load:]
+            del chunk[self._load:]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos, chunk[-1])
+            self._tree = []
+
+    def _delete(self, pos: int, idx: int) -> None:
+        """
+        Видаляє елемент idx порції pos, зливаючи замалу порцію з сусідньою.
+        """
+        chunk = self._lists[pos]
+        del chunk[idx]
+        self._len -= 1
+        self._index_add(pos, -1)
+
+        if not chunk:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._tree = []
+        elif len(chunk) < self._load // 2 and len(self._lists) > 1:
+            # Сусідні порції впорядковані між собою - достатньо конкатенації
+            if pos == 0:
+                pos = 1
+            prev = self._lists[pos - 1]
+            prev.extend(self._lists[pos])
+            del self._lists[pos]
+            del self._maxes[pos - 1]
+            self._maxes[pos - 1] = prev[-1]
+            self._tree = []
+            self._expand(pos - 1)
+        else:
+            self._maxes[pos] = chunk[-1]
+
+    # --- Публічний інтерфейс ---
+
+    def add(self, value: Any) -> None:
+        """
+        Додає елемент за O(log n) порівнянь.
+        """
+        if not self._maxes:
+            self._lists.append([value])
+            self._maxes.append(value)
+            self._tree = []
+            self._len = 1
+            return
+
+        pos = bisect.bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._lists[pos].append(value)
+            self._maxes[pos] = value
+        else:
+            # Бінарна вставка, як у binary_insertion_sort: рівні - після наявних
+            bisect.insort_right(self._lists[pos], value)
+        self._len += 1
+        self._index_add(pos, 1)
+        self._expand(pos)
+
+    def update(self, iterable: Iterable[Any]) -> None:
+        """
+        Додає пакет елементів.
+
+        Малий пакет (менший за len / UPDATE_RATIO) вставляється поелементно;
+        більший сортується через timsort і зливається з усіма елементами
+        через merge за O(n + b log b), після чого порції будуються заново.
+        """
+        values = timsort(list(iterable))
+        if not values:
+            return
+
+        if len(values) * UPDATE_RATIO < self._len:
+            for value in values:
+                self.add(value)
+            return
+
+        merged = merge(list(self), values) if self._len else values
+        load = self._load
+        self._lists = [merged[i:i + load] for i in range(0, len(merged), load)]
+        self._maxes = [chunk[-1] for chunk in self._lists]
+        self._len = len(merged)
+        self._tree = []
+
+    def remove(self, value: Any) -> None:
+        """
+        Видаляє одне входження value; ValueError, якщо його немає.
+        """
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos < len(self._maxes):
+            chunk = self._lists[pos]
+            idx = bisect.bisect_left(chunk, value)
+            if chunk[idx] == value:
+                self._delete(pos, idx)
+                return
+        raise ValueError(f"{value!r} відсутній у SortedList")
+
+    def discard(self, value: Any) -> None:
+        """
+        Видаляє одне входження value, якщо воно є.
+        """
+        try:
+            self.remove(value)
+        except ValueError:
+            pass
+
+    def pop(self, index: int = -1) -> Any:
+        """
+        Видаляє та повертає елемент за позицією (за замовчуванням - найбільший).
+        """
+        pos, idx = self._locate(index)
+        value = self._lists[pos][idx]
+        self._delete(pos, idx)
+        return value
+
+    def bisect_left(self, value: Any) -> int:
+        """
+        Позиція вставки value перед рівними елементами.
+        """
+        pos = bisect.bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._prefix(pos) + bisect.bisect_left(self._lists[pos], value)
+
+    def bisect_right(self, value: Any) -> int:
+        """
+        Позиція вставки value після рівних елементів.
+        """
+        pos = bisect.bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._prefix(pos) + bisect.bisect_right(self._lists[pos], value)
+
+    def count(self, value: Any) -> int:
+        """
+        Кількість елементів, рівних value.
+        """
+        return self.bisect_right(value) - self.bisect_left(value)
+
+    def irange(self, minimum: Optional[Any] = None, maximum: Optional[Any] = None,
+               inclusive: tuple = (True, True)) -> Iterator[Any]:
+        """
+        Ітерує елементи з діапазону [minimum, maximum] у відсортованому порядку.
+
+        Args:
+            minimum: Нижня межа (None - без межі)
+            maximum: Верхня межа (None - без межі)
+            inclusive: Чи включати (нижню, верхню) межу
+
+        Yields:
+            Елементи діапазону
+        """
+        if minimum is None:
+            pos, idx = 0, 0
+        else:
+            find = bisect.bisect_left if inclusive[0] else bisect.bisect_right
+            pos = find(self._maxes, minimum)
+            if pos == len(self._maxes):
+                return
+            idx = find(self._lists[pos], minimum)
+
+        for chunk in islice(self._lists, pos, None):
+            if maximum is not None and (maximum < chunk[-1] or
+                                        (not inclusive[1] and not chunk[-1] < maximum)):
+                # Остання потрібна порція: межа всередині неї
+                find = bisect.bisect_right if inclusive[1] else bisect.bisect_left
+                yield from islice(chunk, idx, find(chunk, maximum))
+                return
+            yield from islice(chunk, idx, None)
+            idx = 0
+
+    def _check(self) -> None:
+        """
+        Перевіряє інваріанти (для тестів).
+        """
+        assert self._len == sum(len(chunk) for chunk in self._lists)
+        assert all(chunk and len(chunk) <= 2 * self._load for chunk in self._lists)
+        assert self._maxes == [chunk[-1] for chunk in self._lists]
+        flat = list(self)
+        assert all(not flat[i + 1] < flat[i] for i in range(len(flat) - 1))
+        for pos in range(len(self._lists) + 1):
+            assert self._prefix(pos) == sum(len(chunk) for chunk in self._lists[:pos])
+
+def _resort_each_batch(batches: List[List[int]]) -> List[int]:
+    """
+    Базовий варіант: дописати пакет і повністю пересортувати timsort.
+    """
+    arr = []
+    for batch in batches:
+        arr.extend(batch)
+        arr = timsort(arr)
+        bisect.bisect_left(arr, batch[0])
+    return arr
+
+def _insert_each(batches: List[List[int]]) -> List[int]:
+    """
+    Інкрементна бінарна вставка кожного елемента у суцільний список.
+    """
+    arr = []
+    for batch in batches:
+        for value in batch:
+            bisect.insort_right(arr, value)
+        bisect.bisect_left(arr, batch[0])
+    return arr
+
+def _sorted_list_update(batches: List[List[int]]) -> SortedList:
+    container = SortedList()
+    for batch in batches:
+        container.update(batch)
+        container.bisect_left(batch[0])
+    return container
+
+def _sorted_list_add(batches: List[List[int]]) -> SortedList:
+    container = SortedList()
+    for batch in batches:
+        for value in batch:
+            container.add(value)
+        container.bisect_left(batch[0])
+    return container
+
+INCREMENTAL_STRATEGIES = {
+    "timsort після пакета": _resort_each_batch,
+    "insort (бінарна вставка)": _insert_each,
+    "SortedList.update": _sorted_list_update,
+    "SortedList.add": _sorted_list_add,
+}
+
+def benchmark_incremental(totals=(10000, 100000), batch_sizes=(100, 1000, 10000)):
+    """
+    Порівнює підтримку відсортованого стану під час надходження пакетів.
+
+    Після кожного пакета виконується пошук (bisect), тож кожна стратегія
+    мусить мати відсортовані дані після кожного пакета.
+
+    Args:
+        totals: Загальні кількості елементів
+        batch_sizes: Розміри пакетів
+
+    Returns:
+        Словник {(total, batch_size): {стратегія: час}}
+    """
+    print("\n📥 Інкрементне підтримання порядку (випадкові дані, загальний час):")
+    print("-" * 100)
+    header = "".join(f"{name:<26}" for name in INCREMENTAL_STRATEGIES)
+    print(f"{'Усього':<10} {'Пакет':<8} {header}")
+    print("-" * 100)
+
+    rng = random.Random(DATA_SEED)
+    results = {}
+    for total in totals:
+        data = [rng.randrange(total * 10) for _ in range(total)]
+        for batch_size in batch_sizes:
+            if batch_size > total:
+                continue
+            batches = [data[i:i + batch_size] for i in range(0, total, batch_size)]
+            times = {name: measure_time(func, batches, runs=1)
+                     for name, func in INCREMENTAL_STRATEGIES.items()}
+            results[(total, batch_size)] = times
+            cells = "".join(f"{times[name]:<26.4f}" for name in INCREMENTAL_STRATEGIES)
+            print(f"{total:<10,} {batch_size:<8,} {cells}")
+
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    rng = random.Random(DATA_SEED)
+    container = SortedList(load=8)
+    reference = []
+    for step in range(3000):
+        op = rng.random()
+        value = rng.randrange(200)
+        if op < 0.5:
+            container.add(value)
+            bisect.insort_right(reference, value)
+        elif op < 0.55:
+            batch = [rng.randrange(200) for _ in range(rng.randrange(1, 60))]
+            container.update(batch)
+            reference = sorted(reference + batch)
+        elif op < 0.8:
+            container.discard(value)
+            if value in reference:
+                reference.remove(value)
+        elif reference:
+            index = rng.randrange(-len(reference), len(reference))
+            assert container.pop(index) == reference.pop(index)
+        assert len(container) == len(reference)
+        assert container.bisect_left(value) == bisect.bisect_left(reference, value)
+        assert container.bisect_right(value) == bisect.bisect_right(reference, value)
+        assert (value in container) == (value in reference)
+        if step % 100 == 0:
+            container._check()
+            assert list(container) == reference
+            assert [container[i] for i in range(len(reference))] == reference
+            lo, hi = sorted(rng.randrange(200) for _ in range(2))
+            for inclusive in ((True, True), (True, False), (False, True), (False, False)):
+                expected = [x for x in reference
+                            if (lo <= x if inclusive[0] else lo < x)
+                            and (x <= hi if inclusive[1] else x < hi)]
+                assert list(container.irange(lo, hi, inclusive)) == expected
+    print("✅ Перевірка коректності пройдена")
+
+    benchmark_incremental()
+
+if __name__ == "__main__":
+    main()
@@ -10,206 +10,19 @@ sorting_comparison.py - Порівняння алгоритмів сортува
 - Збереження результатів у CSV
 - Незалежність від зовнішніх графічних бібліотек
 
+Алгоритми, генерація даних та вимірювання - у спільному модулі sorting_core.py.
+
 Для графічної візуалізації використовуйте sorting_comparison_with_plots.py
 """
 
-import timeit
-import random
-from typing import List
-import csv
-
-def insertion_sort(arr: List[int]) -> List[int]:
-    """
-    Алгоритм сортування вставками.
-    
-    Args:
-        arr: Список цілих чисел для сортування
-        
-    Returns:
-        Відсортований список
-    """
-    # Створюємо копію вхідного списку, щоб не змінювати оригінал
-    arr = arr.copy()
-    
-    # Проходимо по всіх елементах, починаючи з другого
-    for i in range(1, len(arr)):
-        key = arr[i]
-        j = i - 1
-        # Поки не дійшли до початку списку і поточний елемент більший за ключ
-        while j >= 0 and arr[j] > key:
-            # Зсуваємо елементи вправо
-            arr[j + 1] = arr[j]
-            j -= 1
-        # Вставляємо ключ у відповідну позицію
-        arr[j + 1] = key
-        
-    return arr
-
-def merge_sort(arr: List[int]) -> List[int]:
-    """
-    Алгоритм сортування злиттям.
-    
-    Args:
-        arr: Список цілих чисел для сортування
-        
-    Returns:
-        Відсортований список
-    """
-    # Створюємо копію вхідного списку, щоб не змінювати оригінал
-    arr = arr.copy()
-    
-    # Базовий випадок: якщо список має 1 або 0 елементів, він вже відсортований
-    if len(arr) <= 1:
-        return arr
-    
-    # Знаходимо середину списку
-    mid = len(arr) // 2
-    
-    # Рекурсивно сортуємо ліву та праву частини
-    left = merge_sort(arr[:mid])
-    right = merge_sort(arr[mid:])
-    
-    # Об'єднуємо ліву та праву частини
-    return merge(left, right)
-
-def merge(left: List[int], right: List[int]) -> List[int]:
-    """
-    Допоміжна функція для злиття двох відсортованих списків.
-    
-    Args:
-        left: Перший відсортований список
-        right: Другий відсортований список
-        
-    Returns:
-        Об'єднаний відсортований список
-    """
-    result = []
-    i = j = 0
-    
-    # Порівнюємо елементи з обох списків і додаємо менший до результату
-    while i < len(left) and j < len(right):
-        if left[i] <= right[j]:
-            result.append(left[i])
-            i += 1
-        else:
-            result.append(right[j])
-            j += 1
-    
-    # Додаємо елементи, що залишилися (якщо є)
-    result.extend(left[i:])
-    result.extend(right[j:])
-    
-    return result
-
-def timsort(arr: List[int]) -> List[int]:
-    """
-    Вбудований алгоритм сортування Python (Timsort).
-    
-    Args:
-        arr: Список цілих чисел для сортування
-        
-    Returns:
-        Відсортований список
-    """
-    # Створюємо копію вхідного списку, щоб не змінювати оригінал
-    arr = arr.copy()
-    
-    # Використовуємо вбудований метод sorted()
-    return sorted(arr)
-
-def generate_data(size: int, data_type: str = "random") -> List[int]:
-    """
-    Генерує тестові дані різних типів.
-    
-    Args:
-        size: Розмір списку
-        data_type: Тип даних ("random", "sorted", "reversed", "partially_sorted")
-        
-    Returns:
-        Список цілих чисел
-    """
-    if data_type == "random":
-        # Генеруємо випадковий список чисел
-        return [random.randint(0, 1000000) for _ in range(size)]
-    elif data_type == "sorted":
-        # Генеруємо відсортований список чисел
-        return list(range(size))
-    elif data_type == "reversed":
-        # Генеруємо список чисел у зворотному порядку
-        return list(range(size, 0, -1))
-    elif data_type == "partially_sorted":
-        # Генеруємо частково відсортований список
-        arr = list(range(size))
-        # Перемішуємо ~25% елементів
-        for _ in range(size // 4):
-            i, j = random.randint(0, size-1), random.randint(0, size-1)
-            arr[i], arr[j] = arr[j], arr[i]
-        return arr
-    else:
-        raise ValueError(f"Невідомий тип даних: {data_type}")
-
-def measure_time(func, data, runs=3):
-    """
-    Вимірює час виконання функції.
-    
-    Args:
-        func: Функція для вимірювання
-        data: Вхідні дані
-        runs: Кількість запусків для усереднення
-        
-    Returns:
-        Середній час виконання (в секундах)
-    """
-    # Використовуємо timeit для точного вимірювання часу
-    total_time = timeit.timeit(lambda: func(data), number=runs)
-    return total_time / runs
+import argparse
 
-def compare_sorting_algorithms(sizes, data_types):
-    """
-    Порівнює алгоритми сортування за часом на різних типах даних.
-    
-    Args:
-        sizes: Список розмірів вхідних даних
-        data_types: Список типів даних
-        
-    Returns:
-        Словник з результатами
-    """
-    results = {data_type: {"insertion": [], "merge": [], "timsort": []} for data_type in data_types}
-    
-    print("🔄 Початок порівняння алгоритмів сортування...")
-    print("=" * 60)
-    
-    for size in sizes:
-        print(f"\n📊 Тестування для розміру {size:,} елементів:")
-        print("-" * 45)
-        
-        for data_type in data_types:
-            data = generate_data(size, data_type)
-            
-            print(f"  📈 Тип даних: {data_type}")
-            
-            # Пропускаємо сортування вставками для великих масивів (надто повільно)
-            if size <= 10000:
-                print("    ⏱️  Вимірюємо insertion sort...", end=" ")
-                insertion_time = measure_time(insertion_sort, data)
-                results[data_type]["insertion"].append(insertion_time)
-                print(f"{insertion_time:.6f}s")
-            else:
-                results[data_type]["insertion"].append(None)
-                print("    ⏱️  Insertion sort пропущено (занадто великий розмір)")
-            
-            print("    ⏱️  Вимірюємо merge sort...", end=" ")
-            merge_time = measure_time(merge_sort, data)
-            results[data_type]["merge"].append(merge_time)
-            print(f"{merge_time:.6f}s")
-            
-            print("    ⏱️  Вимірюємо timsort...", end=" ")
-            timsort_time = measure_time(timsort, data)
-            results[data_type]["timsort"].append(timsort_time)
-            print(f"{timsort_time:.6f}s")
-    
-    return results, sizes
+from benchmark import fit_exponent, medians
+from benchmark_history import append_results
+from profiling import add_profile_arguments, config_from_args
+from sorting_core import (
+    ALGORITHMS, DATA_SEED, compare_sorting_algorithms, save_results_to_csv,
+)
 
 def print_results_table(results, sizes, data_types):
     """
@@ -220,36 +33,82 @@ def print_results_table(results, sizes, data_types):
         sizes: Список розмірів
         data_types: Список типів даних
     """
+    width = 10 + 13 * len(ALGORITHMS) + 15
+    
     print("\n" + "="*80)
     print("📋 РЕЗУЛЬТАТИ ПОРІВНЯННЯ АЛГОРИТМІВ СОРТУВАННЯ")
     print("="*80)
     
     for data_type in data_types:
         print(f"\n🔸 {data_type.upper()} ДАНІ:")
-        print("-" * 70)
-        print(f"{'Розмір':<10} {'Insertion':<12} {'Merge':<12} {'Timsort':<12} {'Найкращий':<15}")
-        print("-" * 70)
+        print("-" * width)
+        header = "".join(f"{label:<13}" for _, label, _ in ALGORITHMS.values())
+        print(f"{'Розмір':<10} {header}{'Найкращий':<15}")
+        print("-" * width)
         
         for i, size in enumerate(sizes):
-            insertion_time = results[data_type]["insertion"][i]
-            merge_time = results[data_type]["merge"][i]
-            timsort_time = results[data_type]["timsort"][i]
-            
-            # Визначаємо найкращий алгоритм
-            times = []
-            if insertion_time is not None:
-                times.append(("Insertion", insertion_time))
-            times.append(("Merge", merge_time))
-            times.append(("Timsort", timsort_time))
+            # Визначаємо найкращий алгоритм серед виміряних
+            times = [(label, results[data_type][name][i])
+                     for name, (_, label, _) in ALGORITHMS.items()
+                     if results[data_type][name][i] is not None]
+            times = [(label, result.median) for label, result in times]
+            best_algo = min(times, key=lambda x: x[1])[0]
             
-            best_algo, best_time = min(times, key=lambda x: x[1])
+            # Форматуємо результати (N/A - алгоритм вичерпав бюджет часу)
+            cells = ""
+            for name in ALGORITHMS:
+                result = results[data_type][name][i]
+                cell = f"{result.median:.6f}s" if result is not None else "N/A"
+                cells += f"{cell:<13}"
             
-            # Форматуємо результати
-            insertion_str = f"{insertion_time:.6f}s" if insertion_time else "N/A"
-            merge_str = f"{merge_time:.6f}s"
-            timsort_str = f"{timsort_time:.6f}s"
-            
-            print(f"{size:<10,} {insertion_str:<12} {merge_str:<12} {timsort_str:<12} {best_algo:<15}")
+            print(f"{size:<10,} {cells}{best_algo:<15}")
+        
+        _print_exponents(results, sizes, data_type, "median")
+        
+        # Лічильники операцій (лише якщо їх було увімкнено)
+        if any(r is not None and r.peak_memory is not None
+               for cells in results[data_type].values() for r in cells):
+            for metric, title, scale in (("comparisons", "Порівняння", 1),
+                                         ("moves", "Записи елементів", 1),
+                                         ("peak_memory", "Пікова пам'ять, КБ", 1024)):
+                print(f"\n   {title}:")
+                for i, size in enumerate(sizes):
+                    cells = ""
+                    for name in ALGORITHMS:
+                        result = results[data_type][name][i]
+                        value = getattr(result, metric) if result is not None else None
+                        cell = f"{value / scale:,.0f}" if value is not None else "N/A"
+                        cells += f"{cell:<13}"
+                    print(f"{size:<10,} {cells}")
+                _print_exponents(results, sizes, data_type, metric)
+        
+        # Час фаз профільованих комірок (лише в режимі профілювання)
+        profiled = [(size, name, result) for i, size in enumerate(sizes) for name in ALGORITHMS
+                    for result in (results[data_type][name][i],)
+                    if result is not None and result.phase_merge is not None]
+        if profiled:
+            print("\n   Фази (рекурсія / злиття / копіювання):")
+            for size, name, result in profiled:
+                print(f"{size:<10,} {name:<13}{result.phase_recursion:.6f}s / {result.phase_merge:.6f}s / "
+                      f"{result.phase_copy:.6f}s")
+
+def _print_exponents(results, sizes, data_type, metric):
+    """
+    Виводить рядок з емпіричним показником складності n^k для кожного алгоритму.
+    
+    Args:
+        results: Словник з результатами
+        sizes: Список розмірів
+        data_type: Тип даних
+        metric: Поле BenchmarkResult ("median", "comparisons", "moves", "peak_memory")
+    """
+    cells = ""
+    for name in ALGORITHMS:
+        values = [getattr(r, metric) if r is not None else None for r in results[data_type][name]]
+        exponent = fit_exponent(sizes, values)
+        cell = f"n^{exponent:.2f}" if exponent is not None else "N/A"
+        cells += f"{cell:<13}"
+    print(f"{'Оцінка':<10} {cells}")
 
 def analyze_performance(results, sizes, data_types):
     """
@@ -269,17 +128,26 @@ def analyze_performance(results, sizes, data_types):
         print("-" * 50)
         
         # Аналізуємо співвідношення швидкості
-        merge_times = results[data_type]["merge"]
-        timsort_times = results[data_type]["timsort"]
+        merge_times = medians(results[data_type]["merge"])
+        timsort_times = medians(results[data_type]["timsort"])
+        
+        adaptive_times = medians(results[data_type]["adaptive"])
         
         print("🚀 Швидкість Timsort vs Merge Sort:")
         for i, size in enumerate(sizes):
-            if i < len(merge_times) and i < len(timsort_times):
+            if merge_times[i] is not None and timsort_times[i] is not None:
                 speedup = merge_times[i] / timsort_times[i]
                 print(f"   Розмір {size:,}: Timsort швидший у {speedup:.2f} разів")
         
+        print("\n🔁 Adaptive Merge Sort vs Merge Sort:")
+        for i, size in enumerate(sizes):
+            if merge_times[i] is None or adaptive_times[i] is None:
+                continue
+            speedup = merge_times[i] / adaptive_times[i]
+            print(f"   Розмір {size:,}: Adaptive швидший у {speedup:.2f} разів")
+        
         # Аналіз для insertion sort (тільки для малих розмірів)
-        insertion_times = [t for t in results[data_type]["insertion"] if t is not None]
+        insertion_times = [t for t in medians(results[data_type]["insertion"]) if t is not None]
         if insertion_times:
             print("\n⚡ Insertion Sort (малі розміри):")
             valid_sizes = sizes[:len(insertion_times)]
@@ -290,43 +158,22 @@ def analyze_performance(results, sizes, data_types):
                     ratio = max(time, timsort_time) / min(time, timsort_time)
                     print(f"   Розмір {size:,}: Insertion Sort {comparison} у {ratio:.2f} разів")
 
-def save_results_to_csv(results, sizes, data_types, filename="sorting_results.csv"):
-    """
-    Зберігає результати у CSV файл.
-    
-    Args:
-        results: Словник з результатами
-        sizes: Список розмірів
-        data_types: Список типів даних
-        filename: Ім'я файлу для збереження
-    """
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['data_type', 'size', 'insertion_sort', 'merge_sort', 'timsort']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for data_type in data_types:
-            for i, size in enumerate(sizes):
-                writer.writerow({
-                    'data_type': data_type,
-                    'size': size,
-                    'insertion_sort': results[data_type]["insertion"][i],
-                    'merge_sort': results[data_type]["merge"][i],
-                    'timsort': results[data_type]["timsort"][i]
-                })
-    
-    print(f"\n💾 Результати збережено у файл: {filename}")
-
 def main():
     """
     Головна функція програми.
     """
+    parser = argparse.ArgumentParser(description="Порівняння алгоритмів сортування")
+    parser.add_argument("--counters", action="store_true",
+                        help="Додатково рахувати порівняння, записи та пікову пам'ять")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     print("🔬" + "="*58 + "🔬")
     print("🔬  ПОРІВНЯННЯ АЛГОРИТМІВ СОРТУВАННЯ (БЕЗ MATPLOTLIB)  🔬")
     print("🔬" + "="*58 + "🔬")
-    print("📋 Порівняння: Insertion Sort, Merge Sort, Timsort")
+    print(f"📋 Порівняння: {', '.join(label for _, label, _ in ALGORITHMS.values())}")
     print("📊 Тестування на різних типах та розмірах даних")
-    print("⏱️  Вимірювання часу за допомогою модуля timeit")
+    print("⏱️  Вимірювання: прогрів, вимкнений GC, медіана, IQR та довірчі інтервали")
     print("="*62)
     
     # Розміри списків для тестування
@@ -339,7 +186,9 @@ def main():
     print(f"📊 Типи даних: {', '.join(data_types)}")
     
     # Порівнюємо алгоритми
-    results, sizes = compare_sorting_algorithms(sizes, data_types)
+    results, sizes = compare_sorting_algorithms(sizes, data_types, seed=DATA_SEED,
+                                                counters=args.counters,
+                                                profile=config_from_args(args))
     
     # Виводимо результати у вигляді таблиці
     print_results_table(results, sizes, data_types)
@@ -347,8 +196,17 @@ def main():
     # Аналізуємо продуктивність
     analyze_performance(results, sizes, data_types)
     
+    # Масштабування паралельного сортування за кількістю процесів
+    from parallel_sort import benchmark_worker_scaling
+    benchmark_worker_scaling(max(sizes))
+    
+    # Сортування записів за ключем: кешування ключів проти ключа при кожному порівнянні
+    from key_benchmark import benchmark_key_caching
+    benchmark_key_caching()
+    
     # Зберігаємо результати у CSV
     save_results_to_csv(results, sizes, data_types)
+    append_results(results, sizes, data_types)
     
     # Виводимо висновки
     print(f"\n" + "="*80)
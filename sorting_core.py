@@ -0,0 +1,1329 @@
+"""
+sorting_core.py - Спільне ядро порівняння алгоритмів сортування
+
+Містить реалізації всіх алгоритмів сортування, генерацію тестових даних,
+реєстр ALGORITHMS, порівняння з бюджетами часу та збереження у CSV.
+Модуль не залежить від matplotlib і імпортується за мілісекунди, тому
+його використовують обидві точки входу (sorting_comparison.py та
+sorting_comparison_alternative.py) і допоміжні модулі.
+"""
+
+from bisect import bisect_left, bisect_right
+from functools import partial
+from typing import Any, Callable, List, Optional
+import csv
+
+from benchmark import CSV_FIELDS, run_benchmark
+from datasets import generate, load_dataset
+
+# Функція обчислення ключа сортування (як у sorted())
+KeyFunc = Optional[Callable[[Any], Any]]
+
+def _sort_with_key(sort_func: Callable, arr: List[Any], key: KeyFunc, reverse: bool) -> List[Any]:
+    """
+    Сортування з ключем за схемою "прикрасити - відсортувати - зняти прикраси".
+    
+    Кожен ключ обчислюється рівно один раз. Елементи замінюються парами
+    (ключ, номер), тож порівнюються лише ключі, а номер розриває нічиї -
+    результат стабільний для будь-якого алгоритму (навіть для Shell sort).
+    При reverse=True рівні елементи зберігають вихідний порядок, як у sorted().
+    
+    Args:
+        sort_func: Сортувальник, що викликається без key/reverse
+        arr: Список елементів
+        key: Функція ключа (None - самі елементи)
+        reverse: Сортувати за спаданням
+        
+    Returns:
+        Відсортований список елементів
+    """
+    keys = arr if key is None else [key(item) for item in arr]
+    if reverse:
+        # За зростанням (ключ, -номер), потім розворот: ключі спадають, а рівні
+        # елементи йдуть у вихідному порядку
+        ordered = sort_func([(k, -i) for i, k in enumerate(keys)])
+        return [arr[-i] for _, i in reversed(ordered)]
+    ordered = sort_func([(k, i) for i, k in enumerate(keys)])
+    return [arr[i] for _, i in ordered]
+
+def insertion_sort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Алгоритм сортування вставками.
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(insertion_sort, arr, key, reverse)
+    
+    # Створюємо копію вхідного списку, щоб не змінювати оригінал
+    return _insertion_sort_core(arr.copy())
+
+def _insertion_sort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро insertion_sort: сортує переданий список на місці без копіювання.
+    """
+    insertion_sort_range(arr, 0, len(arr))
+    return arr
+
+def insertion_sort_range(arr: List[int], lo: int, hi: int) -> None:
+    """
+    Сортування вставками ділянки arr[lo:hi] на місці.
+    
+    Args:
+        arr: Список, ділянку якого потрібно відсортувати
+        lo: Початок ділянки (включно)
+        hi: Кінець ділянки (не включно)
+    """
+    # Проходимо по всіх елементах ділянки, починаючи з другого
+    for i in range(lo + 1, hi):
+        key = arr[i]
+        j = i - 1
+        # Поки не дійшли до початку ділянки і поточний елемент більший за ключ
+        while j >= lo and arr[j] > key:
+            # Зсуваємо елементи вправо
+            arr[j + 1] = arr[j]
+            j -= 1
+        # Вставляємо ключ у відповідну позицію
+        arr[j + 1] = key
+
+def binary_insertion_sort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Сортування вставками з бінарним пошуком позиції вставки.
+    
+    Позиція шукається через bisect за O(log n) порівнянь, а зсув елементів
+    виконується присвоєнням зрізу, тобто одним memmove замість циклу Python.
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(binary_insertion_sort, arr, key, reverse)
+    
+    return _binary_insertion_sort_core(arr.copy())
+
+def _binary_insertion_sort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро binary_insertion_sort: сортує переданий список на місці без копіювання.
+    """
+    for i in range(1, len(arr)):
+        key = arr[i]
+        # bisect_right ставить рівні елементи після наявних - сортування стабільне
+        pos = bisect_right(arr, key, 0, i)
+        if pos < i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
+    
+    return arr
+
+def ciura_gaps(n: int) -> List[int]:
+    """
+    Послідовність проміжків Ciura (продовжена множенням на 2.25) для списку довжини n.
+    
+    Args:
+        n: Довжина списку
+        
+    Returns:
+        Проміжки у спадному порядку, що закінчуються 1
+    """
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+    while gaps[-1] < n:
+        gaps.append(int(gaps[-1] * 2.25))
+    return [gap for gap in reversed(gaps) if gap < n] or [1]
+
+def tokuda_gaps(n: int) -> List[int]:
+    """
+    Послідовність проміжків Tokuda: h_k = ⌈(9^k - 4^k) / (5 · 4^(k-1))⌉.
+    
+    Args:
+        n: Довжина списку
+        
+    Returns:
+        Проміжки у спадному порядку, що закінчуються 1
+    """
+    gaps = []
+    k = 1
+    while True:
+        gap = -(-(9**k - 4**k) // (5 * 4**(k - 1)))
+        if gap >= n and gaps:
+            break
+        gaps.append(gap)
+        k += 1
+    return list(reversed(gaps))
+
+SHELL_GAP_SEQUENCES = {
+    "ciura": ciura_gaps,
+    "tokuda": tokuda_gaps,
+}
+
+def shell_sort(arr: List[Any], gaps="ciura", key: KeyFunc = None,
+               reverse: bool = False) -> List[Any]:
+    """
+    Сортування Шелла - сортування вставками з проміжками, що зменшуються.
+    
+    Args:
+        arr: Список елементів для сортування
+        gaps: Назва послідовності ("ciura", "tokuda") або власний список проміжків
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(partial(shell_sort, gaps=gaps), arr, key, reverse)
+    
+    return _shell_sort_core(arr.copy(), gaps)
+
+def _shell_sort_core(arr: List[Any], gaps="ciura") -> List[Any]:
+    """
+    Ядро shell_sort: сортує переданий список на місці без копіювання.
+    """
+    n = len(arr)
+    
+    if isinstance(gaps, str):
+        if gaps not in SHELL_GAP_SEQUENCES:
+            raise ValueError(f"Невідома послідовність проміжків: {gaps}")
+        gap_list = SHELL_GAP_SEQUENCES[gaps](n)
+    else:
+        gap_list = sorted(set(gaps), reverse=True)
+        if not gap_list or gap_list[-1] != 1:
+            raise ValueError(f"Послідовність проміжків має закінчуватися 1: {gaps}")
+    
+    for gap in gap_list:
+        # Сортування вставками для кожної підпослідовності з кроком gap
+        for i in range(gap, n):
+            key = arr[i]
+            j = i
+            while j >= gap and arr[j - gap] > key:
+                arr[j] = arr[j - gap]
+                j -= gap
+            arr[j] = key
+    
+    return arr
+
+def merge_sort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Алгоритм сортування злиттям.
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(merge_sort, arr, key, reverse)
+    
+    # Створюємо копію вхідного списку, щоб не змінювати оригінал
+    return _merge_sort_core(arr.copy())
+
+def _merge_sort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро merge_sort без копіювання входу: зрізи на кожному рівні рекурсії
+    вже є новими списками, тож повторно їх не копіюємо.
+    """
+    # Базовий випадок: якщо список має 1 або 0 елементів, він вже відсортований
+    if len(arr) <= 1:
+        return arr
+    
+    # Знаходимо середину списку
+    mid = len(arr) // 2
+    
+    # Рекурсивно сортуємо ліву та праву частини
+    left = _merge_sort_core(arr[:mid])
+    right = _merge_sort_core(arr[mid:])
+    
+    # Об'єднуємо ліву та праву частини
+    return merge(left, right)
+
+def merge(left: List[Any], right: List[Any], key: KeyFunc = None,
+          reverse: bool = False) -> List[Any]:
+    """
+    Допоміжна функція для злиття двох відсортованих списків.
+    
+    Args:
+        left: Перший відсортований список
+        right: Другий відсортований список
+        key: Функція ключа, за якою відсортовані списки (обчислюється один раз
+             для кожного елемента)
+        reverse: Списки відсортовані за спаданням
+        
+    Returns:
+        Об'єднаний відсортований список (рівні елементи лівого списку - першими)
+    """
+    if key is not None or reverse:
+        return _merge_keyed(left, right, key, reverse)
+    
+    result = []
+    i = j = 0
+    
+    # Порівнюємо елементи з обох списків і додаємо менший до результату
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+    
+    # Додаємо елементи, що залишилися (якщо є)
+    result.extend(left[i:])
+    result.extend(right[j:])
+    
+    return result
+
+def _merge_keyed(left: List[Any], right: List[Any], key: KeyFunc, reverse: bool) -> List[Any]:
+    """
+    Стабільне злиття за ключем: ключі обох списків обчислюються один раз.
+    """
+    left_keys = left if key is None else [key(item) for item in left]
+    right_keys = right if key is None else [key(item) for item in right]
+    result = []
+    i = j = 0
+    
+    while i < len(left) and j < len(right):
+        # Лівий елемент береться першим і при рівності ключів
+        if reverse:
+            take_left = not (left_keys[i] < right_keys[j])
+        else:
+            take_left = not (right_keys[j] < left_keys[i])
+        if take_left:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+    
+    result.extend(left[i:])
+    result.extend(right[j:])
+    return result
+
+def bottom_up_merge_sort(arr: List[Any], cutoff: int = 32, key: KeyFunc = None,
+                         reverse: bool = False) -> List[Any]:
+    """
+    Ітеративне (висхідне) сортування злиттям з одним допоміжним буфером.
+    
+    Замість рекурсії та зрізів на кожному рівні дані по черзі зливаються
+    з вхідного списку у попередньо виділений буфер і назад. Короткі ділянки
+    довжиною cutoff спочатку сортуються вставками, а злиття сусідніх ділянок
+    пропускається, якщо вони вже впорядковані одна відносно одної.
+    
+    Args:
+        arr: Список елементів для сортування
+        cutoff: Довжина ділянок, що сортуються вставками
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(partial(bottom_up_merge_sort, cutoff=cutoff), arr, key, reverse)
+    
+    return _bottom_up_merge_sort_core(arr.copy(), cutoff)
+
+def _bottom_up_merge_sort_core(src: List[Any], cutoff: int = 32) -> List[Any]:
+    """
+    Ядро bottom_up_merge_sort без копіювання входу: переданий список
+    слугує одним із двох буферів злиття, тож результатом може бути інший список.
+    """
+    n = len(src)
+    width = max(1, cutoff)
+    
+    # Сортуємо короткі ділянки вставками на місці
+    for lo in range(0, n, width):
+        insertion_sort_range(src, lo, min(lo + width, n))
+    
+    if width >= n:
+        return src
+    
+    # Єдиний допоміжний буфер на все сортування
+    dst = [None] * n
+    
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            
+            if mid >= hi or src[mid - 1] <= src[mid]:
+                # Ділянки вже впорядковані - лише переносимо їх у буфер
+                dst[lo:hi] = src[lo:hi]
+            else:
+                merge_into(src, dst, lo, mid, hi)
+        
+        # Міняємо ролі списку та буфера
+        src, dst = dst, src
+        width *= 2
+    
+    return src
+
+def merge_into(src: List[int], dst: List[int], lo: int, mid: int, hi: int) -> None:
+    """
+    Зливає відсортовані ділянки src[lo:mid] та src[mid:hi] у dst[lo:hi].
+    
+    Args:
+        src: Список з двома відсортованими ділянками
+        dst: Список, у який записується результат
+        lo: Початок лівої ділянки
+        mid: Початок правої ділянки
+        hi: Кінець правої ділянки
+    """
+    i, j, k = lo, mid, lo
+    
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+    
+    # Переносимо залишок однієї з ділянок
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+# Мінімальна кількість поспіль "перемог" однієї ділянки для переходу в галопуючий режим
+MIN_GALLOP = 7
+
+def compute_min_run(n: int) -> int:
+    """
+    Обчислює мінімальну довжину run'а (як у Timsort): значення з діапазону 32..64,
+    за якого n / min_run близьке до степеня двійки.
+    
+    Args:
+        n: Довжина списку
+        
+    Returns:
+        Мінімальна довжина run'а
+    """
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _gallop_right(key: int, arr: List[int], lo: int, hi: int) -> int:
+    """
+    Експоненційний пошук: перший індекс у arr[lo:hi], де елемент більший за key.
+    """
+    prev, cur = 0, 1
+    while lo + cur - 1 < hi and arr[lo + cur - 1] <= key:
+        prev, cur = cur, cur * 2
+    return bisect_right(arr, key, lo + prev, min(lo + cur, hi))
+
+def _gallop_left(key: int, arr: List[int], lo: int, hi: int) -> int:
+    """
+    Експоненційний пошук: перший індекс у arr[lo:hi], де елемент не менший за key.
+    """
+    prev, cur = 0, 1
+    while lo + cur - 1 < hi and arr[lo + cur - 1] < key:
+        prev, cur = cur, cur * 2
+    return bisect_left(arr, key, lo + prev, min(lo + cur, hi))
+
+def _count_run(arr: List[int], lo: int, n: int) -> int:
+    """
+    Знаходить природний run, що починається з lo, і повертає його кінець.
+    
+    Строго спадні run'и розвертаються на місці (строгість зберігає стабільність).
+    """
+    hi = lo + 1
+    if hi == n:
+        return hi
+    
+    if arr[hi] < arr[lo]:
+        while hi < n and arr[hi] < arr[hi - 1]:
+            hi += 1
+        arr[lo:hi] = arr[lo:hi][::-1]
+    else:
+        while hi < n and arr[hi] >= arr[hi - 1]:
+            hi += 1
+    
+    return hi
+
+def _merge_runs(arr: List[int], lo: int, mid: int, hi: int) -> None:
+    """
+    Стабільно зливає сусідні відсортовані ділянки arr[lo:mid] та arr[mid:hi] на місці.
+    
+    Елементи, які вже стоять на своїх місцях, відсікаються галопуючим пошуком;
+    під час злиття, коли одна ділянка "перемагає" MIN_GALLOP разів поспіль,
+    алгоритм переходить у галопуючий режим і переносить цілі блоки зрізами.
+    """
+    # Початок лівої ділянки, що не перевищує arr[mid], вже на місці
+    lo = _gallop_right(arr[mid], arr, lo, mid)
+    if lo == mid:
+        return
+    # Кінець правої ділянки, що не менший за arr[mid - 1], теж на місці
+    hi = _gallop_left(arr[mid - 1], arr, mid, hi)
+    
+    left = arr[lo:mid]
+    nl = len(left)
+    i, j, k = 0, mid, lo
+    min_gallop = MIN_GALLOP
+    
+    while i < nl and j < hi:
+        # Звичайний режим: порівнюємо по одному елементу
+        left_wins = right_wins = 0
+        while i < nl and j < hi:
+            if arr[j] < left[i]:
+                arr[k] = arr[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                arr[k] = left[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+            if left_wins >= min_gallop or right_wins >= min_gallop:
+                break
+        
+        # Галопуючий режим: переносимо блоки, доки вони достатньо довгі
+        while i < nl and j < hi:
+            end = _gallop_right(arr[j], left, i, nl)
+            left_count = end - i
+            arr[k:k + left_count] = left[i:end]
+            k += left_count
+            i = end
+            if i >= nl:
+                break
+            
+            end = _gallop_left(left[i], arr, j, hi)
+            right_count = end - j
+            arr[k:k + right_count] = arr[j:end]
+            k += right_count
+            j = end
+            
+            if left_count < MIN_GALLOP and right_count < MIN_GALLOP:
+                min_gallop += 1
+                break
+            min_gallop = max(1, min_gallop - 1)
+    
+    # Залишок правої ділянки вже на місці, переносимо залишок лівої
+    arr[k:k + nl - i] = left[i:]
+
+def _merge_at(arr: List[int], runs: List[List[int]], index: int) -> None:
+    """
+    Зливає run'и index та index + 1 зі стеку.
+    """
+    start, length = runs[index]
+    next_length = runs[index + 1][1]
+    _merge_runs(arr, start, start + length, start + length + next_length)
+    runs[index][1] = length + next_length
+    del runs[index + 1]
+
+def _merge_collapse(arr: List[int], runs: List[List[int]]) -> None:
+    """
+    Підтримує інваріанти стеку run'ів Timsort, щоб злиття були збалансованими.
+    """
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if (n > 0 and runs[n - 1][1] <= runs[n][1] + runs[n + 1][1]) or \
+           (n > 1 and runs[n - 2][1] <= runs[n - 1][1] + runs[n][1]):
+            if runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+        elif runs[n][1] > runs[n + 1][1]:
+            break
+        _merge_at(arr, runs, n)
+
+def adaptive_merge_sort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Адаптивне сортування злиттям природних run'ів.
+    
+    Список розбивається на вже впорядковані ділянки (неспадні та строго
+    спадні, які розвертаються). Короткі ділянки доповнюються до min_run
+    сортуванням вставками, а run'и зливаються за правилами стеку Timsort
+    з галопуючим режимом. Для відсортованих даних складність O(n).
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(adaptive_merge_sort, arr, key, reverse)
+    
+    return _adaptive_merge_sort_core(arr.copy())
+
+def _adaptive_merge_sort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро adaptive_merge_sort: сортує переданий список на місці без копіювання.
+    """
+    n = len(arr)
+    if n < 2:
+        return arr
+    
+    min_run = compute_min_run(n)
+    runs = []
+    lo = 0
+    
+    while lo < n:
+        hi = _count_run(arr, lo, n)
+        
+        # Короткі run'и доповнюємо до min_run сортуванням вставками
+        if hi - lo < min_run:
+            hi = min(lo + min_run, n)
+            insertion_sort_range(arr, lo, hi)
+        
+        runs.append([lo, hi - lo])
+        _merge_collapse(arr, runs)
+        lo = hi
+    
+    # Зливаємо всі run'и, що залишилися у стеку
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if index > 0 and runs[index - 1][1] < runs[index + 1][1]:
+            index -= 1
+        _merge_at(arr, runs, index)
+    
+    return arr
+
+# Ділянки, не довші за цей поріг, introsort сортує вставками
+INTROSORT_CUTOFF = 24
+
+# Від цієї довжини опорний елемент - "ninther" (медіана трьох медіан трійок)
+NINTHER_THRESHOLD = 128
+
+# Розмір блоку для блокового розбиття
+PARTITION_BLOCK = 64
+
+# Найбільша кількість переміщень у спробі часткового сортування вставками
+PARTIAL_INSERTION_LIMIT = 8
+
+def _sort3(arr: List[Any], a: int, b: int, c: int) -> None:
+    """
+    Впорядковує arr[a] <= arr[b] <= arr[c] обмінами.
+    """
+    if arr[b] < arr[a]:
+        arr[a], arr[b] = arr[b], arr[a]
+    if arr[c] < arr[b]:
+        arr[b], arr[c] = arr[c], arr[b]
+        if arr[b] < arr[a]:
+            arr[a], arr[b] = arr[b], arr[a]
+
+def _choose_pivot(arr: List[Any], lo: int, hi: int) -> bool:
+    """
+    Ставить опорний елемент на позицію lo: медіану трьох (lo, середина, hi - 1)
+    або для довгих ділянок - ninther (медіану медіан трьох трійок).
+    
+    Returns:
+        True, якщо медіана дорівнює сусідньому кандидату (ознака дублікатів)
+    """
+    mid = (lo + hi) // 2
+    if hi - lo > NINTHER_THRESHOLD:
+        _sort3(arr, lo, mid, hi - 1)
+        _sort3(arr, lo + 1, mid - 1, hi - 2)
+        _sort3(arr, lo + 2, mid + 1, hi - 3)
+        _sort3(arr, mid - 1, mid, mid + 1)
+        duplicates = not arr[mid - 1] < arr[mid] or not arr[mid] < arr[mid + 1]
+        arr[lo], arr[mid] = arr[mid], arr[lo]
+        return duplicates
+    _sort3(arr, mid, lo, hi - 1)
+    return not arr[mid] < arr[lo] or not arr[lo] < arr[hi - 1]
+
+def _block_partition(arr: List[Any], lo: int, hi: int) -> tuple:
+    """
+    Розбиття навколо опорного arr[lo]: ліворуч менші, праворуч не менші.
+    
+    Блокове розбиття (BlockQuickSort): у блоці з кожного краю спочатку
+    збираються позиції елементів не на своєму боці (генератором списку,
+    без розгалужень у циклі обміну), потім вони обмінюються парами.
+    Залишок коротший за два блоки розбивається звичайним проходом Гоара.
+    
+    Returns:
+        (позиція опорного елемента, чи ділянка вже була розбита без обмінів)
+    """
+    pivot = arr[lo]
+    first, last = lo + 1, hi
+    left = right = None
+    swapped = False
+    
+    while last - first >= 2 * PARTITION_BLOCK:
+        if left is None:
+            left = [first + i for i, x in enumerate(arr[first:first + PARTITION_BLOCK])
+                    if not x < pivot]
+        if right is None:
+            right = [last - 1 - i for i, x in enumerate(reversed(arr[last - PARTITION_BLOCK:last]))
+                     if x < pivot]
+        count = min(len(left), len(right))
+        for i, j in zip(left[:count], right[:count]):
+            arr[i], arr[j] = arr[j], arr[i]
+        swapped = swapped or count > 0
+        left, right = left[count:], right[count:]
+        if not left:
+            first += PARTITION_BLOCK
+            left = None
+        if not right:
+            last -= PARTITION_BLOCK
+            right = None
+    
+    i, j = first, last - 1
+    while True:
+        while i <= j and arr[i] < pivot:
+            i += 1
+        while i <= j and not arr[j] < pivot:
+            j -= 1
+        if i >= j:
+            break
+        arr[i], arr[j] = arr[j], arr[i]
+        swapped = True
+        i += 1
+        j -= 1
+    
+    mid = i - 1
+    arr[lo], arr[mid] = arr[mid], arr[lo]
+    return mid, not swapped
+
+def _partition_three_way(arr: List[Any], lo: int, hi: int) -> tuple:
+    """
+    Розбиття на три частини навколо опорного arr[lo] (прапор Дейкстри):
+    [lo, lt) < опорного, [lt, gt) == опорному, [gt, hi) > опорного.
+    
+    Рівні опорному елементи більше не обробляються, тож вхід з багатьма
+    дублікатами сортується за O(n · кількість різних значень).
+    """
+    pivot = arr[lo]
+    lt, i, gt = lo, lo + 1, hi
+    while i < gt:
+        if arr[i] < pivot:
+            arr[lt], arr[i] = arr[i], arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < arr[i]:
+            gt -= 1
+            arr[i], arr[gt] = arr[gt], arr[i]
+        else:
+            i += 1
+    return lt, gt
+
+def _partial_insertion_sort(arr: List[Any], lo: int, hi: int) -> bool:
+    """
+    Сортування вставками, що здається після PARTIAL_INSERTION_LIMIT переміщень.
+    
+    Returns:
+        True, якщо ділянку відсортовано повністю
+    """
+    moved = 0
+    for i in range(lo + 1, hi):
+        if arr[i] < arr[i - 1]:
+            value = arr[i]
+            j = i
+            while j > lo and value < arr[j - 1]:
+                arr[j] = arr[j - 1]
+                j -= 1
+            arr[j] = value
+            moved += i - j
+            if moved > PARTIAL_INSERTION_LIMIT:
+                return False
+    return True
+
+def heapsort_range(arr: List[Any], lo: int, hi: int) -> None:
+    """
+    Пірамідальне сортування ділянки arr[lo:hi] на місці: O(n log n) у найгіршому випадку.
+    """
+    n = hi - lo
+    
+    def sift_down(root: int, end: int) -> None:
+        value = arr[lo + root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and arr[lo + child] < arr[lo + child + 1]:
+                child += 1
+            if not value < arr[lo + child]:
+                break
+            arr[lo + root] = arr[lo + child]
+            root = child
+            child = 2 * root + 1
+        arr[lo + root] = value
+    
+    for start in range(n // 2 - 1, -1, -1):
+        sift_down(start, n)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        sift_down(0, end)
+
+def introsort_range(arr: List[Any], lo: int, hi: int, bad_allowed: Optional[int] = None) -> None:
+    """
+    Інтроспективне сортування (pdqsort) ділянки arr[lo:hi] на місці.
+    
+    Швидке сортування з опорним елементом "медіана трьох"/ninther і блоковим
+    розбиттям. Шаблони вхідних даних обробляються окремо:
+    - дублікати: якщо опорний дорівнює попередньому елементу (той не більший
+      за всю ділянку) або кандидатам, розбиття на три частини;
+    - вже впорядковані ділянки: розбиття без обмінів - спроба завершити
+      частковим сортуванням вставками (O(n) для відсортованих даних);
+    - погані розбиття (менша частина < 1/8, а для розбиття на три частини -
+      більша частина > 7/8): кілька елементів переставляються, щоб зламати
+      шаблон, а після log2(n) поганих розбиттів - heapsort.
+    Рекурсія йде лише в меншу частину, тож додаткова пам'ять O(log n).
+    
+    Args:
+        arr: Список, ділянку якого потрібно відсортувати
+        lo: Початок ділянки (включно)
+        hi: Кінець ділянки (не включно)
+        bad_allowed: Кількість поганих розбиттів до переходу на heapsort
+                     (за замовчуванням log2(n))
+    """
+    if bad_allowed is None:
+        bad_allowed = (hi - lo).bit_length()
+    
+    while hi - lo > INTROSORT_CUTOFF:
+        size = hi - lo
+        duplicates = _choose_pivot(arr, lo, hi)
+        
+        # Опорний не більший за попередній елемент (а той не більший за всю
+        # ділянку) або серед кандидатів є рівні - розбиття на три частини
+        if (lo > 0 and not arr[lo - 1] < arr[lo]) or duplicates:
+            lt, gt = _partition_three_way(arr, lo, hi)
+            # Нерівне розбиття на три частини теж погане: інакше рівні
+            # найменші кандидати відкидають лише кілька елементів за крок - O(n^2)
+            if max(lt - lo, hi - gt) > size - size // 8:
+                bad_allowed -= 1
+                if bad_allowed <= 0:
+                    heapsort_range(arr, lo, hi)
+                    return
+            if lt - lo < hi - gt:
+                introsort_range(arr, lo, lt, bad_allowed)
+                lo = gt
+            else:
+                introsort_range(arr, gt, hi, bad_allowed)
+                hi = lt
+            continue
+        
+        mid, already_partitioned = _block_partition(arr, lo, hi)
+        left_size, right_size = mid - lo, hi - mid - 1
+        
+        if left_size < size // 8 or right_size < size // 8:
+            bad_allowed -= 1
+            if bad_allowed <= 0:
+                heapsort_range(arr, lo, hi)
+                return
+            # Ламаємо шаблон: переставляємо елементи на чвертях обох частин
+            if left_size >= INTROSORT_CUTOFF:
+                quarter = left_size // 4
+                arr[lo], arr[lo + quarter] = arr[lo + quarter], arr[lo]
+                arr[mid - 1], arr[mid - quarter] = arr[mid - quarter], arr[mid - 1]
+            if right_size >= INTROSORT_CUTOFF:
+                quarter = right_size // 4
+                arr[mid + 1], arr[mid + 1 + quarter] = arr[mid + 1 + quarter], arr[mid + 1]
+                arr[hi - 1], arr[hi - quarter] = arr[hi - quarter], arr[hi - 1]
+        elif already_partitioned:
+            if _partial_insertion_sort(arr, lo, mid) and _partial_insertion_sort(arr, mid + 1, hi):
+                return
+        
+        if left_size < right_size:
+            introsort_range(arr, lo, mid, bad_allowed)
+            lo = mid + 1
+        else:
+            introsort_range(arr, mid + 1, hi, bad_allowed)
+            hi = mid
+    
+    insertion_sort_range(arr, lo, hi)
+
+def introsort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Інтроспективне сортування (pdqsort): O(n log n) у найгіршому випадку,
+    сортування на місці з O(log n) додаткової пам'яті.
+    
+    Нестабільне; з key або reverse елементи декоруються номерами, тож
+    результат стабільний.
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        return _sort_with_key(introsort, arr, key, reverse)
+    
+    return _introsort_core(arr.copy())
+
+def _introsort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро introsort: сортує переданий список на місці без копіювання.
+    """
+    introsort_range(arr, 0, len(arr))
+    return arr
+
+def counting_sort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Сортування підрахунком для цілих чисел з невеликим діапазоном значень.
+    
+    Складність O(n + k), де k = max - min + 1; пам'ять на лічильники O(k).
+    
+    Args:
+        arr: Список цілих чисел (або елементів з цілочисельним ключем) для сортування
+        key: Функція цілочисельного ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if not arr:
+        return []
+    
+    if key is not None or reverse:
+        keys = arr if key is None else [key(item) for item in arr]
+        return _counting_sort_keyed(arr, keys, reverse)
+    
+    low, high = min(arr), max(arr)
+    counts = [0] * (high - low + 1)
+    
+    # Рахуємо кількість входжень кожного значення
+    for value in arr:
+        counts[value - low] += 1
+    
+    # Відтворюємо значення у порядку зростання
+    result = []
+    for offset, count in enumerate(counts):
+        if count:
+            result.extend([low + offset] * count)
+    
+    return result
+
+def _counting_sort_keyed(arr: List[Any], keys: List[int], reverse: bool) -> List[Any]:
+    """
+    Стабільне сортування підрахунком елементів за готовими цілочисельними ключами.
+    """
+    low, high = min(keys), max(keys)
+    counts = [0] * (high - low + 1)
+    for k in keys:
+        counts[k - low] += 1
+    
+    # Початкова позиція кожного значення ключа (для reverse - від більших до менших)
+    starts = [0] * len(counts)
+    total = 0
+    for offset in (reversed(range(len(counts))) if reverse else range(len(counts))):
+        starts[offset] = total
+        total += counts[offset]
+    
+    # Розставляємо елементи у порядку появи - сортування стабільне
+    result = [None] * len(arr)
+    for k, item in zip(keys, arr):
+        position = starts[k - low]
+        result[position] = item
+        starts[k - low] = position + 1
+    return result
+
+def radix_sort(arr: List[Any], digit_bits: int = 8, key: KeyFunc = None,
+               reverse: bool = False) -> List[Any]:
+    """
+    Порозрядне LSD-сортування цілих чисел.
+    
+    Значення зсуваються на мінімум, тому від'ємні числа сортуються коректно,
+    а кількість проходів визначається фактичним діапазоном ключів.
+    
+    Args:
+        arr: Список цілих чисел (або елементів з цілочисельним ключем) для сортування
+        digit_bits: Ширина розряду у бітах (кількість кошиків - 2**digit_bits)
+        key: Функція цілочисельного ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if key is not None or reverse:
+        keys = arr if key is None else [key(item) for item in arr]
+        return _radix_sort_keyed(arr, keys, digit_bits, reverse)
+    
+    return _radix_sort_core(arr.copy(), digit_bits)
+
+def _radix_sort_core(result: List[int], digit_bits: int = 8) -> List[int]:
+    """
+    Ядро radix_sort без копіювання входу (кожен прохід будує новий список).
+    """
+    if len(result) <= 1:
+        return result
+    
+    low = min(result)
+    span = max(result) - low
+    mask = (1 << digit_bits) - 1
+    shift = 0
+    
+    while True:
+        # Стабільно розкладаємо елементи по кошиках поточного розряду
+        buckets = [[] for _ in range(mask + 1)]
+        for value in result:
+            buckets[((value - low) >> shift) & mask].append(value)
+        result = [value for bucket in buckets for value in bucket]
+        
+        shift += digit_bits
+        if not span >> shift:
+            break
+    
+    return result
+
+def _radix_sort_keyed(arr: List[Any], keys: List[int], digit_bits: int, reverse: bool) -> List[Any]:
+    """
+    Порозрядне сортування елементів за готовими цілочисельними ключами.
+    
+    Переставляються номери елементів, тож ключі не обчислюються повторно на
+    кожному проході. Для reverse вхід обходиться з кінця, а результат
+    розвертається - рівні елементи зберігають вихідний порядок.
+    """
+    n = len(arr)
+    order = list(range(n - 1, -1, -1)) if reverse else list(range(n))
+    if n > 1:
+        low = min(keys)
+        span = max(keys) - low
+        mask = (1 << digit_bits) - 1
+        shift = 0
+        
+        while True:
+            buckets = [[] for _ in range(mask + 1)]
+            for i in order:
+                buckets[((keys[i] - low) >> shift) & mask].append(i)
+            order = [i for bucket in buckets for i in bucket]
+            
+            shift += digit_bits
+            if not span >> shift:
+                break
+    
+    if reverse:
+        order.reverse()
+    return [arr[i] for i in order]
+
+# Сортування підрахунком обирається, якщо діапазон значень не більший за
+# COUNTING_RANGE_FACTOR * n
+COUNTING_RANGE_FACTOR = 4
+
+def integer_sort(arr: List[Any], digit_bits: int = 8, key: KeyFunc = None,
+                 reverse: bool = False) -> List[Any]:
+    """
+    Сортування цілих чисел з автоматичним вибором між підрахунком та порозрядним.
+    
+    Args:
+        arr: Список цілих чисел (або елементів з цілочисельним ключем) для сортування
+        digit_bits: Ширина розряду для порозрядного сортування
+        key: Функція цілочисельного ключа (обчислюється один раз для кожного елемента)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    if not arr:
+        return []
+    
+    if key is not None or reverse:
+        # Ключі обчислюються один раз і для вибору алгоритму, і для сортування
+        keys = arr if key is None else [key(item) for item in arr]
+        if max(keys) - min(keys) + 1 <= COUNTING_RANGE_FACTOR * len(arr):
+            return _counting_sort_keyed(arr, keys, reverse)
+        return _radix_sort_keyed(arr, keys, digit_bits, reverse)
+    
+    if max(arr) - min(arr) + 1 <= COUNTING_RANGE_FACTOR * len(arr):
+        return counting_sort(arr)
+    return radix_sort(arr, digit_bits)
+
+def _integer_sort_core(arr: List[int], digit_bits: int = 8) -> List[int]:
+    """
+    Ядро integer_sort без копіювання входу (counting_sort і так не копіює).
+    """
+    if not arr:
+        return arr
+    if max(arr) - min(arr) + 1 <= COUNTING_RANGE_FACTOR * len(arr):
+        return counting_sort(arr)
+    return _radix_sort_core(arr, digit_bits)
+
+def timsort(arr: List[Any], key: KeyFunc = None, reverse: bool = False) -> List[Any]:
+    """
+    Вбудований алгоритм сортування Python (Timsort).
+    
+    Args:
+        arr: Список елементів для сортування
+        key: Функція ключа (sorted() сам обчислює ключі один раз)
+        reverse: Сортувати за спаданням (зі збереженням стабільності)
+        
+    Returns:
+        Відсортований список
+    """
+    # sorted() сам створює новий список, тож оригінал не змінюється
+    return sorted(arr, key=key, reverse=reverse)
+
+def _timsort_core(arr: List[Any]) -> List[Any]:
+    """
+    Ядро timsort: сортує переданий список на місці (list.sort) без копіювання.
+    """
+    arr.sort()
+    return arr
+
+def generate_data(size: int, data_type: str = "random", typed: Optional[str] = None,
+                  seed: Optional[int] = None) -> List[int]:
+    """
+    Генерує тестові дані різних типів.
+    
+    Args:
+        size: Розмір списку
+        data_type: Тип даних (один з datasets.DATA_TYPES: "random", "sorted", "reversed",
+                   "partially_sorted", "few_unique", "sawtooth", "organ_pipe", "zipf",
+                   "sorted_random_tail")
+        typed: None для списку Python, "array" для array('q') або "numpy" для numpy.ndarray int64
+        seed: Зерно генератора для відтворюваних даних (None - недетерміновано)
+        
+    Returns:
+        Список цілих чисел (або типізований буфер, якщо вказано typed)
+    """
+    # Типізовані буфери генеруються напряму, без проміжного списку
+    if typed is not None:
+        from typed_sorting import generate_typed_data
+        return generate_typed_data(size, data_type, typed, seed)
+    
+    # Генерація векторизована (якщо є numpy) і детермінована при заданому seed
+    return generate(size, data_type, seed)
+
+def measure_time(func, data, runs=3):
+    """
+    Вимірює час виконання функції.
+    
+    Тонка обгортка над benchmark.run_benchmark для простих вимірювань.
+    
+    Args:
+        func: Функція для вимірювання
+        data: Вхідні дані
+        runs: Мінімальна кількість повторів
+        
+    Returns:
+        Медіанний час виконання (в секундах)
+    """
+    return run_benchmark(func, data, min_repeats=runs, warmup=min(1, runs - 1)).median
+
+# Алгоритми для порівняння: ключ у результатах -> (функція, назва, колонка CSV)
+ALGORITHMS = {
+    "insertion": (insertion_sort, "Insertion", "insertion_sort"),
+    "binary_insertion": (binary_insertion_sort, "Binary Ins.", "binary_insertion_sort"),
+    "shell": (shell_sort, "Shell", "shell_sort"),
+    "merge": (merge_sort, "Merge", "merge_sort"),
+    "bottom_up": (bottom_up_merge_sort, "Bottom-up", "bottom_up_merge_sort"),
+    "adaptive": (adaptive_merge_sort, "Adaptive", "adaptive_merge_sort"),
+    "introsort": (introsort, "Introsort", "introsort"),
+    "radix": (radix_sort, "Radix", "radix_sort"),
+    # Підрахунок лише для малих діапазонів, інакше порозрядне: counting_sort на
+    # випадкових даних 0..1M виділяв би мільйон лічильників навіть для n=100
+    "integer": (integer_sort, "Integer", "integer_sort"),
+    "timsort": (timsort, "Timsort", "timsort"),
+}
+
+# Ядра алгоритмів без захисної копії входу: сортують список, яким володіє
+# виклик, і повертають результат. Для вимірювання часу копія готується
+# поза вимірюваною ділянкою (див. benchmark_sorter)
+SORT_CORES = {
+    "insertion": _insertion_sort_core,
+    "binary_insertion": _binary_insertion_sort_core,
+    "shell": _shell_sort_core,
+    "merge": _merge_sort_core,
+    "bottom_up": _bottom_up_merge_sort_core,
+    "adaptive": _adaptive_merge_sort_core,
+    "introsort": _introsort_core,
+    "radix": _radix_sort_core,
+    "integer": _integer_sort_core,
+    "timsort": _timsort_core,
+}
+
+def _copy_input(data: List[Any]) -> List[Any]:
+    return data.copy()
+
+def benchmark_sorter(name: str, data: List[int], **kwargs):
+    """
+    Вимірює алгоритм з ALGORITHMS без копіювання входу у вимірюваній ділянці.
+    
+    Копія даних для кожного виклику готується у setup (поза таймером), а
+    вимірюється ядро з SORT_CORES, яке сортує саме цю копію.
+    
+    Args:
+        name: Ключ алгоритму в ALGORITHMS
+        data: Вхідні дані
+        **kwargs: Додаткові параметри run_benchmark
+        
+    Returns:
+        BenchmarkResult
+    """
+    return run_benchmark(SORT_CORES[name], data, setup=_copy_input, algorithm=name, **kwargs)
+
+# Бюджет часу (у секундах) на одне вимірювання. Якщо алгоритм його перевищив,
+# більші розміри цього типу даних для нього пропускаються
+DEFAULT_TIME_BUDGET = 1.0
+TIME_BUDGETS = {}
+
+# Зерно тестових даних: однакові набори між запусками для порівнянь з історією
+DATA_SEED = 42
+
+# Сортування без порівнянь елементів: лічильник порівнянь для них не ведеться
+NON_COMPARISON_ALGORITHMS = {"radix", "integer"}
+
+# Алгоритми, реалізовані у C: записи елементів не видно з Python
+BUILTIN_ALGORITHMS = {"timsort"}
+
+def attach_counters(result, name: str, data: List[int]):
+    """
+    Доповнює результат лічильниками порівнянь, записів та пікової пам'яті.
+    
+    Лічильники вимірюються окремими запусками (instrumentation.py) після
+    вимірювання часу, тому на час не впливають.
+    
+    Args:
+        result: BenchmarkResult для комірки
+        name: Ключ алгоритму в ALGORITHMS
+        data: Вхідні дані комірки
+        
+    Returns:
+        Той самий BenchmarkResult
+    """
+    from instrumentation import measure_operations
+    
+    ops = measure_operations(ALGORITHMS[name][0], data,
+                             count_comparisons=name not in NON_COMPARISON_ALGORITHMS,
+                             count_moves=name not in BUILTIN_ALGORITHMS)
+    result.comparisons = ops["comparisons"]
+    result.moves = ops["moves"]
+    result.peak_memory = ops["peak_memory"]
+    return result
+
+def attach_profile(result, name: str, data: List[int], config):
+    """
+    Профілює комірку та доповнює результат часом фаз (рекурсія, злиття, копіювання).
+    
+    Профіль (.pstats та .collapsed) записується у config.output_dir. Час фаз -
+    частки з інструментованого запуску (profiling.py), помножені на медіану
+    result, тому вимірювання часу комірки не змінюється. Частки вимірюються
+    на тому самому ядрі з SORT_CORES, що й медіана (benchmark_sorter), з
+    копією входу поза вимірюваною ділянкою.
+    
+    Args:
+        result: BenchmarkResult для комірки
+        name: Ключ алгоритму в ALGORITHMS
+        data: Вхідні дані комірки
+        config: profiling.ProfileConfig
+        
+    Returns:
+        Шлях до файлів профілю без розширення
+    """
+    from profiling import measure_phases, profile_cell
+    
+    func = ALGORITHMS[name][0]
+    base = profile_cell(func, data, config, name, result.data_type)
+    if name not in BUILTIN_ALGORITHMS:
+        shares = measure_phases(SORT_CORES[name], data, setup=_copy_input)
+        result.phase_recursion = shares["recursion"] * result.median
+        result.phase_merge = shares["merge"] * result.median
+        result.phase_copy = shares["copy"] * result.median
+    return base
+
+def compare_sorting_algorithms(sizes, data_types, time_budgets=None, seed=None, counters=False,
+                               profile=None):
+    """
+    Порівнює алгоритми сортування за часом на різних типах даних.
+    
+    Замість фіксованого обмеження розміру кожен алгоритм має бюджет часу:
+    щойно вимірювання перевищує бюджет, алгоритм зупиняється для більших
+    розмірів цього типу даних (у результатах - None).
+    
+    Args:
+        sizes: Список розмірів вхідних даних
+        data_types: Список типів даних
+        time_budgets: Словник {алгоритм: бюджет у секундах}, що доповнює TIME_BUDGETS
+        seed: Зерно даних; якщо вказано, набори беруться з дискового кешу (datasets.load_dataset),
+              тож повторні запуски вимірюють ті самі дані без повторної генерації
+        counters: Додатково рахувати порівняння, записи та пікову пам'ять (attach_counters)
+        profile: profiling.ProfileConfig - профілювати вибрані комірки (attach_profile);
+                 None - режим профілювання вимкнено
+        
+    Returns:
+        Кортеж (results, sizes): results - словник {data_type: {алгоритм:
+        [BenchmarkResult або None, ...]}}, sizes - розміри у порядку результатів
+    """
+    budgets = {**TIME_BUDGETS, **(time_budgets or {})}
+    results = {data_type: {name: [] for name in ALGORITHMS} for data_type in data_types}
+    
+    # Алгоритми, що вичерпали бюджет часу, окремо для кожного типу даних
+    exhausted = {data_type: set() for data_type in data_types}
+    
+    print("🔄 Початок порівняння алгоритмів сортування...")
+    print("=" * 60)
+    
+    for size in sizes:
+        print(f"\n📊 Тестування для розміру {size:,} елементів:")
+        print("-" * 45)
+        
+        for data_type in data_types:
+            if seed is None:
+                data = generate_data(size, data_type)
+            else:
+                data = load_dataset(size, data_type, seed).tolist()
+            print(f"  📈 Тип даних: {data_type}")
+            
+            for name, (func, label, _) in ALGORITHMS.items():
+                if name in exhausted[data_type]:
+                    results[data_type][name].append(None)
+                    continue
+                
+                print(f"    ⏱️  Вимірюємо {label}...", end=" ")
+                result = benchmark_sorter(name, data, data_type=data_type)
+                results[data_type][name].append(result)
+                elapsed = result.median
+                print(f"{elapsed:.6f}s ± {result.iqr / 2:.6f}s")
+                
+                if counters:
+                    attach_counters(result, name, data)
+                
+                if profile is not None and profile.matches(name, data_type, size):
+                    base = attach_profile(result, name, data, profile)
+                    print(f"    🔥 Профіль: {base}.pstats, {base}.collapsed")
+                
+                budget = budgets.get(name, DEFAULT_TIME_BUDGET)
+                if elapsed > budget:
+                    exhausted[data_type].add(name)
+                    print(f"    ⏭️  {label}: {elapsed:.3f}s > бюджет {budget:.1f}s - "
+                          f"більші розміри {data_type} пропускаються")
+    
+    return results, sizes
+
+def save_results_to_csv(results, sizes, data_types, filename="sorting_results.csv"):
+    """
+    Зберігає результати у CSV файл.
+    
+    Кожен рядок - одна комірка (тип даних, розмір, алгоритм) зі статистиками
+    BenchmarkResult. Пропущені через бюджет часу комірки не записуються.
+    
+    Args:
+        results: Словник з результатами
+        sizes: Список розмірів
+        data_types: Список типів даних
+        filename: Ім'я файлу для збереження
+    """
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+        
+        writer.writeheader()
+        for data_type in data_types:
+            for i in range(len(sizes)):
+                for name, (_, _, column) in ALGORITHMS.items():
+                    result = results[data_type][name][i]
+                    if result is None:
+                        continue
+                    row = result.to_dict()
+                    row['algorithm'] = column
+                    writer.writerow(row)
+    
+    print(f"\n💾 Результати збережено у файл: {filename}")
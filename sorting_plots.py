@@ -0,0 +1,125 @@
+"""
+sorting_plots.py - Графічна візуалізація результатів порівняння (matplotlib)
+
+Необов'язковий модуль: sorting_comparison.py завантажує його лише тоді,
+коли потрібні графіки, тому ядро працює і без matplotlib.
+
+Встановлення matplotlib:
+pip3 install matplotlib
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from benchmark import medians
+from sorting_core import ALGORITHMS
+
+def plot_results(results, sizes, data_types):
+    """
+    Створює графічну візуалізацію результатів.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    axes = axes.flatten()
+    
+    colors = {
+        'insertion': '#FF6B6B',         # Червоний
+        'binary_insertion': '#F783AC',  # Рожевий
+        'shell': '#FFD43B',             # Жовтий
+        'merge': '#4ECDC4',             # Бірюзовий
+        'bottom_up': '#96CEB4',         # Зелений
+        'adaptive': '#2B8A3E',          # Темно-зелений
+        'introsort': '#E64980',         # Малиновий
+        'radix': '#FFA94D',             # Помаранчевий
+        'integer': '#B197FC',           # Фіолетовий
+        'timsort': '#45B7D1'            # Синій
+    }
+    
+    for i, data_type in enumerate(data_types):
+        ax = axes[i]
+        
+        for name, (_, label, _) in ALGORITHMS.items():
+            # Фільтруємо None значення (алгоритм вичерпав бюджет часу)
+            points = [(s, r) for s, r in zip(sizes, results[data_type][name]) if r is not None]
+            if not points:
+                continue
+            
+            # Медіана з довірчим інтервалом у вигляді "вусів"
+            valid_sizes = [s for s, _ in points]
+            valid_times = [r.median for _, r in points]
+            errors = [[r.median - r.ci_low for _, r in points],
+                      [r.ci_high - r.median for _, r in points]]
+            ax.errorbar(valid_sizes, valid_times, yerr=errors, fmt='o-', label=label,
+                        color=colors[name], linewidth=2, markersize=6, capsize=3)
+        
+        # Налаштування графіка
+        ax.set_title(f'Час сортування для {data_type} даних', fontsize=14, fontweight='bold')
+        ax.set_xlabel("Розмір списку", fontsize=12)
+        ax.set_ylabel("Час виконання (секунди)", fontsize=12)
+        ax.legend(fontsize=10)
+        ax.grid(True, alpha=0.3)
+        ax.set_yscale('log')  # Логарифмічна шкала для кращого відображення
+        
+        # Форматування осей
+        ax.ticklabel_format(style='plain', axis='x')
+        
+        # Додаємо анотації для найкращих результатів
+        timsort_points = [(t, s) for s, t in zip(sizes, medians(results[data_type]["timsort"]))
+                          if t is not None]
+        if not timsort_points:
+            continue
+        best_time, best_size = min(timsort_points)
+        ax.annotate(f'Найкращий: {best_time:.6f}s', 
+                   xy=(best_size, best_time),
+                   xytext=(10, 10), textcoords='offset points',
+                   bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
+                   fontsize=8)
+    
+    plt.tight_layout(pad=3.0)
+    plt.savefig("sorting_comparison_with_plots.png", dpi=300, bbox_inches='tight')
+    plt.show()
+    
+    print(f"\n📊 Графіки збережено у файл: sorting_comparison_with_plots.png")
+
+def create_comparison_chart(results, sizes, data_types):
+    """
+    Створює додатковий графік порівняння швидкості.
+    """
+    fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+    
+    # Обчислюємо середній speedup Timsort vs Merge Sort
+    speedups = []
+    labels = []
+    
+    for data_type in data_types:
+        merge_times = medians(results[data_type]["merge"])
+        timsort_times = medians(results[data_type]["timsort"])
+        
+        avg_speedup = np.mean([m/t for m, t in zip(merge_times, timsort_times)
+                               if m is not None and t is not None])
+        speedups.append(avg_speedup)
+        labels.append(data_type.replace('_', ' ').title())
+    
+    # Створюємо стовпчасту діаграму
+    bars = ax.bar(labels, speedups, color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99'])
+    
+    # Додаємо значення на стовпчики
+    for bar, speedup in zip(bars, speedups):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                f'{speedup:.2f}x', ha='center', va='bottom', fontweight='bold')
+    
+    ax.set_title('Середнє прискорення Timsort порівняно з Merge Sort', 
+                fontsize=16, fontweight='bold', pad=20)
+    ax.set_ylabel('Коефіцієнт прискорення', fontsize=12)
+    ax.set_xlabel('Тип даних', fontsize=12)
+    ax.grid(True, alpha=0.3, axis='y')
+    
+    # Додаємо горизонтальну лінію на рівні 1.0
+    ax.axhline(y=1, color='red', linestyle='--', alpha=0.7, label='Однакова швидкість')
+    ax.legend()
+    
+    plt.tight_layout()
+    plt.savefig("timsort_speedup_comparison.png", dpi=300, bbox_inches='tight')
+    plt.show()
+    
+    print(f"📈 Графік прискорення збережено у файл: timsort_speedup_comparison.png")
@@ -0,0 +1,246 @@
+"""
+sweep.py - Паралельний планувальник повного прогону бенчмарків
+
+Кожна комірка (алгоритм, тип даних, розмір) вимірюється окремо у пулі
+процесів. Особливості:
+- кожен процес-обробник закріплюється за окремим ядром (os.sched_setaffinity),
+  щоб одночасні вимірювання менше заважали одне одному
+- у межах пари (алгоритм, тип даних) розміри виконуються за зростанням, щоб
+  діяв бюджет часу; серед готових комірок першою запускається найдовша
+  (оцінка береться з історії або екстраполюється з меншого розміру)
+- результати кожної комірки одразу дописуються у CSV та історію
+- перерваний прогін можна продовжити з місця зупинки (--resume)
+- дані беруться з дискового кешу (datasets.load_dataset) за зерном --seed:
+  обробники читають один і той самий файл через mmap, а не генерують дані
+
+Використання:
+python3 sweep.py --jobs 4
+python3 sweep.py --jobs 4 --resume            # продовжити останній запуск
+python3 sweep.py --resume 1a2b3c4d5e6f        # продовжити конкретний запуск
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import Queue
+from typing import Dict, List, Optional, Tuple
+
+from benchmark import CSV_FIELDS, BenchmarkResult
+from benchmark_history import (
+    HISTORY_FILE, METADATA_KEYS, append_record, load_history, run_metadata, select_run,
+)
+from datasets import DATA_TYPES, load_dataset
+from profiling import add_profile_arguments, config_from_args
+from sorting_comparison_alternative import print_results_table
+from sorting_core import (
+    ALGORITHMS, DATA_SEED, DEFAULT_TIME_BUDGET, TIME_BUDGETS, attach_counters, attach_profile,
+    benchmark_sorter,
+)
+
+# Алгоритми з квадратичною складністю (для оцінки тривалості комірок)
+QUADRATIC_ALGORITHMS = {"insertion", "binary_insertion"}
+
+Cell = Tuple[str, str, int]
+
+def _pin_worker(cpu_queue) -> None:
+    """
+    Ініціалізатор процесу-обробника: закріплює його за одним ядром.
+    """
+    cpu = cpu_queue.get()
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+def _run_cell(name: str, data_type: str, size: int, seed: int,
+              counters: bool = False, profile=None) -> BenchmarkResult:
+    """
+    Вимірює одну комірку (виконується в обробнику).
+    """
+    data = load_dataset(size, data_type, seed).tolist()
+    result = benchmark_sorter(name, data, data_type=data_type)
+    if counters:
+        attach_counters(result, name, data)
+    if profile is not None and profile.matches(name, data_type, size):
+        attach_profile(result, name, data, profile)
+    return result
+
+def available_cpus() -> List[int]:
+    """
+    Повертає список ядер, доступних процесу.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def estimate_cost(cell: Cell, known: Dict[Cell, float],
+                  previous: Optional[Tuple[int, float]] = None) -> float:
+    """
+    Оцінює тривалість одного виклику сортування для комірки.
+
+    Args:
+        cell: (алгоритм, тип даних, розмір)
+        known: Відомі медіани з історії
+        previous: (розмір, медіана) попередньої комірки того ж ланцюжка
+
+    Returns:
+        Оцінка часу у секундах
+    """
+    if cell in known:
+        return known[cell]
+    name, _, size = cell
+    exponent = 2.0 if name in QUADRATIC_ALGORITHMS else 1.15
+    if previous is not None and previous[0]:
+        previous_size, previous_time = previous
+        return previous_time * (size / previous_size) ** exponent
+    return 1e-7 * size ** exponent
+
+def run_sweep(sizes: List[int], data_types: List[str], jobs: Optional[int] = None,
+              algorithms: Optional[List[str]] = None, time_budgets: Optional[dict] = None,
+              csv_file: str = "sorting_results.csv", history_file: str = HISTORY_FILE,
+              resume: Optional[str] = None, seed: int = DATA_SEED, counters: bool = False,
+              profile=None):
+    """
+    Виконує прогін усіх комірок у пулі процесів.
+
+    Args:
+        sizes: Список розмірів
+        data_types: Список типів даних
+        jobs: Кількість процесів (за замовчуванням - кількість доступних ядер)
+        algorithms: Ключі алгоритмів з ALGORITHMS (за замовчуванням усі)
+        time_budgets: Словник {алгоритм: бюджет у секундах}, що доповнює TIME_BUDGETS
+        csv_file: CSV, у який дописуються результати
+        history_file: Файл історії
+        resume: "latest" або ідентифікатор запуску, який потрібно продовжити
+        seed: Зерно тестових даних (при продовженні береться із запуску)
+        counters: Додатково рахувати порівняння, записи та пікову пам'ять
+        profile: profiling.ProfileConfig для профілювання вибраних комірок (None - вимкнено)
+
+    Returns:
+        (results, sizes) у форматі compare_sorting_algorithms
+    """
+    sizes = sorted(sizes)
+    algorithms = algorithms or list(ALGORITHMS)
+    budgets = {**TIME_BUDGETS, **(time_budgets or {})}
+    cpus = available_cpus()
+    jobs = jobs or len(cpus)
+
+    records = load_history(history_file)
+
+    # Відомі медіани з історії для оцінки тривалості (останнє значення перемагає)
+    known = {(r["algorithm"], r["data_type"], r["size"]): r["median"] for r in records}
+
+    done: Dict[Cell, BenchmarkResult] = {}
+    if resume:
+        run_records = select_run(records, None if resume == "latest" else resume)
+        if not run_records:
+            raise ValueError(f"Запуск для продовження не знайдено: {resume}")
+        metadata = {key: run_records[0][key] for key in METADATA_KEYS}
+        seed = run_records[0].get("seed", seed)
+        for record in run_records:
+            done[(record["algorithm"], record["data_type"], record["size"])] = \
+                BenchmarkResult.from_dict(record)
+        print(f"♻️  Продовжуємо запуск {metadata['run_id']}: вже виміряно {len(done)} комірок")
+    else:
+        metadata = run_metadata()
+    metadata["seed"] = seed
+
+    results = {data_type: {name: [None] * len(sizes) for name in algorithms} for data_type in data_types}
+    ready: Dict[Cell, float] = {}
+
+    def advance(name: str, data_type: str, index: int) -> None:
+        """
+        Додає до черги наступну невиміряну комірку ланцюжка (або зупиняє його за бюджетом).
+        """
+        previous = None
+        while index < len(sizes):
+            cell = (name, data_type, sizes[index])
+            if cell not in done:
+                ready[cell] = estimate_cost(cell, known, previous)
+                return
+            result = done[cell]
+            results[data_type][name][index] = result
+            budget = budgets.get(name, DEFAULT_TIME_BUDGET)
+            if result.median > budget:
+                print(f"    ⏭️  {name}/{data_type}: {result.median:.3f}s > бюджет {budget:.1f}s - "
+                      f"більші розміри пропускаються")
+                return
+            previous = (sizes[index], result.median)
+            index += 1
+
+    for name in algorithms:
+        for data_type in data_types:
+            advance(name, data_type, 0)
+
+    # Верхня межа: частина комірок може бути пропущена через бюджет часу
+    total = len(algorithms) * len(data_types) * len(sizes)
+    print(f"🚀 Прогін: {jobs} процесів, ядра {cpus}, запуск {metadata['run_id']}")
+
+    # Кожен обробник отримує своє ядро з черги (по колу, якщо процесів більше за ядра)
+    cpu_queue = Queue()
+    for i in range(jobs):
+        cpu_queue.put(cpus[i % len(cpus)] if cpus else None)
+
+    write_header = not (resume and os.path.exists(csv_file))
+    with open(csv_file, 'a' if not write_header else 'w', newline='', encoding='utf-8') as csvfile, \
+            ProcessPoolExecutor(max_workers=jobs, initializer=_pin_worker,
+                                initargs=(cpu_queue,)) as executor:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        pending = {}
+        while ready or pending:
+            # Заповнюємо вільні обробники найдовшими готовими комірками
+            while ready and len(pending) < jobs:
+                cell = max(ready, key=ready.get)
+                del ready[cell]
+                pending[executor.submit(_run_cell, *cell, seed, counters, profile)] = cell
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, data_type, size = cell = pending.pop(future)
+                result = future.result()
+                done[cell] = result
+
+                # Потоково записуємо результат у CSV та історію
+                row = result.to_dict()
+                row['algorithm'] = ALGORITHMS[name][2]
+                writer.writerow(row)
+                csvfile.flush()
+                append_record(result, metadata, history_file)
+
+                print(f"  ✅ [{len(done)}/{total}] {name}/{data_type}/{size:,}: {result.median:.6f}s")
+                advance(name, data_type, sizes.index(size))
+
+    return results, sizes
+
+def main():
+    """
+    Головна функція програми.
+    """
+    parser = argparse.ArgumentParser(description="Паралельний прогін бенчмарків сортування")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Кількість процесів (за замовчуванням - кількість ядер)")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100, 500, 1000, 5000, 10000, 50000, 100000])
+    parser.add_argument("--data-types", nargs="+", choices=DATA_TYPES,
+                        default=["random", "sorted", "reversed", "partially_sorted"])
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=None)
+    parser.add_argument("--csv", default="sorting_results.csv", help="Файл CSV з результатами")
+    parser.add_argument("--history", default=HISTORY_FILE, help="Файл історії (JSONL)")
+    parser.add_argument("--resume", nargs="?", const="latest", default=None,
+                        help="Продовжити перерваний запуск (останній або за ідентифікатором)")
+    parser.add_argument("--seed", type=int, default=DATA_SEED, help="Зерно тестових даних")
+    parser.add_argument("--counters", action="store_true",
+                        help="Додатково рахувати порівняння, записи та пікову пам'ять")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    results, sizes = run_sweep(args.sizes, args.data_types, args.jobs, args.algorithms,
+                               csv_file=args.csv, history_file=args.history, resume=args.resume,
+                               seed=args.seed, counters=args.counters, profile=config_from_args(args))
+    if args.algorithms is None:
+        print_results_table(results, sizes, args.data_types)
+
+if __name__ == "__main__":
+    main()
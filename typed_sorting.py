@@ -0,0 +1,405 @@
+"""
+typed_sorting.py - Сортування типізованих буферів цілих чисел int64
+
+Звичайні списки Python зберігають кожне число як окремий об'єкт (28+ байт)
+плюс вказівник у списку (8 байт). Цей модуль працює з компактними буферами:
+- array('q') зі стандартної бібліотеки (8 байт на елемент)
+- numpy.ndarray з dtype int64 (8 байт на елемент), якщо встановлено numpy
+
+Усі сортувальники працюють на місці: вхідний буфер не копіюється, а
+масив array('q') за наявності numpy обгортається через numpy.frombuffer
+без копіювання даних. Без numpy використовуються чисті реалізації на Python.
+
+Встановлення numpy (опціонально):
+pip3 install numpy
+"""
+
+import sys
+from array import array
+from functools import partial
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from benchmark import run_benchmark
+from datasets import generate
+from sorting_core import benchmark_sorter, generate_data
+
+BACKENDS = ("array", "numpy")
+
+# Зсув, що переводить знакові int64 у беззнаковий порядок (для порозрядного сортування)
+SIGN_BIT = 1 << 63
+
+def _require_numpy():
+    """
+    Перевіряє наявність numpy для бекенду "numpy".
+    """
+    if np is None:
+        raise ImportError("Бекенд 'numpy' потребує numpy: pip3 install numpy")
+
+def to_typed_buffer(data, backend: str = "array"):
+    """
+    Перетворює послідовність цілих чисел у типізований буфер int64.
+
+    Args:
+        data: Список або інша послідовність цілих чисел
+        backend: "array" для array('q') або "numpy" для numpy.ndarray
+
+    Returns:
+        Типізований буфер int64
+    """
+    if backend == "array":
+        return data if isinstance(data, array) and data.typecode == 'q' else array('q', data)
+    if backend == "numpy":
+        _require_numpy()
+        return np.asarray(data, dtype=np.int64)
+    raise ValueError(f"Невідомий бекенд: {backend}")
+
+def generate_typed_data(size: int, data_type: str = "random", backend: str = "array",
+                        seed: Optional[int] = None):
+    """
+    Генерує тестові дані безпосередньо у типізованому буфері.
+
+    Генерація делегується datasets.generate: для numpy вона векторизована
+    і не створює проміжного списку.
+
+    Args:
+        size: Розмір буфера
+        data_type: Тип даних (один з datasets.DATA_TYPES)
+        backend: "array" або "numpy"
+        seed: Зерно генератора (None - недетерміновано)
+
+    Returns:
+        Типізований буфер int64
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Невідомий бекенд: {backend}")
+    if backend == "numpy":
+        _require_numpy()
+    return generate(size, data_type, seed, backend=backend)
+
+def as_numpy_view(buf):
+    """
+    Повертає numpy-представлення буфера без копіювання даних.
+
+    Args:
+        buf: array('q') або numpy.ndarray int64
+
+    Returns:
+        numpy.ndarray, що використовує ту саму пам'ять, або None, якщо numpy недоступний
+    """
+    if np is None:
+        return None
+    if isinstance(buf, np.ndarray):
+        return buf
+    return np.frombuffer(buf, dtype=np.int64)
+
+def bytes_per_element(data) -> float:
+    """
+    Оцінює кількість байтів пам'яті на один елемент контейнера.
+
+    Для списків враховуються і вказівники, і самі об'єкти int.
+
+    Args:
+        data: Список, array('q') або numpy.ndarray
+
+    Returns:
+        Середня кількість байтів на елемент
+    """
+    n = len(data)
+    if n == 0:
+        return 0.0
+    if np is not None and isinstance(data, np.ndarray):
+        return data.nbytes / n
+    if isinstance(data, array):
+        return float(data.itemsize)
+    total = sys.getsizeof(data) + sum(sys.getsizeof(x) for x in data)
+    return total / n
+
+def counting_sort_typed(buf):
+    """
+    Сортування підрахунком на місці для буферів з невеликим діапазоном значень.
+
+    Пам'ять на лічильники - O(max - min + 1).
+
+    Args:
+        buf: array('q') або numpy.ndarray int64
+
+    Returns:
+        Той самий буфер, відсортований на місці
+    """
+    if len(buf) <= 1:
+        return buf
+
+    view = as_numpy_view(buf)
+    if view is not None:
+        low = int(view.min())
+        counts = np.bincount(view - low)
+        view[:] = np.repeat(np.arange(low, low + len(counts), dtype=np.int64), counts)
+        return buf
+
+    low, high = min(buf), max(buf)
+    counts = [0] * (high - low + 1)
+    for value in buf:
+        counts[value - low] += 1
+
+    k = 0
+    for offset, count in enumerate(counts):
+        for _ in range(count):
+            buf[k] = low + offset
+            k += 1
+    return buf
+
+def radix_sort_typed(buf, digit_bits: int = 16):
+    """
+    Порозрядне LSD-сортування на місці.
+
+    Знакові числа переводяться у беззнаковий порядок інвертуванням знакового
+    біта, тому від'ємні значення сортуються коректно. Кількість проходів
+    визначається фактичним діапазоном ключів. У бекенді numpy кожен прохід -
+    стабільне сортування розряду uint8/uint16, яке numpy виконує порозрядно за O(n).
+
+    Args:
+        buf: array('q') або numpy.ndarray int64
+        digit_bits: Ширина розряду у бітах (8 або 16 для numpy)
+
+    Returns:
+        Той самий буфер, відсортований на місці
+    """
+    if len(buf) <= 1:
+        return buf
+
+    view = as_numpy_view(buf)
+    if view is not None:
+        if digit_bits not in (8, 16):
+            raise ValueError(f"Для numpy ширина розряду має бути 8 або 16: {digit_bits}")
+        digit_dtype = np.uint8 if digit_bits == 8 else np.uint16
+        keys = view.view(np.uint64) ^ np.uint64(SIGN_BIT)
+        spread = int(keys.max() ^ keys.min())
+        mask = np.uint64((1 << digit_bits) - 1)
+
+        shift = 0
+        while shift == 0 or spread >> shift:
+            digits = ((keys >> np.uint64(shift)) & mask).astype(digit_dtype)
+            order = np.argsort(digits, kind='stable')
+            keys = keys[order]
+            shift += digit_bits
+
+        view[:] = (keys ^ np.uint64(SIGN_BIT)).view(np.int64)
+        return buf
+
+    mask = (1 << digit_bits) - 1
+    keys = [value + SIGN_BIT for value in buf]
+    spread = max(keys) ^ min(keys)
+
+    shift = 0
+    while shift == 0 or spread >> shift:
+        buckets = [[] for _ in range(1 << digit_bits)]
+        for key in keys:
+            buckets[(key >> shift) & mask].append(key)
+        keys = [key for bucket in buckets for key in bucket]
+        shift += digit_bits
+
+    for i, key in enumerate(keys):
+        buf[i] = key - SIGN_BIT
+    return buf
+
+def merge_sorted_typed(left, right, out=None):
+    """
+    Зливає два відсортовані буфери.
+
+    У бекенді numpy злиття векторизоване: позиція кожного елемента у
+    результаті дорівнює його індексу плюс кількості менших елементів з
+    іншого буфера, яку знаходить searchsorted. Злиття стабільне.
+
+    Args:
+        left: Відсортований буфер int64
+        right: Відсортований буфер int64
+        out: Буфер для результату довжиною len(left) + len(right) (створюється, якщо не вказано)
+
+    Returns:
+        Буфер out з об'єднаними даними
+    """
+    total = len(left) + len(right)
+    left_view, right_view = as_numpy_view(left), as_numpy_view(right)
+
+    if left_view is not None:
+        out = np.empty(total, dtype=np.int64) if out is None else out
+        out_view = as_numpy_view(out)
+        left_pos = np.arange(len(left_view)) + np.searchsorted(right_view, left_view, side='left')
+        right_pos = np.arange(len(right_view)) + np.searchsorted(left_view, right_view, side='right')
+        out_view[left_pos] = left_view
+        out_view[right_pos] = right_view
+        return out
+
+    out = array('q', bytes(total * 8)) if out is None else out
+    i = j = k = 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            out[k] = left[i]
+            i += 1
+        else:
+            out[k] = right[j]
+            j += 1
+        k += 1
+    out[k:k + len(left) - i] = left[i:]
+    k += len(left) - i
+    out[k:k + len(right) - j] = right[j:]
+    return out
+
+def merge_sort_typed(buf, block_size: int = 1024):
+    """
+    Висхідне сортування злиттям типізованого буфера на місці.
+
+    Блоки розміром block_size сортуються окремо, після чого сусідні блоки
+    зливаються через merge_sorted_typed з одним допоміжним буфером.
+
+    Args:
+        buf: array('q') або numpy.ndarray int64
+        block_size: Розмір блоків, що сортуються без злиття
+
+    Returns:
+        Той самий буфер, відсортований на місці
+    """
+    n = len(buf)
+    if n <= 1:
+        return buf
+
+    view = as_numpy_view(buf)
+    src = view if view is not None else buf
+    dst = np.empty_like(view) if view is not None else array('q', bytes(n * 8))
+    width = max(1, block_size)
+
+    for lo in range(0, n, width):
+        block = src[lo:lo + width]
+        if view is not None:
+            block.sort()
+        else:
+            src[lo:lo + width] = array('q', sorted(block))
+
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid, hi = min(lo + width, n), min(lo + 2 * width, n)
+            if view is not None:
+                # Зрізи numpy - представлення, тож злиття пише прямо у dst
+                merge_sorted_typed(src[lo:mid], src[mid:hi], dst[lo:hi])
+            else:
+                dst[lo:hi] = merge_sorted_typed(src[lo:mid], src[mid:hi])
+        src, dst = dst, src
+        width *= 2
+
+    # Якщо результат опинився у допоміжному буфері, копіюємо його назад
+    if view is not None and src is not view:
+        view[:] = src
+    elif view is None and src is not buf:
+        buf[:] = src
+    return buf
+
+def sort_typed(buf, algorithm: str = "auto"):
+    """
+    Сортує типізований буфер на місці обраним алгоритмом.
+
+    Режим "auto" обирає сортування підрахунком, якщо діапазон значень не
+    перевищує кількості елементів, і порозрядне сортування в іншому разі.
+
+    Args:
+        buf: array('q') або numpy.ndarray int64
+        algorithm: "auto", "counting", "radix" або "merge"
+
+    Returns:
+        Той самий буфер, відсортований на місці
+    """
+    if algorithm == "auto":
+        view = as_numpy_view(buf)
+        low, high = (int(view.min()), int(view.max())) if view is not None and len(buf) else \
+            (min(buf, default=0), max(buf, default=0))
+        if high - low <= len(buf):
+            algorithm = "counting"
+        else:
+            algorithm = "radix"
+
+    if algorithm == "counting":
+        return counting_sort_typed(buf)
+    elif algorithm == "radix":
+        return radix_sort_typed(buf)
+    elif algorithm == "merge":
+        return merge_sort_typed(buf)
+    raise ValueError(f"Невідомий алгоритм: {algorithm}")
+
+def _copy_buffer(buf):
+    """
+    Створює копію буфера того ж типу (для вимірювань).
+    """
+    return buf.copy() if np is not None and isinstance(buf, np.ndarray) else array('q', buf)
+
+def compare_typed_sorting(sizes: List[int], data_types: List[str], backend: Optional[str] = None):
+    """
+    Порівнює сортування списків з сортуванням типізованих буферів.
+
+    Поруч із часом виконання виводиться пам'ять на один елемент.
+
+    Args:
+        sizes: Список розмірів вхідних даних
+        data_types: Список типів даних
+        backend: "array" або "numpy" (за замовчуванням numpy, якщо встановлено)
+
+    Returns:
+        Словник {data_type: {algorithm: [(time, bytes_per_element), ...]}}
+    """
+    backend = backend or ("numpy" if np is not None else "array")
+    algorithms = ["auto", "radix", "merge"]
+    results = {data_type: {"timsort_list": [], **{a: [] for a in algorithms}} for data_type in data_types}
+
+    print(f"\n🔄 Типізований бекенд: {backend}")
+    print("=" * 70)
+
+    for data_type in data_types:
+        print(f"\n🔸 {data_type.upper()} ДАНІ:")
+        print(f"{'Розмір':<10} {'Алгоритм':<14} {'Час':<12} {'Байт/елемент':<12}")
+        print("-" * 50)
+
+        for size in sizes:
+            data = generate_data(size, data_type)
+            typed = to_typed_buffer(data, backend)
+
+            # Обидва бекенди вимірюються однаково: копія входу готується у setup
+            # поза вимірюваною ділянкою, вимірюється лише сортування на місці
+            rows = [("timsort_list", benchmark_sorter("timsort", data).median, bytes_per_element(data))]
+            for algorithm in algorithms:
+                elapsed = run_benchmark(partial(sort_typed, algorithm=algorithm), typed,
+                                        setup=_copy_buffer).median
+                rows.append((algorithm, elapsed, bytes_per_element(typed)))
+
+            for name, elapsed, per_element in rows:
+                results[data_type][name].append((elapsed, per_element))
+                print(f"{size:<10,} {name:<14} {elapsed:<12.6f} {per_element:<12.1f}")
+
+    return results
+
+def main():
+    """
+    Головна функція програми.
+    """
+    backend = "numpy" if np is not None else "array"
+    print(f"✅ Використовується бекенд: {backend}")
+
+    # Перевірка коректності усіх алгоритмів на обох бекендах
+    for name in ([backend, "array"] if backend == "numpy" else ["array"]):
+        for algorithm in ("counting", "radix", "merge", "auto"):
+            data = generate_data(1000, "random") + [-5, -1000]
+            if algorithm != "counting":
+                # Великий діапазон і від'ємні значення - лише для порівняльних та порозрядних
+                data += [-(2**62), 2**62]
+            buf = to_typed_buffer(data, name)
+            assert list(sort_typed(buf, algorithm)) == sorted(data), (name, algorithm)
+    print("✅ Перевірка коректності пройдена")
+
+    sizes = [1000, 10000, 100000]
+    data_types = ["random", "sorted", "reversed", "partially_sorted"]
+    compare_typed_sorting(sizes, data_types, backend)
+
+if __name__ == "__main__":
+    main()